@@ -0,0 +1,96 @@
+"""
+Compare placing players on Lavalink nodes by their player count and by `wavelink.stats.LoadEstimator`.
+
+Run from the root of the repository::
+
+    python -m benchmarks.load_placement --seeds 5
+"""
+import argparse
+import random
+from typing import List, Optional
+
+from wavelink.stats import LoadEstimator, Stats
+
+
+def simulate(policy: str, seed: int, minutes: int = 240) -> int:
+    """
+    Simulate placing players on three nodes and return the total frame deficit of the players.
+
+    The nodes have a different CPU cost per player and random background CPU spikes, players arrive in bursts and
+    play for 5 to 30 minutes, and every node sends a stats frame once a minute, like Lavalink.
+
+    Parameters
+    ----------
+    policy : str
+        ``players`` to place players on the node with the fewest players, ``load`` to place them by
+        `LoadEstimator.score`.
+    seed : int
+        The seed of the arrivals and of the spikes.
+    minutes : int
+        How many minutes are simulated.
+
+    Returns
+    -------
+        The deficit frames of every frame, times the players of the node.
+    """
+    rnd = random.Random(seed)
+    costs = (0.008, 0.012, 0.02)
+    nodes = [{"ends": [], "estimator": LoadEstimator(), "stats": None, "background": 0.05} for _ in costs]
+    total = 0
+
+    for minute in range(minutes):
+        for second in range(60):
+            now = minute * 60 + second
+            # mostly quiet, with a burst of players every now and then.
+            arrivals = rnd.choice([0] * 55 + [1] * 3 + [8, 15]) if second % 5 == 0 else 0
+            for _ in range(arrivals):
+                if policy == "players":
+                    node = min(nodes, key=lambda n: len(n["ends"]))
+                else:
+                    node = min(nodes, key=lambda n: n["estimator"].score(now, players=len(n["ends"])))
+                    node["estimator"].place()
+                node["ends"].append(now + rnd.randint(300, 1800))
+            for node in nodes:
+                node["ends"] = [end for end in node["ends"] if end > now]
+
+        for cost, node in zip(costs, nodes):
+            if rnd.random() < 0.1:
+                node["background"] = rnd.uniform(0.2, 0.5)
+            else:
+                node["background"] = max(0.05, node["background"] * 0.7)
+            players = len(node["ends"])
+            load = min(players * cost + node["background"], 1.5)
+            deficit = int(max(load - 0.8, 0) * 3000) if players else 0
+            total += deficit * players
+
+            data = {
+                "uptime": 0,
+                "players": players,
+                "playingPlayers": players,
+                "memory": {"free": 0, "used": 0, "allocated": 0, "reservable": 0},
+                "cpu": {"cores": 4, "systemLoad": min(load, 1.0), "lavalinkLoad": 0.1},
+                "frameStats": {"sent": 3000, "nulled": 0, "deficit": min(deficit, 3000)},
+            }
+            node["stats"] = Stats(None, data)
+            node["estimator"].update(node["stats"], now=minute * 60 + 59)
+
+    return total
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the frame deficit of placing players by player count and by LoadEstimator."
+    )
+    parser.add_argument("--seeds", type=int, default=5)
+    parser.add_argument("--minutes", type=int, default=240)
+    args = parser.parse_args(argv)
+
+    for seed in range(args.seeds):
+        by_players = simulate("players", seed, args.minutes)
+        by_load = simulate("load", seed, args.minutes)
+        change = f"{(1 - by_load / by_players) * 100:.0f}% less" if by_players else "n/a"
+        print(f"seed {seed}: {by_players:>9,} deficit by players, {by_load:>9,} by load ({change})")
+
+
+if __name__ == "__main__":
+    main()
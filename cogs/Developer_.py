@@ -1,6 +1,5 @@
 #  -*- coding: utf-8 -*-
 import os
-import pkgutil
 import sys
 import traceback
 from enum import Enum
@@ -42,10 +41,7 @@ async def cog_autocomp(interaction: disnake.ApplicationCommandInteraction, user_
     list
         A list of possible completions according to the user input.
     """
-    cog_names = []
-    for pkg in pkgutil.iter_modules(["cogs"]):
-        cog_names.append(pkg.name)
-    return [item for item in cog_names if user_input.lower() in item]
+    return interaction.bot.command_index.search_cogs(user_input)
 
 
 class Owner(commands.Cog, name="Developer"):
@@ -106,6 +102,21 @@ class Owner(commands.Cog, name="Developer"):
                 type(error), error, error.__traceback__, file=sys.stderr
             )
 
+    async def broadcast_extension(self, action: str, cog: str) -> None:
+        """
+        Applies a cog action to every other cluster, if the bot is running in cluster mode.
+
+        Parameters
+        ----------
+        action : str
+            The action that was performed on the cog.
+
+        cog : str
+            The name of the cog.
+        """
+        if self.bot.ipc:
+            await self.bot.ipc.broadcast("extension", action=action, name=f"cogs.{cog}")
+
     @commands.slash_command(
         description="Commands that handle Bot commands and Cogs",
         invoke_without_command=True,
@@ -155,6 +166,7 @@ class Owner(commands.Cog, name="Developer"):
                     ephemeral=True,
                 )
 
+            await self.broadcast_extension(action.lower(), cog)
             await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"Cog **{cog}** has stopped running.",
@@ -183,6 +195,7 @@ class Owner(commands.Cog, name="Developer"):
                     ephemeral=True,
                 )
 
+            await self.broadcast_extension(action.lower(), cog)
             await interaction.response.send_message(
                 f"Cog **{cog}** is now running.", ephemeral=True
             )
@@ -207,6 +220,7 @@ class Owner(commands.Cog, name="Developer"):
                     ephemeral=True,
                 )
 
+            await self.broadcast_extension(action.lower(), cog)
             await interaction.response.send_message(
                 f"Cog **{cog}** has been reloaded.", ephemeral=True
             )
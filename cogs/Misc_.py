@@ -1,8 +1,4 @@
 #  -*- coding: utf-8 -*-
-from youtubesearchpython.__future__ import ChannelsSearch, VideosSearch
-
-import difflib
-import pathlib
 import re
 import sys
 import time
@@ -10,52 +6,84 @@ import traceback
 
 import disnake
 import humanize
-import youtube_dl as ydl
 from disnake.ext import commands
-from disnake.ext.commands import InvokableSlashCommand, Param
+from disnake.ext.commands import Param
 
 from core.MusicBot import Bot
-from utils.helpers import BotInformationView, ErrorView, executor_function
-from utils.paginators import SimpleEmbedPages
+from utils.extractor import ExtractorBusy
+from utils.helpers import BotInformationView, ErrorView
+from utils.paginators import LazyEmbeds, SimpleEmbedPages
 from wavelink import Player
 
 
-@executor_function
-def youtube(query, download=False):
+def video_embed(video: dict) -> disnake.Embed:
     """
-    Searches YouTube for a video and returns the results.
+    Builds the page of a YouTube video of the search results.
 
     Parameters
     ----------
-    query : str
-        The query to search YouTube for.
-    download : bool
-        Whether to download the video.
-
+    video : dict
+        The video, as returned by ``VideosSearch``.
 
     Returns
     -------
-    dict
-        Information about the YouTube video that was queried.
+    disnake.Embed
+        The embed of the video.
+    """
+    url = "https://www.youtube.com/watch?v=" + video["id"]
+    channel_url = "https://www.youtube.com/channel/" + video["channel"]["id"]
+    em = disnake.Embed(title=video["title"], url=url, color=disnake.Colour.random())
+    em.add_field(
+        name="Channel",
+        value=f"[{video['channel']['name']}]({channel_url})",
+        inline=True,
+    )
+    em.add_field(name="Duration", value=humanize.intword(video["duration"]), inline=True)
+    em.add_field(name="Views", value=humanize.intword(video["viewCount"]["text"]))
+    em.set_thumbnail(url=video["thumbnails"][0]["url"])
+    return em
+
 
+def channel_embed(channel: dict) -> disnake.Embed:
+    """
+    Builds the page of a YouTube channel of the search results.
+
+    Parameters
+    ----------
+    channel : dict
+        The channel, as returned by ``ChannelsSearch``.
+
+    Returns
+    -------
+    disnake.Embed
+        The embed of the channel.
     """
-    ytdl = ydl.YoutubeDL(
-        {
-            "format": "bestaudio/best",
-            "restrictfilenames": True,
-            "noplaylist": True,
-            "nocheckcertificate": True,
-            "ignoreerrors": True,
-            "logtostderr": False,
-            "quiet": True,
-            "no_warnings": True,
-            "default_search": "auto",
-            "source_address": "0.0.0.0",
-        }
+    url = "https://www.youtube.com/channel/" + channel["id"]
+    if not channel["thumbnails"][0]["url"].startswith("https:"):
+        thumbnail = f"https:{channel['thumbnails'][0]['url']}"
+    else:
+        thumbnail = channel["thumbnails"][0]["url"]
+    if channel["descriptionSnippet"] is not None:
+        em = disnake.Embed(
+            title=channel["title"],
+            description=" ".join(text["text"] for text in channel["descriptionSnippet"]),
+            url=url,
+            color=disnake.Colour.random(),
+        )
+    else:
+        em = disnake.Embed(title=channel["title"], url=url, color=disnake.Colour.random())
+    em.add_field(
+        name="Videos",
+        value=channel["videoCount"] if channel["videoCount"] is not None else "0",
+        inline=True,
+    )
+    em.add_field(
+        name="Subscribers",
+        value=channel["subscribers"] if channel["subscribers"] is not None else "0",
+        inline=True,
     )
-    info = ytdl.extract_info(query, download=download)
-    del ytdl
-    return info
+    em.set_thumbnail(url=thumbnail)
+    return em
 
 
 class Misc(commands.Cog):
@@ -138,6 +166,11 @@ class Misc(commands.Cog):
         `/spotify user: @Member`
         """
 
+        if not self.bot.intents.presences:
+            return await interaction.response.send_message(
+                "Presences are not cached with the current cache profile of the bot."
+            )
+
         activities = member.activities
         try:
             act = [
@@ -202,42 +235,22 @@ class Misc(commands.Cog):
         """
         await interaction.response.send_message("Searching...")
         if re.search(r"^(https?\:\/\/)?((www\.)?youtube\.com|youtu\.?be)\/.+$", query):
-            async with interaction.channel.typing():
-                query = (await youtube(query))["title"]
+            # the lookup runs in the extractor pool of the bot, so it does not block the other guilds.
+            try:
+                info = await self.bot.extractor.extract(query)
+            except ExtractorBusy as e:
+                return await interaction.edit_original_message(content=str(e))
+            if info:
+                query = info["title"]
 
-        videos = (await (VideosSearch(query, limit=15)).next())["result"]
+        videos = await self.bot.youtube_search.videos(query)
 
         if len(videos) == 0:
-            return await interaction.response.send_message(
-                "I could not find a video with that query"
-            )
-
-        embeds = []
-
-        for video in videos:
-            url = "https://www.youtube.com/watch?v=" + video["id"]
-            channel_url = "https://www.youtube.com/channel/" + video["channel"]["id"]
-            em = disnake.Embed(
-                title=video["title"], url=url, color=disnake.Colour.random()
-            )
-            em.add_field(
-                name="Channel",
-                value=f"[{video['channel']['name']}]({channel_url})",
-                inline=True,
-            )
-            em.add_field(
-                name="Duration", value=humanize.intword(video["duration"]), inline=True
-            )
-            em.add_field(
-                name="Views", value=humanize.intword(video["viewCount"]["text"])
-            )
-            em.set_footer(
-                text=f"Use the buttons for navigating • Page: {int(videos.index(video)) + 1}/{len(videos)}"
+            return await interaction.edit_original_message(
+                content="I could not find a video with that query"
             )
-            em.set_thumbnail(url=video["thumbnails"][0]["url"])
-            embeds.append(em)
 
-        pag = SimpleEmbedPages(entries=embeds, ctx=interaction)
+        pag = SimpleEmbedPages(entries=LazyEmbeds(videos, video_embed), ctx=interaction)
         await pag.start()
 
     @youtube.sub_command(description="Search youtube channels")
@@ -262,62 +275,20 @@ class Misc(commands.Cog):
         `/youtube channel query: one vilage`
         """
 
-        async with interaction.channel.typing():
-            channels = (await (ChannelsSearch(query, limit=15, region="US")).next())[
-                "result"
-            ]
+        await interaction.response.send_message("Searching...")
+        channels = await self.bot.youtube_search.channels(query)
 
         if len(channels) == 0:
-            return await interaction.response.send_message(
+            return await interaction.edit_original_message(
+                content=None,
                 embed=disnake.Embed(
                     title="Channel",
                     description="I could not find a channel with that query.",
                     color=disnake.Colour.random(),
-                )
-            )
-
-        await interaction.response.send_message("Searching...")
-        embeds = []
-
-        for channel in channels:
-            url = "https://www.youtube.com/channel/" + channel["id"]
-            if not channel["thumbnails"][0]["url"].startswith("https:"):
-                thumbnail = f"https:{channel['thumbnails'][0]['url']}"
-            else:
-                thumbnail = channel["thumbnails"][0]["url"]
-            if channel["descriptionSnippet"] is not None:
-                em = disnake.Embed(
-                    title=channel["title"],
-                    description=" ".join(
-                        text["text"] for text in channel["descriptionSnippet"]
-                    ),
-                    url=url,
-                    color=disnake.Colour.random(),
-                )
-            else:
-                em = disnake.Embed(
-                    title=channel["title"], url=url, color=disnake.Colour.random()
-                )
-            em.add_field(
-                name="Videos",
-                value="".join(
-                    channel["videoCount"] if channel["videoCount"] is not None else "0"
-                ),
-                inline=True,
-            )
-            em.add_field(
-                name="Subscribers",
-                value="".join(
-                    channel["subscribers"]
-                    if channel["subscribers"] is not None
-                    else "0"
                 ),
-                inline=True,
             )
-            em.set_thumbnail(url=thumbnail)
-            embeds.append(em)
 
-        pag = SimpleEmbedPages(entries=embeds, ctx=interaction)
+        pag = SimpleEmbedPages(entries=LazyEmbeds(channels, channel_embed), ctx=interaction)
         await pag.start()
 
     @commands.slash_command(name="help", description="Shows help about slash commands.")
@@ -344,75 +315,32 @@ class Misc(commands.Cog):
         --------
         `/help show slash_command: info`
         """
-        slash_commands = [command for command in self.bot.all_slash_commands]
-        if slash_command in slash_commands:
+        help_ = self.bot.command_index.help(slash_command)
+        if help_ is not None:
             await interaction.response.send_message("Gathering Information...")
 
-            command: InvokableSlashCommand = self.bot.get_slash_command(slash_command)
-            if len(command.children) > 0:
+            if help_.children:
+                # the embeds of the index are shared, the footers of this interaction are set on copies.
                 embeds = []
-                for key, value in command.children.items():
-                    try:
-                        examples = (
-                            value.callback.__doc__.replace("\n", "")
-                            .split("Examples")[1]
-                            .replace("--------", "")
-                        )
-                    except AttributeError:
-                        continue
-
-                    embed = disnake.Embed(
-                        colour=disnake.Colour.random(),
-                        title=f"Help for {slash_command} {key}",
-                        timestamp=disnake.utils.utcnow(),
-                    ).set_footer(
+                for child in help_.children:
+                    embed = child.copy()
+                    embed.colour = disnake.Colour.random()
+                    embed.timestamp = disnake.utils.utcnow()
+                    embed.set_footer(
                         text=f"Requested by {interaction.author.display_name}",
                         icon_url=interaction.author.display_avatar.url,
                     )
-                    embed.add_field(
-                        name="Usage",
-                        value=f"`/{slash_command} {key} {', '.join([option.name for option in value.option.options])}`",
-                    )
-                    embed.add_field(
-                        name="Description",
-                        value=f"`{value.docstring['description']}`",
-                        inline=False,
-                    )
-                    embed.add_field(name="Examples", value=f"{examples}", inline=False)
                     embeds.append(embed)
-
                 pag = SimpleEmbedPages(entries=embeds, ctx=interaction)
                 await pag.start()
 
-            else:
-                pass
-            try:
-                examples = (
-                    command.callback.__doc__.replace("\n", "")
-                    .split("Examples")[1]
-                    .replace("--------", "")
-                )
-            except AttributeError:
-                pass
-
-            embed = disnake.Embed(
-                colour=disnake.Colour.random(),
-                title=f"Help for {slash_command}",
-                timestamp=disnake.utils.utcnow(),
-            ).set_footer(
+            embed = help_.embed.copy()
+            embed.colour = disnake.Colour.random()
+            embed.timestamp = disnake.utils.utcnow()
+            embed.set_footer(
                 text=f"Requested by {interaction.author.display_name}",
                 icon_url=interaction.author.display_avatar.url,
             )
-            embed.add_field(
-                name="Usage",
-                value=f"`/{command.name} {', '.join([option.name for option in command.options])}`",
-            )
-            embed.add_field(
-                name="Description",
-                value=f"`{command.docstring['description']}`",
-                inline=False,
-            )
-            embed.add_field(name="Examples", value=f"{examples}", inline=False)
 
             return await interaction.edit_original_message(
                 content=f":question: **{slash_command}**", embed=embed
@@ -454,43 +382,14 @@ class Misc(commands.Cog):
         version = sys.version_info
         em = disnake.Embed(color=disnake.Colour.random())
 
-        # File Stats
-        def line_count():
-            """
-            Counts the number of lines in the codebase.
-
-            Returns
-            -------
-            tuple[int, int, int, int, int, int]
-                The number of lines in the codebase.
-            """
-            files = classes = funcs = comments = lines = letters = 0
-            p = pathlib.Path("./")
-            for f in p.rglob("*.py"):
-                files += 1
-                with f.open() as of:
-                    letters_ = sum(len(f.open().read()) for f in p.rglob("*.py"))
-                    for line in of.readlines():
-                        line = line.strip()
-                        if line.startswith("class"):
-                            classes += 1
-                        if line.startswith("def"):
-                            funcs += 1
-                        if line.startswith("async def"):
-                            funcs += 1
-                        if "#" in line:
-                            comments += 1
-                        lines += 1
-            return files, classes, funcs, comments, lines, letters_
-
-        (
-            files,
-            classes,
-            funcs,
-            comments,
-            lines,
-            letters,
-        ) = await self.bot.loop.run_in_executor(None, line_count)
+        # File Stats, from the index that is kept up to date in the background.
+        stats = self.bot.source_stats.totals
+        files, funcs, lines, letters = (
+            self.bot.source_stats.files,
+            stats.functions,
+            stats.lines,
+            stats.letters,
+        )
         #
         em.add_field(
             name="Bot",
@@ -567,9 +466,7 @@ class Misc(commands.Cog):
         list
             The list of commands matching the user input.
         """
-        commands_list = [command.lower() for command in self.bot.all_slash_commands]
-        selected_commands = difflib.get_close_matches(user_input.lower(), commands_list)
-        return selected_commands
+        return self.bot.command_index.search_commands(user_input)
 
 
 def setup(bot):
@@ -1,8 +1,10 @@
 #  -*- coding: utf-8 -*-
+import asyncio
 import datetime
 import math
 import re
 import sys
+import time
 import traceback
 import typing
 
@@ -13,11 +15,12 @@ from disnake.ext.commands.params import Param
 
 import wavelink
 from core.MusicBot import Bot
+from utils.cache_profiles import cache_voice_members
 from utils.exceptions import IncorrectChannelError, NoChannelProvided
 from utils.helpers import ErrorView, LyricsPaginator, SearchService
-from utils.MusicPlayerInteraction import Player, QueuePages, Track
-from utils.paginators import WrapText
-from utils.views import FilterView, SongSelectionView
+from utils.MusicPlayerInteraction import MenuControllerView, Player, QueuePages, Track
+from utils.views import FilterView, SongSelectionView, song_selection
+from utils.voice_index import VoiceMembershipIndex
 from wavelink.errors import FilterInvalidArgument
 
 url_regex = re.compile(r"https?://(?:www\.)?.+")
@@ -37,6 +40,14 @@ APPLEMUSIC_URL_REGEX = re.compile(
     r"https?://(?:www\.)?music\.apple\.com/[a-zA-Z0-9]+(/[a-zA-Z0-9]+)?$"
 )
 
+SEARCH_SERVICES = {
+    "youtube": SearchService.ytsearch,
+    "soundcloud": SearchService.scsearch,
+    "youtubemusic": SearchService.ytmsearch,
+    "spotify": SearchService.spsearch,
+    "applemusic": SearchService.amsearch,
+}
+
 
 class Music(commands.Cog, wavelink.WavelinkMixin):
     """
@@ -45,6 +56,8 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
 
     def __init__(self, bot: Bot):
         self.bot = bot
+        self.restored = False
+        self.gc_task: typing.Optional[asyncio.Task] = None
 
     async def cog_load(self) -> None:
         """
@@ -54,7 +67,50 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         if not hasattr(self.bot, "wavelink"):
             self.bot.wavelink = wavelink.Client(bot=self.bot)
 
+        if not hasattr(self.bot, "controller_view"):
+            # persistent views, registered once, that handle the controller and song selection of every player.
+            self.bot.controller_view = MenuControllerView(bot=self.bot)
+            self.bot.add_view(self.bot.controller_view)
+            self.bot.add_view(SongSelectionView(bot=self.bot))
+
+        if not hasattr(self.bot, "voice_index"):
+            # when the cog is loaded after the bot is ready, the guilds are already available, so the index is seeded
+            # from the cache here.
+            self.bot.voice_index = VoiceMembershipIndex()
+            for guild in self.bot.guilds:
+                self.bot.voice_index.seed(guild)
+
         self.bot.loop.create_task(self.start_nodes())
+        self.gc_task = self.bot.loop.create_task(self.collect_players())
+
+    def cog_unload(self) -> None:
+        """
+        Fires when the cog is unloaded.
+        """
+        if self.gc_task:
+            self.gc_task.cancel()
+
+    async def collect_players(self) -> None:
+        """
+        This method periodically removes the players that are not connected to a voice channel.
+        Players that never connected are dropped, players that were disconnected are torn down.
+        """
+        await self.bot.wait_until_ready()
+
+        while not self.bot.is_closed():
+            await asyncio.sleep(self.bot.config.player_gc_interval)
+            for player in self.bot.wavelink.collect_players(self.bot.config.player_max_idle):
+                try:
+                    await player.teardown()
+                except Exception as e:
+                    self.bot.logger.error(
+                        f"Failed to tear down the player of {player.guild_id}: {e}", __name="Music Bot"
+                    )
+            self.bot.logger.debug(
+                f"Players: {len(self.bot.wavelink.players)} alive, {self.bot.wavelink.players_created} created, "
+                f"{self.bot.wavelink.players_never_connected} never connected.",
+                __name="Music Bot",
+            )
 
     async def start_nodes(self) -> None:
         """
@@ -94,6 +150,72 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         """
         self.bot.logger.info(f"Node {node.identifier} is running!", __name="Music Bot")
 
+        if self.bot.journal and not self.restored:
+            self.restored = True
+            await self.restore_players()
+
+    async def restore_players(self) -> None:
+        """
+        This method rebuilds the players that were journaled before the bot restarted, and resumes them.
+        The tracks of every player are decoded with a single batched request to Lavalink.
+        """
+        journal = self.bot.journal
+        start = time.perf_counter()
+
+        states = {}
+        for guild_id in journal.guild_ids():
+            guild = self.bot.get_guild(guild_id)
+            if not guild:
+                continue  # the guild belongs to another cluster, or the bot was removed from it.
+            state = journal.load(guild_id)
+            channel = guild.get_channel(state["channel"]) if state and state["channel"] else None
+            if not channel or not self.bot.voice_index.count(channel.id):
+                journal.discard(guild_id)
+                continue
+            states[guild] = state
+
+        blobs = [
+            blob
+            for state in states.values()
+            for blob in state["queue"] + ([state["now"]] if state["now"] else [])
+        ]
+        identifiers = list(dict.fromkeys(blob[0] for blob in blobs))
+        tracks = {}
+        for index in range(0, len(identifiers), 1000):
+            try:
+                decoded = await self.bot.wavelink.build_tracks(identifiers[index: index + 1000])
+            except wavelink.WavelinkException as e:
+                self.bot.logger.error(f"Failed to decode journaled tracks: {e}", __name="Music Bot")
+                continue
+            tracks.update((track.id, track) for track in decoded)
+
+        for guild, state in states.items():
+            member_ids = {blob[1] for blob in state["queue"]} | {state["dj"]}
+            if state["now"]:
+                member_ids.add(state["now"][1])
+            member_ids.discard(None)
+
+            # requesters that are not cached keep their ID, and are looked up when their track is shown, instead of a
+            # REST call per requester here.
+            members = {
+                member_id: guild.get_member(member_id) or disnake.Object(member_id) for member_id in member_ids
+            }
+            dj = guild.get_member(state["dj"]) if state["dj"] else None
+            members[state["dj"]] = dj or self.bot.voice_index.first(state["channel"])
+
+            player: Player = self.bot.wavelink.get_player(guild.id, cls=Player)
+            try:
+                await player.restore(state, tracks, members)
+            except Exception as e:
+                self.bot.logger.error(f"Failed to restore the player of {guild.id}: {e}", __name="Music Bot")
+                journal.discard(guild.id)
+
+        journal.restore_time = time.perf_counter() - start
+        self.bot.logger.info(
+            f"Restored {len(states)} players with {len(identifiers)} tracks in {journal.restore_time:.2f}s.",
+            __name="Music Bot",
+        )
+
     @wavelink.WavelinkMixin.listener("on_track_stuck")
     @wavelink.WavelinkMixin.listener("on_track_end")
     @wavelink.WavelinkMixin.listener("on_track_exception")
@@ -111,6 +233,88 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         self.bot.logger.info(f"Player stopped! {node}", __name="Music Bot")
         await payload.player.play_next_song()
 
+    @commands.Cog.listener()
+    async def on_message(self, message: disnake.Message) -> None:
+        """
+        Tracks the messages sent after the controller of a player, so it knows when it got buried.
+
+        Parameters
+        ----------
+        message : disnake.Message
+            The message that was sent.
+        """
+        if not message.guild:
+            return
+        player = self.bot.wavelink.peek_player(message.guild.id)
+        if player:
+            player.controller.on_message(message)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: disnake.RawMessageDeleteEvent) -> None:
+        """
+        Tracks whether the controller of a player was deleted.
+
+        Parameters
+        ----------
+        payload : disnake.RawMessageDeleteEvent
+            The payload of the deleted message.
+        """
+        if payload.guild_id is None:
+            return
+        player = self.bot.wavelink.peek_player(payload.guild_id)
+        if player:
+            player.controller.on_delete(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: disnake.RawBulkMessageDeleteEvent) -> None:
+        """
+        Tracks whether the controller of a player was deleted in a bulk delete.
+
+        Parameters
+        ----------
+        payload : disnake.RawBulkMessageDeleteEvent
+            The payload of the deleted messages.
+        """
+        if payload.guild_id is None:
+            return
+        player = self.bot.wavelink.peek_player(payload.guild_id)
+        if player:
+            for message_id in payload.message_ids:
+                player.controller.on_delete(message_id)
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: disnake.Guild) -> None:
+        """
+        Indexes the members connected to the voice channels of a guild, when it becomes available.
+        Without the members intent, the members that are connected are not cached yet, so they are requested first.
+
+        Parameters
+        ----------
+        guild : disnake.Guild
+            The guild that became available.
+        """
+        if not self.bot.intents.members:
+            try:
+                await cache_voice_members(guild)
+            except asyncio.TimeoutError:
+                self.bot.logger.warning(
+                    f"Timed out requesting the voice channel members of {guild.id}", __name="Music Bot"
+                )
+        self.bot.voice_index.seed(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: disnake.Guild) -> None:
+        """
+        Removes the members and the recent tracks of a guild, when the bot is removed from it.
+
+        Parameters
+        ----------
+        guild : disnake.Guild
+            The guild the bot was removed from.
+        """
+        self.bot.voice_index.drop(guild.id)
+        self.bot.track_suggestions.forget_guild(guild.id)
+
     @commands.Cog.listener("on_voice_state_update")
     async def DJ_assign(
             self,
@@ -119,39 +323,42 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
             after: disnake.VoiceState,
     ):
         """
-        Assign DJ role to the user who is currently playing music.
+        Keeps the voice index up to date, and assigns the DJ role to another member when the DJ leaves the channel
+        of the player, or to the member who joins a player that has no DJ in its channel.
 
         Parameters
         ----------
         member : disnake.Member
-            The member who is currently playing music.
+            The member whose voice state changed.
 
         before : disnake.VoiceState
-            The voice state before the update. This is not used.
+            The voice state before the update.
 
         after : disnake.VoiceState
             The voice state after the update.
         """
+        self.bot.voice_index.update(member, before, after)
         if member.bot:
             return
 
-        player: Player = self.bot.wavelink.get_player(member.guild.id, cls=Player)
-
-        if not player.channel_id or not player.context:
-            player.node.players.pop(member.guild.id)
+        # only existing players are looked up, a voice state update does not create a player.
+        player = self.bot.wavelink.peek_player(member.guild.id)
+        if not player or not player.channel_id:
             return
 
-        channel: disnake.VoiceChannel = await self.bot.fetch_channel(player.channel_id)
+        channel_id = int(player.channel_id)
+        dj_id = player.dj.id if player.dj else None
 
-        if member == player.dj and after.channel is None:
-            for m in channel.members:
-                if m.bot:
-                    continue
-                else:
-                    player.dj = m
-                    return
+        if member.id == dj_id and not self.bot.voice_index.contains(channel_id, member.id):
+            new_dj = self.bot.voice_index.first(channel_id, exclude=member.id)
+            if new_dj:
+                player.dj = new_dj
 
-        elif after.channel == channel and player.dj not in channel.members:
+        elif (
+                after.channel
+                and after.channel.id == channel_id
+                and (dj_id is None or not self.bot.voice_index.contains(channel_id, dj_id))
+        ):
             player.dj = member
 
     async def cog_slash_command_error(
@@ -241,9 +448,11 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         else:
             safe_send = interaction.response.send_message
 
-        music_player: Player = self.bot.wavelink.get_player(
-            interaction.guild.id, cls=Player, context=interaction
-        )
+        # the player is only looked up, commands that connect create it themselves.
+        music_player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
+        if not music_player:
+            return
+
         if music_player.context:
             if music_player.context.channel != interaction.channel:
                 await interaction.response.send_message(
@@ -264,7 +473,7 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
             return
 
         if music_player.is_connected:
-            if interaction.author not in channel.members:
+            if not self.bot.voice_index.contains(channel.id, interaction.author.id):
                 await safe_send(
                     embed=disnake.Embed(
                         description=f"{self.bot.icons['info']} You must be in `{channel.name}` to use voice commands.",
@@ -288,14 +497,12 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         int
             The required votes.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
-        channel = self.bot.get_channel(int(player.channel_id))
-        required = math.ceil((len(channel.members) - 1) / 2.5)
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
+        listeners = self.bot.voice_index.count(int(player.channel_id))
+        required = math.ceil(listeners / 2.5)
 
         if interaction.application_command.name == "stop":
-            if len(channel.members) == 3:
+            if listeners == 2:
                 required = 2
 
         return required
@@ -315,9 +522,7 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         bool
             Whether the user is the command invoker / interaction Author or do they have permissions to kick members.`.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
         return (
                 player.dj == interaction.author
@@ -398,35 +603,40 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         player: Player = self.bot.wavelink.get_player(
             guild_id=interaction.guild.id, cls=Player, context=interaction
         )
-        services = {
-            "youtube": SearchService.ytsearch,
-            "soundcloud": SearchService.scsearch,
-            "youtubemusic": SearchService.ytmsearch,
-            "spotify": SearchService.spsearch,
-            "applemusic": SearchService.amsearch,
-        }
 
         await interaction.response.defer()
 
         if not player.is_connected:
             await self.connect(interaction=interaction)
 
+        suggestion = self.bot.track_suggestions.resolve(query)
+        if suggestion is not None:
+            #  A suggestion of the autocomplete was picked, its track is already resolved.
+            track = Track(suggestion.id, suggestion.info, requester=interaction.author)
+            await interaction.edit_original_message(
+                content=f"\n{self.bot.icons['headphones']} Enqueued `{track.title}` to the Queue\n"
+            )
+            await player.queue.put(track)
+            if not player.is_playing:
+                await player.play_next_song()
+            return
+
         query = query.strip("<>")
         if (
                 not service.lower() == "youtubemusic"
                 or service.lower() == "youtube"
                 and not url_regex.match(query)
         ):
-            query = f"{services[service.lower()]}:{query}"
+            query = f"{SEARCH_SERVICES[service.lower()]}:{query}"
 
         if not SOUNDCLOUD_URL_REGEX.match(query) and service.lower() == "soundcloud":
-            query = f"{services[service.lower()]}:{query}"
+            query = f"{SEARCH_SERVICES[service.lower()]}:{query}"
 
         if not SPOTIFY_URL_REGEX.match(query) and service.lower() == "spotify":
-            query = f"{services[service.lower()]}:{query}"
+            query = f"{SEARCH_SERVICES[service.lower()]}:{query}"
         
         if not APPLEMUSIC_URL_REGEX.match(query) and service.lower() == "applemusic":
-            query = f"{services[service.lower()]}:{query}"
+            query = f"{SEARCH_SERVICES[service.lower()]}:{query}"
 
         if (
                 SPOTIFY_URL_REGEX.match(query)
@@ -443,11 +653,11 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
                 )
 
             if isinstance(tracks, wavelink.TrackPlaylist):
-                for track in tracks.tracks:
-                    track = Track(track.id, track.info, requester=interaction.author)
-                    await player.queue.put(track)
+                player.queue.extend(
+                    Track(track.id, track.info, requester=interaction.author) for track in tracks.tracks
+                )
 
-                return await interaction.edit_original_message(
+                await interaction.edit_original_message(
                     embed=disnake.Embed(
                         description=f'```ini\nAdded the playlist {tracks.data["playlistInfo"]["name"]}'
                                     f" with {len(tracks.tracks)} songs to the queue.\n```",
@@ -465,6 +675,7 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
                     content=f"\n{self.bot.icons['headphones']} Enqueued `{track.title}` to the Queue\n"
                 )
                 await player.queue.put(track)
+                self.bot.track_suggestions.record(interaction.guild.id, track)
 
             if not player.is_playing:
                 await player.play_next_song()
@@ -482,9 +693,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
             )
 
         if isinstance(tracks, wavelink.TrackPlaylist):
-            for track in tracks.tracks:
-                track = Track(track.id, track.info, requester=interaction.author)
-                await player.queue.put(track)
+            player.queue.extend(
+                Track(track.id, track.info, requester=interaction.author) for track in tracks.tracks
+            )
 
             await interaction.edit_original_message(
                 embed=disnake.Embed(
@@ -500,14 +711,10 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
                 await player.play_next_song()
             return
         else:
+            player.search = (interaction.id, time.monotonic(), tracks[:11])
             await interaction.edit_original_message(
                 content=f"\n{self.bot.icons['headphones']} Please select a song to play.\n",
-                view=SongSelectionView(
-                    tracks=tracks[:11],
-                    player=player,
-                    bot=self.bot,
-                    interaction=interaction,
-                ),
+                components=[song_selection(tracks[:11], interaction.id)],
             )
             return
 
@@ -535,6 +742,38 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         options = ["youtube", "soundcloud", "youtubemusic", "spotify"]
         return [option for option in options if query.lower() in options]
 
+    @play.autocomplete(option_name="query")
+    async def play_query_autocomplete(
+            self, interaction: disnake.ApplicationCommandInteraction, query: str
+    ):
+        """
+        Autocomplete for the query of the play command, it suggests the tracks that were played recently in the
+        guild and by the bot, and searches the service when too few of them match.
+
+        Parameters
+        ----------
+        interaction: disnake.ApplicationCommandInteraction
+            This parameter takes disnake.ApplicationCommandInteraction object, when this slash command is executed
+            which creates an Interaction.
+
+        query: str
+            What the user has typed.
+
+        Returns
+        -------
+        dict
+            The titles of the suggested tracks, by their URI.
+        """
+        service = str(interaction.filled_options.get("service", "youtube")).lower()
+        client = getattr(self.bot, "wavelink", None)
+        return await self.bot.track_suggestions.suggest(
+            query,
+            guild_id=interaction.guild_id,
+            user_id=interaction.author.id,
+            search=client.get_tracks if client and service in SEARCH_SERVICES else None,
+            prefix=SEARCH_SERVICES.get(service, SearchService.ytsearch),
+        )
+
     @commands.slash_command(
         description="Switch the channel where the bot was first invoked."
     )
@@ -562,10 +801,8 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
         `/switch_channel channel: #general`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
-        if not player.is_connected:
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -607,11 +844,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
         `/pause`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -650,7 +885,7 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
             return await player.set_pause(True)
 
         required = self.vote_check(interaction)
-        player.pause_votes.add(interaction.author)
+        player.add_vote(player.pause_votes, interaction.author)
 
         if len(player.pause_votes) >= required:
             await interaction.response.send_message(
@@ -685,11 +920,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
         `/resume`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -728,7 +961,7 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
             return await player.set_pause(False)
 
         required = self.vote_check(interaction)
-        player.resume_votes.add(interaction.author)
+        player.add_vote(player.resume_votes, interaction.author)
 
         if len(player.resume_votes) >= required:
             await interaction.response.send_message(
@@ -757,11 +990,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
         `/skip`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -783,7 +1014,7 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
             return await player.stop()
 
         required = self.vote_check(interaction)
-        player.skip_votes.add(interaction.author)
+        player.add_vote(player.skip_votes, interaction.author)
 
         if len(player.skip_votes) >= required:
             await interaction.response.send_message(
@@ -816,11 +1047,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
         `/stop`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -848,7 +1077,7 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
             return await player.teardown()
 
         required = self.vote_check(interaction)
-        player.stop_votes.add(interaction.author)
+        player.add_vote(player.stop_votes, interaction.author)
 
         if len(player.stop_votes) >= required:
             await interaction.response.send_message(
@@ -881,11 +1110,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
         `/disconnect`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -932,11 +1159,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
         `/volume vol: 50`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -993,11 +1218,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
         `/loop on` - Loops the current track.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1054,11 +1277,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
         `/loop off` - un-Loops the current track.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1116,32 +1337,15 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
         `/lyrics`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
-
-        name = player.now.title
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
                     colour=disnake.Colour.random(),
                 )
             )
-        lyrics_query = (
-            f"https://some-random-api.ml/lyrics?title={name}-{player.now.author}"
-        )
-        resp = await self.bot.session.get(lyrics_query)
-
-        if resp.status != 200:
-            return await interaction.response.send_message(
-                embed=disnake.Embed(
-                    description=f"{self.bot.icons['redtick']} `Lyrics for this song is not found.`",
-                    colour=disnake.Colour.random(),
-                ),
-                delete_after=10,
-            )
 
         if not player.is_playing:
             return await interaction.response.send_message(
@@ -1151,13 +1355,20 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
                 )
             )
 
-        data = await resp.json()
-        await interaction.response.send_message(content="Generating lyrics....", delete_after=5)
+        await interaction.response.send_message(content="Generating lyrics....")
+        pages = await self.bot.lyrics.pages(player.now)
+
+        if not pages:
+            return await interaction.edit_original_message(
+                content=None,
+                embed=disnake.Embed(
+                    description=f"{self.bot.icons['redtick']} `Lyrics for this song is not found.`",
+                    colour=disnake.Colour.random(),
+                ),
+            )
 
-        lyrics = data["lyrics"]
-        content = WrapText(lyrics, length=1000)
         pag = LyricsPaginator(
-            lyrics=content, ctx=interaction, thumbnail=player.current.thumbnail
+            lyrics=pages, ctx=interaction, thumbnail=player.current.thumbnail
         )
         await pag.start()
 
@@ -1185,11 +1396,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         `/filter`
         """
 
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1270,11 +1479,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         `/create_filter channel_mix left_to_right=0.5 right_to_left=0.5 right_to_right=0.5 left_to_left=0.5`
         """
 
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1355,11 +1562,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         `/create_filter time_scale speed=1.5 pitch=1.5 rate=1.5`
         """
 
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1458,11 +1663,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         tan_offset=0.5 tan_scale=1.5 offset=0.5 scale=1.5`
         """
 
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1506,6 +1709,89 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
             )
         )
 
+    @create_filter.sub_command(
+        description="Build a custom Equalizer from a curve and bass, mid and treble gains."
+    )
+    async def equalizer(
+            self,
+            interaction: disnake.ApplicationCommandInteraction,
+            curve: str = Param(description="Curve to start from", default=None, choices=list(wavelink.EQ_CURVES)),
+            bass: float = Param(description="Bass gain", default=0.0, ge=-0.25, le=1.0),
+            mid: float = Param(description="Mid gain", default=0.0, ge=-0.25, le=1.0),
+            treble: float = Param(description="Treble gain", default=0.0, ge=-0.25, le=1.0),
+            notch: int = Param(description="Frequency to cut, in Hz", default=None, ge=20, le=20000),
+    ):
+        """
+        This slash command builds an equalizer filter. The gains are added to the named curve, if one is chosen,
+        and turned into the gains of the 15 bands of the Lavalink equalizer.
+
+        Parameters
+        ----------
+        interaction : disnake.ApplicationCommandInteraction
+            This parameter takes disnake.ApplicationCommandInteraction object, when this slash command is executed
+            which creates an Interaction.
+
+        curve : str
+            The named curve to start from, e.g. Rock.
+
+        bass : float
+            The gain of the bass, below 150 Hz. -0.25 mutes it, 0.25 doubles it.
+
+        mid : float
+            The gain of the mids, around 1 kHz.
+
+        treble : float
+            The gain of the treble, above 6 kHz.
+
+        notch : int
+            A frequency to cut, e.g. a harsh resonance.
+
+        Examples
+        --------
+        `/create_filter equalizer curve=Rock bass=0.1 notch=3000`
+        """
+
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
+
+        if not player or not player.is_connected:
+            return await interaction.response.send_message(
+                embed=disnake.Embed(
+                    description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
+                    colour=disnake.Colour.random(),
+                ),
+                delete_after=10,
+            )
+
+        if not self.is_author(interaction):
+            return await interaction.response.send_message(
+                embed=disnake.Embed(
+                    description=f"{self.bot.icons['info']} Only the `{player.dj}` can set the filter to the player.",
+                    color=disnake.Colour.random(),
+                )
+            )
+
+        builder = wavelink.Equalizer(curve or "Equalizer")
+        if curve:
+            builder.curve(curve)
+        if bass:
+            builder.low_shelf(150, bass)
+        if mid:
+            builder.peak(1000, mid, q=0.7)
+        if treble:
+            builder.high_shelf(6000, treble)
+        if notch:
+            builder.notch(notch)
+        filter_ = builder.build()
+
+        await player.set_filter(filter_)
+        await interaction.response.send_message(
+            embed=disnake.Embed(
+                description=f"{self.bot.icons['greentick']} `Filter set to:` {filter_.name}\n"
+                            f"`{' '.join(f'{gain:+.2f}' for gain in builder.gains)}`",
+                colour=disnake.Colour.random(),
+            )
+        )
+
     @commands.slash_command(description="Display the player's queued songs.")
     async def queue(self, interaction: disnake.ApplicationCommandInteraction):
         pass
@@ -1526,11 +1812,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
          `/queue show`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1548,19 +1832,67 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
                 ),
             )
 
-        entries = []
-        for track in player.queue._queue:
-            entries.append(
-                f"[{track.title}]({track.uri}) - `{track.author}` - "
-                f"`{humanize.precisedelta(datetime.timedelta(milliseconds=track.length))}`"
-            )
-
         await interaction.response.send_message("Loading...")
 
-        paginator = QueuePages(entries=entries, ctx=interaction)
+        paginator = QueuePages(player, ctx=interaction)
 
         await paginator.start()
 
+    @queue.sub_command(description="Show when a song in the queue will play.")
+    async def eta(
+            self,
+            interaction: disnake.ApplicationCommandInteraction,
+            index: int = Param(description="The index of the song in the queue."),
+    ):
+        """
+        A command that will show how long it takes until a song of the queue plays.
+
+        Parameters
+        ----------
+        interaction : disnake.ApplicationCommandInteraction
+            This parameter takes disnake.ApplicationCommandInteraction object, when this slash command is executed which
+            creates an Interaction.
+
+        index : int
+            The index of the song in the queue.
+
+        Examples
+        --------
+         `/queue eta index: 5`
+        """
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
+
+        if not player or not player.is_connected:
+            return await interaction.response.send_message(
+                embed=disnake.Embed(
+                    description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
+                    colour=disnake.Colour.random(),
+                )
+            )
+
+        if not 1 <= index <= player.queue.qsize():
+            return await interaction.response.send_message(
+                embed=disnake.Embed(
+                    description=f"{self.bot.icons['redtick']} `That is not a valid index.`",
+                    colour=disnake.Colour.random(),
+                )
+            )
+
+        track = player.queue[index - 1]
+        eta = player.eta(index - 1)
+        if eta is None:
+            description = f"{self.bot.icons['info']} `{track.title}` will not play until the current song is " \
+                          f"skipped, since it never ends."
+        else:
+            description = f"{self.bot.icons['info']} `{track.title}` plays in " \
+                          f"`{humanize.precisedelta(datetime.timedelta(milliseconds=eta))}`."
+            if player.queue.streams:
+                description += " Streams in the queue are not counted."
+
+        await interaction.response.send_message(
+            embed=disnake.Embed(description=description, colour=disnake.Colour.random())
+        )
+
     @queue.sub_command(description="Clear the player's queued songs.")
     async def clear(self, interaction: disnake.ApplicationCommandInteraction):
         """
@@ -1576,11 +1908,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
         `/queue clear`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1610,7 +1940,7 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
             return
 
         required = self.vote_check(interaction)
-        player.clear_votes.add(interaction.author)
+        player.add_vote(player.clear_votes, interaction.author)
 
         if len(player.shuffle_votes) >= required:
             await interaction.response.send_message(
@@ -1652,11 +1982,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
          `/queue remove index: 1`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1702,8 +2030,147 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
             )
         )
 
+    @queue.sub_command(description="Move a song in the queue to another position.")
+    async def move(
+            self,
+            interaction: disnake.ApplicationCommandInteraction,
+            index: int = Param(description="The index of the song to move."),
+            position: int = Param(description="The new index of the song."),
+    ):
+        """
+        A command that will move a song from one index/number of the queue to another.
+
+        Parameters
+        ----------
+        interaction : disnake.ApplicationCommandInteraction
+            This parameter takes disnake.ApplicationCommandInteraction object, when this slash command is executed which
+            creates an Interaction.
+
+        index : int
+            The index of the song to move.
+
+        position : int
+            The new index of the song.
+
+        Examples
+        --------
+         `/queue move index: 5 position: 1`
+        """
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
+
+        if not player or not player.is_connected:
+            return await interaction.response.send_message(
+                embed=disnake.Embed(
+                    description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
+                    colour=disnake.Colour.random(),
+                )
+            )
+
+        if player.queue.qsize() < 2:
+            return await interaction.response.send_message(
+                embed=disnake.Embed(
+                    description=f"{self.bot.icons['info']} Add more songs before moving them.",
+                    colour=disnake.Colour.random(),
+                ),
+            )
+        if not self.is_author(interaction):
+            return await interaction.response.send_message(
+                embed=disnake.Embed(
+                    description=f"Only {player.dj} can use this command.",
+                    color=disnake.Colour.random(),
+                )
+            )
+        if not 1 <= index <= player.queue.qsize() or not 1 <= position <= player.queue.qsize():
+            return await interaction.response.send_message(
+                embed=disnake.Embed(
+                    description=f"{self.bot.icons['redtick']} `That is not a valid index.`",
+                    colour=disnake.Colour.random(),
+                )
+            )
+        track = player.queue.move(index - 1, position - 1)
+        await interaction.response.send_message(
+            embed=disnake.Embed(
+                description=f"{self.bot.icons['greentick']} Moved `{track.title}` to position `{position}`.",
+                colour=disnake.Colour.random(),
+            )
+        )
+
+    @queue.sub_command(description="Remove a range of songs from the queue.")
+    async def remove_range(
+            self,
+            interaction: disnake.ApplicationCommandInteraction,
+            start: int = Param(description="The index of the first song to remove."),
+            end: int = Param(description="The index of the last song to remove."),
+    ):
+        """
+        A command that will remove every song from one index/number of the queue up to another, both included.
+
+        Parameters
+        ----------
+        interaction : disnake.ApplicationCommandInteraction
+            This parameter takes disnake.ApplicationCommandInteraction object, when this slash command is executed which
+            creates an Interaction.
+
+        start : int
+            The index of the first song to remove.
+
+        end : int
+            The index of the last song to remove.
+
+        Examples
+        --------
+         `/queue remove_range start: 3 end: 10`
+        """
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
+
+        if not player or not player.is_connected:
+            return await interaction.response.send_message(
+                embed=disnake.Embed(
+                    description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
+                    colour=disnake.Colour.random(),
+                )
+            )
+
+        if player.queue.qsize() == 0:
+            return await interaction.response.send_message(
+                embed=disnake.Embed(
+                    description=f"{self.bot.icons['info']} There are no more songs "
+                                f"in the queue.",
+                    colour=disnake.Colour.random(),
+                ),
+            )
+        if not self.is_author(interaction):
+            return await interaction.response.send_message(
+                embed=disnake.Embed(
+                    description=f"Only {player.dj} can use this command.",
+                    color=disnake.Colour.random(),
+                )
+            )
+        if not 1 <= start <= end <= player.queue.qsize():
+            return await interaction.response.send_message(
+                embed=disnake.Embed(
+                    description=f"{self.bot.icons['redtick']} `That is not a valid range.`",
+                    colour=disnake.Colour.random(),
+                )
+            )
+        removed = player.queue.remove_range(start - 1, end)
+        await interaction.response.send_message(
+            embed=disnake.Embed(
+                description=f"{self.bot.icons['greentick']} `Removed {len(removed)} songs from queue.`",
+                colour=disnake.Colour.random(),
+            )
+        )
+
     @queue.sub_command(description="Shuffle the queue.")
-    async def shuffle(self, interaction: disnake.ApplicationCommandInteraction):
+    async def shuffle(
+            self,
+            interaction: disnake.ApplicationCommandInteraction,
+            mode: str = Param(
+                description="Random, or fair to interleave the songs of every requester.",
+                default="random",
+                choices=["random", "fair"],
+            ),
+    ):
         """
         A command that will shuffle the entire queue of the current music player instance.
         You need at least 3 songs or more in queue in order to shuffle properly.
@@ -1714,15 +2181,18 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
             This parameter takes disnake.ApplicationCommandInteraction object, when this slash command is executed which
             creates an Interaction.
 
+        mode: str
+            The shuffle mode. `fair` interleaves the songs of every requester, so one requester does not fill the
+            start of the queue.
+
         Examples
         --------
         `/queue shuffle`
+        `/queue shuffle mode: fair`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1748,10 +2218,10 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
             )
 
             player.shuffle_votes.clear()
-            return player.queue.shuffle()
+            return await player.queue.shuffle(fair=mode == "fair")
 
         required = self.vote_check(interaction)
-        player.shuffle_votes.add(interaction.author)
+        player.add_vote(player.shuffle_votes, interaction.author)
 
         if len(player.shuffle_votes) >= required:
             await interaction.channel.send(
@@ -1762,7 +2232,7 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
             )
 
             player.shuffle_votes.clear()
-            player.queue.shuffle()
+            await player.queue.shuffle(fair=mode == "fair")
         else:
             return await interaction.channel.send(
                 embed=disnake.Embed(
@@ -1786,11 +2256,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
          `/nowplaying`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1825,11 +2293,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
          `/save`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1884,12 +2350,10 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
         `/seek position: 3:56` -> This will skip to 3 minutes and 56 seconds in the playing track.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
         time_regex = r"([0-9]{1,2})[:ms](([0-9]{1,2})s?)?"
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1963,11 +2427,9 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         --------
         `/swap_dj member: @Member` -> This will switch the player's DJ to the member specified.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1983,7 +2445,7 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
                 )
             )
 
-        members = self.bot.get_channel(int(player.channel_id)).members
+        members = self.bot.voice_index.members(int(player.channel_id))
 
         if member and member not in members:
             return await interaction.response.send_message(
@@ -1998,7 +2460,7 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
                 "Cannot swap DJ to the current DJ... :)",
             )
 
-        if len(members) <= 2:
+        if len(members) <= 1:
             return await interaction.channel.send(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `{member}` No more members to swap to."
@@ -2,6 +2,7 @@
 import json
 import pkgutil
 import sys
+import time
 import traceback
 import typing
 import zlib
@@ -10,11 +11,27 @@ from typing import Optional
 import disnake
 import mystbin
 from aiohttp import ClientSession
-from disnake import AllowedMentions, Intents
+from disnake import AllowedMentions
 from disnake.ext import commands
 from loguru import logger
 
+from core.ipc import IPCClient
+from utils.cache_profiles import cache_options, rss_mb, rss_per_1k_guilds
+from utils.command_index import CommandIndex
+from utils.command_sync import (
+    GLOBAL_SCOPE,
+    CommandSyncState,
+    command_scopes,
+    hash_commands,
+)
+from utils.extractor import ExtractorPool
 from utils.helpers import Config
+from utils.journal import PlayerJournal
+from utils.lyrics import LyricsService, SomeRandomAPIProvider
+from utils.source_stats import SourceStatsIndex
+from utils.timer_wheel import TimerWheel
+from utils.track_suggestions import TrackSuggestions
+from utils.youtube_search import YouTubeSearch
 
 with open("./config/icons.json", mode="r", encoding="utf-8") as f:
     data = json.load(f)
@@ -29,11 +46,13 @@ class Bot(commands.AutoShardedBot):
     """
 
     def __init__(self, *args, **kwargs):
-        intents = Intents.all()
+        cache = cache_options(bot_config.cache_profile, bot_config.cache_max_messages)
+        cluster_id: Optional[int] = kwargs.pop("cluster_id", None)
+        ipc_path: Optional[str] = kwargs.pop("ipc_path", None)
 
         super().__init__(
             command_prefix=bot_config.prefix,
-            intents=intents,
+            intents=cache.pop("intents"),
             allowed_mentions=AllowedMentions(everyone=False, users=False, roles=False),
             case_insensitive=True,
             sync_commands_debug=True,
@@ -43,6 +62,7 @@ class Bot(commands.AutoShardedBot):
             owner_ids=bot_config.owners,
             reload=True,  # This Kwarg Enables Cog watchdog, Hot reloading of cogs.
             *args,
+            **cache,
             **kwargs,
         )
 
@@ -54,6 +74,50 @@ class Bot(commands.AutoShardedBot):
         self.mystbin_client = None
         self._buffer = None
         self._zlib = None
+        self.sync_state = CommandSyncState(bot_config.sync_state_file)
+        self.journal: Optional[PlayerJournal] = None
+        if bot_config.journal_enabled:
+            self.journal = PlayerJournal(
+                bot_config.journal_directory,
+                flush_interval=bot_config.journal_flush_interval,
+                snapshot_every=bot_config.journal_snapshot_every,
+            )
+        self.lyrics: Optional[LyricsService] = None
+        self.extractor = ExtractorPool(
+            workers=bot_config.extractor_workers,
+            max_pending=bot_config.extractor_max_pending,
+            cache_size=bot_config.extractor_cache_size,
+            cache_ttl=bot_config.extractor_cache_ttl,
+        )
+        # the statistics of the source code shown by the info commands, refreshed in the background.
+        self.source_stats = SourceStatsIndex()
+        self.youtube_search = YouTubeSearch(
+            concurrency=bot_config.search_concurrency,
+            cache_size=bot_config.search_cache_size,
+            cache_ttl=bot_config.search_cache_ttl,
+        )
+        # the recently played tracks suggested while the query of /play is typed.
+        self.track_suggestions = TrackSuggestions(
+            per_guild=bot_config.suggestions_per_guild,
+            global_size=bot_config.suggestions_global_size,
+            search_fallback=bot_config.suggestions_search,
+            debounce=bot_config.suggestions_debounce,
+            timeout=bot_config.suggestions_timeout,
+            search_ttl=bot_config.suggestions_search_ttl,
+        )
+        # the slash commands and cogs looked up by the help command and the autocompletes, see `add_cog`.
+        self.command_index = CommandIndex(self)
+        # while the cogs are loaded at startup, the index is built once after the last one.
+        self._loading_cogs = False
+        # the single scheduler of the idle disconnects, vote expiries and view timeouts.
+        self.timers = TimerWheel()
+        self.cluster_id = cluster_id
+        self.ipc: Optional[IPCClient] = None
+        if ipc_path is not None:
+            self.ipc = IPCClient(ipc_path, cluster_id)
+            self.ipc.add_handler("stats", self._ipc_stats)
+            self.ipc.add_handler("node_health", self._ipc_node_health)
+            self.ipc.add_handler("extension", self._ipc_extension)
 
     def load_cogs(self, exts) -> None:
         """
@@ -65,16 +129,47 @@ class Bot(commands.AutoShardedBot):
             A list of extensions to load.
         """
 
-        for m in pkgutil.iter_modules([exts]):
-            # a much better way to load cogs
-            module = f"cogs.{m.name}"
-            try:
-                self.load_extension(module)
-                self.logger.info(f"Loaded extension '{m.name}'", __name="Music Bot")
-            except Exception as e:
-                traceback.print_exception(type(e), e, e.__traceback__, file=sys.stderr)
-        self.load_extension("jishaku")
-        self.logger.info(f"Loaded extension 'jishaku'", __name="Music Bot")
+        self._loading_cogs = True
+        try:
+            for m in pkgutil.iter_modules([exts]):
+                # a much better way to load cogs
+                module = f"cogs.{m.name}"
+                try:
+                    self.load_extension(module)
+                    self.logger.info(f"Loaded extension '{m.name}'", __name="Music Bot")
+                except Exception as e:
+                    traceback.print_exception(type(e), e, e.__traceback__, file=sys.stderr)
+            self.load_extension("jishaku")
+            self.logger.info(f"Loaded extension 'jishaku'", __name="Music Bot")
+        finally:
+            self._loading_cogs = False
+        self.command_index.rebuild()
+
+    def add_cog(self, cog: commands.Cog, *args, **kwargs) -> None:
+        """
+        A method that adds a cog to the bot, and rebuilds the command index with the commands of the cog.
+        """
+        super().add_cog(cog, *args, **kwargs)
+        self._update_command_index()
+
+    def remove_cog(self, name: str) -> Optional[commands.Cog]:
+        """
+        A method that removes a cog from the bot, and rebuilds the command index without its commands.
+        """
+        cog = super().remove_cog(name)
+        self._update_command_index()
+        return cog
+
+    def _update_command_index(self) -> None:
+        if self._loading_cogs:
+            self.command_index.invalidate()
+            return
+        try:
+            self.command_index.rebuild()
+        except Exception as e:
+            # rebuilt by the next lookup instead, a broken docstring must not fail loading the cog.
+            self.command_index.invalidate()
+            self.logger.error(f"Failed to rebuild the command index: {e}", __name="Music Bot")
 
     async def login(self, *args, **kwargs) -> None:
         """
@@ -85,9 +180,205 @@ class Bot(commands.AutoShardedBot):
         self.mystbin_client = mystbin.Client(
             session=self.session
         )  # creating a mystbin client
+        self.lyrics = LyricsService(
+            SomeRandomAPIProvider(self.session, timeout=bot_config.lyrics_timeout),
+            directory=bot_config.lyrics_directory,
+            max_size=bot_config.lyrics_cache_size,
+            ttl=bot_config.lyrics_ttl,
+            negative_ttl=bot_config.lyrics_negative_ttl,
+            prefetch=bot_config.lyrics_prefetch,
+            max_files=bot_config.lyrics_disk_size,
+        )
+        if self.ipc and not self.ipc.is_connected:
+            await self.ipc.connect()
+        if self.journal:
+            self.journal.start()
+        self.timers.start()
+        self.source_stats.start()
 
         await super().login(*args, **kwargs)
 
+    async def close(self) -> None:
+        """
+        A method that closes the bot, after flushing the player journal and closing the IPC connection.
+        """
+        if self.ipc:
+            await self.ipc.close()
+        self.timers.close()
+        self.source_stats.close()
+        self.extractor.close()
+        if self.journal:
+            await self.journal.close()
+
+        await super().close()
+
+    async def _ipc_stats(self, data: dict) -> dict:
+        """
+        An IPC handler that returns the statistics of this cluster.
+        """
+        client = getattr(self, "wavelink", None)
+        players = client.players if client else {}
+        return {
+            "cluster": self.cluster_id,
+            "shards": list(self.shards),
+            "guilds": len(self.guilds),
+            "users": len(self.users),
+            "players": len(players),
+            "players_created": client.players_created if client else 0,
+            "players_never_connected": client.players_never_connected if client else 0,
+            "playing": len([p for p in players.values() if p.is_playing]),
+            # aggregated, so the size of the reply does not grow with the amount of players.
+            "gaps": self._gap_stats(players.values()),
+            "latency": self.latency,
+            "views": self.view_store_size(),
+            "timers": self.timers.stats(),
+            "lyrics": self.lyrics.stats() if self.lyrics else {},
+            "extractor": self.extractor.stats(),
+            "youtube_search": self.youtube_search.stats(),
+            "track_suggestions": self.track_suggestions.stats(),
+        }
+
+    @staticmethod
+    def _gap_stats(players: typing.Iterable) -> dict:
+        """
+        A method that returns the count, sum and maximum of the average gaps between tracks of the players.
+        """
+        gaps = [p.average_gap for p in players if getattr(p, "average_gap", None) is not None]
+        return {"count": len(gaps), "sum": sum(gaps), "max": max(gaps, default=0.0)}
+
+    def view_store_size(self) -> int:
+        """
+        A method that returns the amount of view items the bot is listening to, persistent or bound to a message.
+        With the persistent controller and song selection views, this does not grow with the amount of players.
+        """
+        store = self._connection._view_store
+        return len(store._views) + len(store._synced_message_views)
+
+    async def _ipc_node_health(self, data: dict) -> typing.List[dict]:
+        """
+        An IPC handler that returns the health of the Lavalink nodes this cluster is connected to.
+        """
+        client = getattr(self, "wavelink", None)
+        if not client:
+            return []
+        return [
+            {
+                "identifier": node.identifier,
+                "available": node.is_available,
+                "players": len(node.players),
+                "penalty": node.penalty,
+            }
+            for node in client.nodes.values()
+        ]
+
+    async def _ipc_extension(self, data: dict) -> bool:
+        """
+        An IPC handler that loads, unloads or reloads an extension, so owner commands apply to every cluster.
+        """
+        actions = {
+            "enable": self.load_extension,
+            "disable": self.unload_extension,
+            "reload": self.reload_extension,
+        }
+        try:
+            actions[data["action"]](data["name"])
+        except Exception as e:
+            self.logger.error(
+                f"Failed to {data['action']} extension '{data['name']}': {e}",
+                __name="Music Bot",
+            )
+            return False
+        return True
+
+    async def cluster_stats(self) -> typing.List[dict]:
+        """
+        A method that returns the statistics of every cluster, or only of this process if clustering is disabled.
+
+        Returns
+        -------
+        typing.List[dict]
+            The statistics of each cluster.
+        """
+        if self.ipc and self.ipc.is_connected:
+            stats = await self.ipc.request("stats")
+            if stats:
+                return [stat for stat in stats if stat]
+        return [await self._ipc_stats({})]
+
+    async def cluster_node_health(self) -> typing.List[dict]:
+        """
+        A method that returns the health of the Lavalink nodes of every cluster.
+
+        Returns
+        -------
+        typing.List[dict]
+            The health of each node, one entry per node per cluster.
+        """
+        if self.ipc and self.ipc.is_connected:
+            health = await self.ipc.request("node_health")
+            if health:
+                return [node for cluster in health for node in cluster or []]
+        return await self._ipc_node_health({})
+
+    async def _sync_application_commands(self) -> None:
+        """
+        A method that syncs the application commands with Discord, but only when the registered command tree
+        has changed since the last sync. The hashes of the synced tree are stored locally.
+
+        The command permissions are not part of the hashes, so they are synced on every startup, like the base class
+        does, whether the commands changed or not.
+
+        In cluster mode the commands are shared by every cluster, so only the first cluster syncs them and writes
+        the state file.
+        """
+        # the same guards as the sync of the base class.
+        if not getattr(self, "_sync_commands", True) or self.is_closed() or self.loop.is_closed():
+            return
+
+        if self.cluster_id:
+            self.logger.info(
+                f"Cluster {self.cluster_id} leaves syncing slash commands to cluster 0.", __name="Music Bot"
+            )
+            return
+
+        scopes = command_scopes(self)
+        hashes = {scope: hash_commands(cmds) for scope, cmds in scopes.items()}
+        changed = self.sync_state.changed_scopes(self.application_id, hashes)
+
+        if not changed:
+            self.logger.info(
+                f"Slash commands are unchanged, skipped syncing. "
+                f"Saved ~{self.sync_state.last_duration:.2f}s of startup time.",
+                __name="Music Bot",
+            )
+            await self._sync_command_permissions()
+            return
+
+        start = time.perf_counter()
+        if self.config.sync_incremental:
+            for scope in changed:
+                cmds = scopes.get(scope, [])
+                if scope == GLOBAL_SCOPE:
+                    await self.bulk_overwrite_global_commands(cmds)
+                else:
+                    await self.bulk_overwrite_guild_commands(int(scope), cmds)
+            # the overwrites above bypass the sync of the base class, which also syncs the command permissions.
+            await self._sync_command_permissions()
+        else:
+            await super()._sync_application_commands()
+        duration = time.perf_counter() - start
+
+        self.sync_state.update(self.application_id, hashes, duration)
+        self.logger.info(
+            f"Synced slash commands for {len(changed)} scope(s) in {duration:.2f}s.",
+            __name="Music Bot",
+        )
+
+    async def _sync_command_permissions(self) -> None:
+        sync_permissions = getattr(self, "_sync_application_command_permissions", None)
+        if getattr(self, "_sync_permissions", False) and sync_permissions is not None:
+            await sync_permissions()
+
     async def on_ready(self):
         """
         An event that triggers when the bot is connected properly to gateway and bot cache is completely loaded.
@@ -98,8 +389,14 @@ class Bot(commands.AutoShardedBot):
             f"Bot ID: {self.user.id}\n"
             f"Total Guilds: {len(self.guilds)}\n"
             f"Total Users: {len(self.users)}\n"
+            f"Cache profile: {self.config.cache_profile}\n"
             f"------------------------------------------"
         )
+        self.logger.info(
+            f"RSS is {rss_mb():.1f} MB, {rss_per_1k_guilds(len(self.guilds)):.1f} MB per 1k guilds "
+            f"with the '{self.config.cache_profile}' cache profile.",
+            __name="Music Bot",
+        )
 
     @property
     async def get_owners(self) -> typing.List[typing.Optional[disnake.User]]:
@@ -0,0 +1,144 @@
+#  -*- coding: utf-8 -*-
+"""
+Cluster mode of the bot, which runs groups of shards in separate worker processes.
+Each cluster is a full `core.MusicBot.Bot` with its own event loop and wavelink client, the clusters share
+information through the IPC layer in `core.ipc`.
+"""
+import asyncio
+import multiprocessing
+import typing
+
+from loguru import logger
+
+from core.ipc import IPCServer
+from utils.helpers import Config
+
+
+def shard_groups(shard_count: int, clusters: int) -> typing.List[typing.List[int]]:
+    """
+    A function that splits the shard IDs into contiguous groups, one group per cluster.
+
+    Parameters
+    ----------
+    shard_count : int
+        The total amount of shards.
+    clusters : int
+        The amount of clusters to split the shards into.
+
+    Returns
+    -------
+    typing.List[typing.List[int]]
+        The shard IDs of each cluster.
+    """
+    clusters = max(1, min(clusters, shard_count))
+    size, extra = divmod(shard_count, clusters)
+    groups, start = [], 0
+    for index in range(clusters):
+        end = start + size + (1 if index < extra else 0)
+        groups.append(list(range(start, end)))
+        start = end
+    return groups
+
+
+def run_cluster(
+    cluster_id: int, shard_ids: typing.List[int], shard_count: int, ipc_path: str
+) -> None:
+    """
+    The entry point of a cluster worker process.
+
+    Parameters
+    ----------
+    cluster_id : int
+        The ID of the cluster.
+    shard_ids : typing.List[int]
+        The shards this cluster runs.
+    shard_count : int
+        The total amount of shards across all clusters.
+    ipc_path : str
+        The path of the Unix socket of the IPC server.
+    """
+    from core.MusicBot import Bot
+
+    bot = Bot(
+        shard_ids=shard_ids,
+        shard_count=shard_count,
+        cluster_id=cluster_id,
+        ipc_path=ipc_path,
+    )
+    bot.load_cogs("cogs")
+    logger.info(
+        f"Cluster {cluster_id} is starting shards {shard_ids}", __name="Music Bot"
+    )
+    bot.run(bot.config.token, reconnect=True)
+
+
+class ClusterManager:
+    """
+    A class that spawns and supervises the cluster worker processes and runs the IPC server they talk through.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.shard_count = config.cluster_shard_count
+        self.groups = shard_groups(self.shard_count, config.cluster_count)
+        self.server = IPCServer(config.cluster_ipc_path)
+        self.processes: typing.Dict[int, multiprocessing.Process] = {}
+        self._context = multiprocessing.get_context("spawn")
+
+    def _spawn(self, cluster_id: int) -> None:
+        process = self._context.Process(
+            target=run_cluster,
+            args=(
+                cluster_id,
+                self.groups[cluster_id],
+                self.shard_count,
+                self.server.path,
+            ),
+            name=f"Cluster-{cluster_id}",
+            # not daemonic, daemonic processes cannot start the worker processes of the extractor pool. The
+            # clusters are terminated by `start` when the manager stops.
+            daemon=False,
+        )
+        process.start()
+        self.processes[cluster_id] = process
+        logger.info(
+            f"Spawned cluster {cluster_id} (pid {process.pid}) with shards {self.groups[cluster_id]}",
+            __name="Cluster",
+        )
+
+    async def start(self) -> None:
+        """
+        A method that starts the IPC server, spawns every cluster and restarts the clusters that die.
+        """
+        await self.server.start()
+        for cluster_id in range(len(self.groups)):
+            self._spawn(cluster_id)
+
+        try:
+            while True:
+                await asyncio.sleep(5)
+                for cluster_id, process in list(self.processes.items()):
+                    if not process.is_alive():
+                        logger.warning(
+                            f"Cluster {cluster_id} exited with code {process.exitcode}, restarting it.",
+                            __name="Cluster",
+                        )
+                        self._spawn(cluster_id)
+        finally:
+            for process in self.processes.values():
+                process.terminate()
+            for process in self.processes.values():
+                process.join(timeout=10)
+                if process.is_alive():
+                    logger.warning(f"{process.name} did not stop, killing it.", __name="Cluster")
+                    process.kill()
+            await self.server.close()
+
+    def run(self) -> None:
+        """
+        A method that runs the cluster manager until it is interrupted.
+        """
+        try:
+            asyncio.run(self.start())
+        except KeyboardInterrupt:
+            logger.info("Shutting down clusters...", __name="Cluster")
@@ -0,0 +1,390 @@
+#  -*- coding: utf-8 -*-
+"""
+A small IPC layer over a Unix socket, used by the clusters of the bot to talk to each other.
+
+Every message is a single line of JSON. Clusters connect to the `IPCServer` that is run by the cluster manager
+and can either broadcast an event to every other cluster, or request an event, which is answered by every
+cluster (including the requesting one) and returned as a list of replies.
+"""
+import asyncio
+import itertools
+import json
+import os
+import typing
+
+from loguru import logger
+
+IPCHandler = typing.Callable[[dict], typing.Awaitable[typing.Any]]
+
+# the maximum length of a message, the default limit of a StreamReader is 64 KiB.
+MAX_LINE = 16 * 1024 * 1024
+
+
+def _encode(payload: dict) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+async def _write(writer: asyncio.StreamWriter, payload: dict) -> None:
+    writer.write(_encode(payload))
+    await writer.drain()
+
+
+async def _read(reader: asyncio.StreamReader, name: str) -> typing.AsyncIterator[dict]:
+    # yields the messages of a connection until it is closed, a message that is too long or is not JSON is skipped
+    # instead of closing the connection.
+    while True:
+        try:
+            line = await reader.readline()
+        except ValueError as e:
+            logger.warning(f"Skipped an IPC message over {MAX_LINE} bytes: {e}", __name=name)
+            continue
+        if not line:
+            return
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            logger.warning(f"Skipped an invalid IPC message: {e}", __name=name)
+
+
+class _Peer:
+    """
+    A connection to the IPC server. The messages to the connection are queued and written by its own task, so a
+    slow or stuck cluster only backs up its own queue, instead of the cluster whose message is routed to it.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, max_pending: int):
+        self.writer = writer
+        self.cluster_id: typing.Optional[int] = None
+        self.dropped = 0
+        self._queue: asyncio.Queue = asyncio.Queue(max_pending)
+        self._task = asyncio.create_task(self._run())
+
+    def send(self, payload: dict) -> bool:
+        """
+        A method that queues a message without waiting, and returns whether it was queued. A message to a
+        connection whose queue is full is dropped.
+        """
+        if self.writer.is_closing():
+            return False
+        try:
+            self._queue.put_nowait(_encode(payload))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(
+                f"Dropped an IPC message to cluster {self.cluster_id}, {self._queue.maxsize} messages are pending",
+                __name="Cluster",
+            )
+            return False
+        return True
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                line = await self._queue.get()
+                self.writer.write(line)
+                await self.writer.drain()
+        except ConnectionError:
+            self.writer.close()
+
+    def close(self) -> None:
+        self._task.cancel()
+        self.writer.close()
+
+
+class IPCServer:
+    """
+    The IPC server that routes events between the clusters. It is run by the cluster manager process.
+
+    Parameters
+    ----------
+    path : str
+        The path of the Unix socket.
+    timeout : float
+        How long a request waits for the replies of the clusters, in seconds.
+    max_pending : int
+        The maximum amount of messages queued for a cluster, further messages to it are dropped until it catches up.
+    """
+
+    def __init__(self, path: str, *, timeout: float = 5.0, max_pending: int = 1000):
+        self.path = path
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.clusters: typing.Dict[int, _Peer] = {}
+        self._pending: typing.Dict[str, typing.Dict[int, typing.Any]] = {}
+        self._waiters: typing.Dict[str, asyncio.Future] = {}
+        self._expected: typing.Dict[str, int] = {}
+        self._nonce = itertools.count()
+        self._server: typing.Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """
+        A method that starts listening on the Unix socket.
+        """
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path, limit=MAX_LINE)
+        logger.info(f"IPC server listening on {self.path}", __name="Cluster")
+
+    async def close(self) -> None:
+        """
+        A method that stops the server and removes the socket file.
+        """
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        peer = _Peer(writer, self.max_pending)
+        cluster_id = None
+        try:
+            async for message in _read(reader, "Cluster"):
+                op = message.get("op")
+
+                if op == "identify":
+                    cluster_id = peer.cluster_id = int(message["cluster"])
+                    self.clusters[cluster_id] = peer
+                    logger.info(f"Cluster {cluster_id} connected to IPC", __name="Cluster")
+                elif op == "broadcast":
+                    self._broadcast(message, exclude=cluster_id)
+                elif op == "request":
+                    asyncio.create_task(self._request(message, peer))
+                elif op == "reply":
+                    self._reply(message, cluster_id)
+        except ConnectionError as e:
+            logger.warning(f"IPC connection of cluster {cluster_id} failed: {e}", __name="Cluster")
+        finally:
+            if cluster_id is not None and self.clusters.get(cluster_id) is peer:
+                del self.clusters[cluster_id]
+                logger.info(f"Cluster {cluster_id} disconnected from IPC", __name="Cluster")
+            peer.close()
+
+    def _broadcast(self, message: dict, *, exclude: typing.Optional[int] = None) -> None:
+        payload = {"op": "event", "event": message["event"], "data": message.get("data", {})}
+        for cluster_id, peer in list(self.clusters.items()):
+            if cluster_id != exclude:
+                peer.send(payload)
+
+    async def _request(self, message: dict, requester: _Peer) -> None:
+        nonce = f"server-{next(self._nonce)}"
+        targets = list(self.clusters.items())
+        self._pending[nonce] = {}
+        self._waiters[nonce] = asyncio.get_running_loop().create_future()
+
+        payload = {
+            "op": "event",
+            "nonce": nonce,
+            "event": message["event"],
+            "data": message.get("data", {}),
+        }
+        expected = sum(peer.send(payload) for _, peer in targets)
+
+        if expected:
+            self._expected[nonce] = expected
+            try:
+                await asyncio.wait_for(asyncio.shield(self._waiters[nonce]), self.timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"IPC request '{message['event']}' timed out with "
+                    f"{len(self._pending[nonce])}/{expected} replies",
+                    __name="Cluster",
+                )
+
+        replies = self._pending.pop(nonce)
+        del self._waiters[nonce]
+        self._expected.pop(nonce, None)
+        requester.send(
+            {
+                "op": "response",
+                "nonce": message["nonce"],
+                "data": [replies[key] for key in sorted(replies)],
+            }
+        )
+
+    def _reply(self, message: dict, cluster_id: typing.Optional[int]) -> None:
+        nonce = message.get("nonce")
+        if nonce not in self._pending or cluster_id is None:
+            return
+
+        self._pending[nonce][cluster_id] = message.get("data")
+        waiter = self._waiters[nonce]
+        if not waiter.done() and len(self._pending[nonce]) >= self._expected.get(nonce, 0):
+            waiter.set_result(None)
+
+
+class IPCClient:
+    """
+    The IPC client of a single cluster.
+
+    Parameters
+    ----------
+    path : str
+        The path of the Unix socket of the `IPCServer`.
+    cluster_id : int
+        The ID of the cluster this client belongs to.
+    """
+
+    def __init__(self, path: str, cluster_id: int, *, timeout: float = 10.0, max_backoff: float = 60.0):
+        self.path = path
+        self.cluster_id = cluster_id
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self._closed = False
+        self.handlers: typing.Dict[str, IPCHandler] = {}
+        self._futures: typing.Dict[str, asyncio.Future] = {}
+        self._nonce = itertools.count()
+        self._reader: typing.Optional[asyncio.StreamReader] = None
+        self._writer: typing.Optional[asyncio.StreamWriter] = None
+        self._task: typing.Optional[asyncio.Task] = None
+
+    @property
+    def is_connected(self) -> bool:
+        """
+        Whether the client is connected to the IPC server.
+        """
+        return self._writer is not None and not self._writer.is_closing()
+
+    def add_handler(self, event: str, handler: IPCHandler) -> None:
+        """
+        A method that registers a coroutine that handles an event. The return value of the handler is sent
+        back as the reply of this cluster, if the event was a request.
+
+        Parameters
+        ----------
+        event : str
+            The name of the event.
+        handler : IPCHandler
+            The coroutine function that handles the event. It receives the data of the event.
+        """
+        self.handlers[event] = handler
+
+    async def connect(self) -> None:
+        """
+        A method that connects to the IPC server and starts listening for events. The client reconnects by
+        itself when the connection is lost, until it is closed.
+        """
+        self._closed = False
+        await self._open()
+        self._task = asyncio.create_task(self._run())
+
+    async def _open(self) -> None:
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path, limit=MAX_LINE)
+        await _write(self._writer, {"op": "identify", "cluster": self.cluster_id})
+
+    async def _run(self) -> None:
+        while True:
+            await self._listen()
+            backoff = 1.0
+            while not self._closed:
+                await asyncio.sleep(backoff)
+                try:
+                    await self._open()
+                except OSError as e:
+                    backoff = min(backoff * 2, self.max_backoff)
+                    logger.warning(
+                        f"IPC reconnect failed: {e}, retrying in {backoff:.0f}s",
+                        __name=f"Cluster {self.cluster_id}",
+                    )
+                    continue
+                logger.info("Reconnected to IPC", __name=f"Cluster {self.cluster_id}")
+                break
+            if self._closed:
+                return
+
+    async def close(self) -> None:
+        """
+        A method that closes the connection to the IPC server, and stops reconnecting to it.
+        """
+        self._closed = True
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._writer:
+            self._writer.close()
+
+    async def broadcast(self, event: str, **data) -> None:
+        """
+        A method that sends an event to every other cluster.
+
+        Parameters
+        ----------
+        event : str
+            The name of the event.
+        data : typing.Any
+            The JSON serializable data of the event.
+        """
+        if not self.is_connected:
+            return
+        await _write(self._writer, {"op": "broadcast", "event": event, "data": data})
+
+    async def request(self, event: str, **data) -> typing.List[typing.Any]:
+        """
+        A method that sends an event to every cluster, including this one, and waits for their replies.
+
+        Parameters
+        ----------
+        event : str
+            The name of the event.
+        data : typing.Any
+            The JSON serializable data of the event.
+
+        Returns
+        -------
+        typing.List[typing.Any]
+            The replies of the clusters, ordered by cluster ID.
+        """
+        if not self.is_connected:
+            return []
+
+        nonce = f"{self.cluster_id}-{next(self._nonce)}"
+        future = asyncio.get_running_loop().create_future()
+        self._futures[nonce] = future
+        try:
+            await _write(
+                self._writer,
+                {"op": "request", "nonce": nonce, "event": event, "data": data},
+            )
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"IPC request '{event}' timed out", __name=f"Cluster {self.cluster_id}")
+            return []
+        finally:
+            self._futures.pop(nonce, None)
+
+    async def _listen(self) -> None:
+        try:
+            async for message in _read(self._reader, f"Cluster {self.cluster_id}"):
+                op = message.get("op")
+
+                if op == "response":
+                    future = self._futures.get(message["nonce"])
+                    if future and not future.done():
+                        future.set_result(message["data"])
+                elif op == "event":
+                    asyncio.create_task(self._dispatch(message))
+        except ConnectionError as e:
+            logger.warning(f"IPC connection lost: {e}", __name=f"Cluster {self.cluster_id}")
+        finally:
+            if self._writer:
+                self._writer.close()
+
+    async def _dispatch(self, message: dict) -> None:
+        handler = self.handlers.get(message["event"])
+        result = None
+        if handler:
+            try:
+                result = await handler(message.get("data", {}))
+            except Exception as e:
+                logger.error(
+                    f"IPC handler for '{message['event']}' failed: {e}",
+                    __name=f"Cluster {self.cluster_id}",
+                )
+
+        if "nonce" in message and self.is_connected:
+            await _write(
+                self._writer, {"op": "reply", "nonce": message["nonce"], "data": result}
+            )
@@ -6,6 +6,7 @@ import time
 import uvloop
 from loguru import logger
 import sys
+from core.cluster import ClusterManager
 from core.MusicBot import Bot
 from utils.helpers import Config
 from utils.process import lavalink_alive
@@ -16,8 +17,16 @@ if __name__ == "__main__":
         asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     else:
         pass
-    bot = Bot()
     config = Config()
+    if config.cluster_enabled:
+        logger.info("Starting Lavalink.....", __name="Music Bot")
+        lavalink_alive()
+        time.sleep(30)  # Wait for lavalink to start
+
+        ClusterManager(config).run()
+        sys.exit(0)
+
+    bot = Bot()
     bot.load_cogs("cogs")
     logger.info("All cogs have been successfully loaded", __name="Music Bot")
     logger.info("Starting Lavalink.....", __name="Music Bot")
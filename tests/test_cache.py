@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from utils.cache import InFlight
+
+
+def test_concurrent_waits_share_one_call():
+    calls = []
+
+    async def call():
+        calls.append(None)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def run():
+        pending = InFlight()
+        results = await asyncio.gather(*(pending.wait("key", call) for _ in range(5)))
+        return pending, results
+
+    pending, results = asyncio.run(run())
+    assert results == [1] * 5
+    assert pending.coalesced == 4
+    assert len(pending) == 0
+
+
+def test_cancelled_waiter_does_not_cancel_the_call():
+    async def run():
+        pending = InFlight()
+        done = asyncio.Event()
+
+        async def call():
+            await asyncio.sleep(0.02)
+            done.set()
+            return "result"
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pending.wait("key", call), 0.001)
+        assert "key" in pending
+        await asyncio.wait_for(done.wait(), 1)
+        return await pending.wait("key", call)
+
+    assert asyncio.run(run()) == "result"
+
+
+def test_exception_is_raised_to_every_waiter():
+    async def call():
+        await asyncio.sleep(0)
+        raise ValueError("failed")
+
+    async def run():
+        pending = InFlight()
+        results = await asyncio.gather(*(pending.wait("key", call) for _ in range(3)), return_exceptions=True)
+        return pending, results
+
+    pending, results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert "key" not in pending
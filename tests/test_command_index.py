@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("disnake")
+
+from utils.command_index import FuzzyIndex, trigrams
+
+NAMES = ["play", "pause", "playlist", "queue", "skip", "lyrics", "loop", "nowplaying"]
+
+
+def test_trigrams():
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+def test_empty_query_lists_every_name_sorted():
+    index = FuzzyIndex(NAMES)
+    assert index.search("") == sorted(NAMES)
+    assert index.search("", limit=2) == sorted(NAMES)[:2]
+
+
+def test_prefix_matches_first():
+    index = FuzzyIndex(NAMES)
+    assert index.search("pla")[:2] == ["play", "playlist"]
+    assert index.search("PLAY")[:2] == ["play", "playlist"]
+
+
+def test_substring_matches_after_prefix_matches():
+    index = FuzzyIndex(NAMES)
+    found = index.search("play")
+    assert found.index("nowplaying") > found.index("playlist")
+
+
+def test_close_names():
+    index = FuzzyIndex(NAMES)
+    assert "play" in index.search("plya")
+    assert "lyrics" in index.search("lyrcs")
+    assert index.search("zzzz") == []
+
+
+def test_names_keep_their_case():
+    index = FuzzyIndex(["Music_", "Misc_"])
+    assert "music_" in index
+    assert index.search("mus") == ["Music_"]
+    assert len(index) == 2
@@ -0,0 +1,46 @@
+import pytest
+
+for module in ("aiohttp", "numpy"):
+    pytest.importorskip(module)
+
+from wavelink.equalizer import BANDS, Equalizer, equalizer_gains
+from wavelink.errors import FilterInvalidArgument
+
+
+def test_flat_curve():
+    assert equalizer_gains(()) == (0.0,) * len(BANDS)
+
+
+def test_peak_is_highest_at_its_band():
+    gains = equalizer_gains((("peak", 1000.0, 0.2, 1.0),))
+    assert len(gains) == 15
+    assert max(gains) == gains[list(BANDS).index(1000)] == pytest.approx(0.2)
+    assert gains[0] == pytest.approx(0.0, abs=1e-3)
+
+
+def test_shelves():
+    low = equalizer_gains((("low_shelf", 200.0, 0.2, 1.0),))
+    high = equalizer_gains((("high_shelf", 4000.0, 0.2, 1.0),))
+    assert low[0] > low[-1]
+    assert high[-1] > high[0]
+    assert all(a >= b for a, b in zip(low, low[1:]))
+    assert all(a <= b for a, b in zip(high, high[1:]))
+
+
+def test_gains_are_clamped():
+    gains = equalizer_gains((("peak", 1000.0, 5.0, 1.0), ("peak", 25.0, -5.0, 1.0)))
+    assert max(gains) == 1.0
+    assert min(gains) == -0.25
+
+
+def test_gains_are_memoized():
+    components = (("peak", 500.0, 0.1, 2.0),)
+    assert equalizer_gains(components) is equalizer_gains(components)
+
+
+def test_builder_validates():
+    with pytest.raises(FilterInvalidArgument):
+        Equalizer().peak(10, 0.1)
+    with pytest.raises(FilterInvalidArgument):
+        Equalizer().peak(1000, 0.1, q=0)
+    assert Equalizer().peak(1000, 0.1).components == (("peak", 1000.0, 0.1, 1.0),)
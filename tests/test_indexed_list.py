@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+from utils.indexed_list import IndexedList
+
+
+def weight(item: int) -> int:
+    return item % 7
+
+
+def check(items: IndexedList, expected: list) -> None:
+    assert list(items) == expected
+    assert len(items) == len(expected)
+    assert list(reversed(items)) == expected[::-1]
+    assert items.total_weight == sum(map(weight, expected))
+
+
+def test_empty():
+    items = IndexedList()
+    assert not items
+    assert len(items) == 0
+    assert list(items) == []
+    with pytest.raises(IndexError):
+        items.popleft()
+
+
+def test_deque_api():
+    items = IndexedList(load=2)
+    for value in range(10):
+        items.append(value)
+    items.appendleft(-1)
+    assert items.popleft() == -1
+    assert items.popleft() == 0
+    assert list(items) == list(range(1, 10))
+
+
+def test_indexing_and_slicing():
+    expected = list(range(100))
+    items = IndexedList(expected, load=4, weight=weight)
+    for index in (0, 1, 50, 99, -1, -100):
+        assert items[index] == expected[index]
+    for start, stop in ((0, 10), (5, 37), (90, 200), (-10, None), (None, None)):
+        assert items[start:stop] == expected[start:stop]
+    assert list(items.iter_range(13, 41)) == expected[13:41]
+    with pytest.raises(IndexError):
+        items[100]
+
+
+def test_random_operations_match_list():
+    rng = random.Random(1234)
+    expected = list(range(50))
+    # a small load, so chunks are split and merged a lot.
+    items = IndexedList(expected, load=3, weight=weight)
+    counter = 50
+
+    for _ in range(3000):
+        op = rng.randrange(8)
+        if op == 0:
+            index = rng.randint(-len(expected), len(expected))
+            items.insert(index, counter)
+            expected.insert(index, counter)
+            counter += 1
+        elif op == 1 and expected:
+            index = rng.randrange(-len(expected), len(expected))
+            assert items.pop(index) == expected.pop(index)
+        elif op == 2 and expected:
+            source, destination = rng.randrange(len(expected)), rng.randrange(len(expected))
+            assert items.move(source, destination) == expected[source]
+            expected.insert(destination, expected.pop(source))
+        elif op == 3 and expected:
+            start = rng.randrange(len(expected))
+            stop = rng.randint(start, min(start + 20, len(expected)))
+            assert items.remove_range(start, stop) == expected[start:stop]
+            del expected[start:stop]
+        elif op == 4:
+            new = list(range(counter, counter + rng.randrange(10)))
+            counter += len(new)
+            index = rng.randint(0, len(expected))
+            items.insert_many(index, new)
+            expected[index:index] = new
+        elif op == 5:
+            new = list(range(counter, counter + rng.randrange(10)))
+            counter += len(new)
+            items.extend(new)
+            expected.extend(new)
+        elif op == 6 and expected:
+            index = rng.randrange(len(expected))
+            items[index] = counter
+            expected[index] = counter
+            counter += 1
+        elif op == 7 and expected:
+            index = rng.randrange(len(expected))
+            del items[index]
+            del expected[index]
+
+        index = rng.randint(0, len(expected))
+        assert items.weight_before(index) == sum(map(weight, expected[:index]))
+
+    check(items, expected)
+
+
+def test_index_and_clear():
+    items = IndexedList(range(10), load=2, weight=weight)
+    assert items.index(7) == 7
+    with pytest.raises(ValueError):
+        items.index(42)
+    items.clear()
+    check(items, [])
+    items.append(3)
+    check(items, [3])
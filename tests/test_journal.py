@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("loguru")
+
+from utils.journal import PlayerJournal, replay
+
+
+def test_replay_defaults():
+    state = replay(None, [])
+    assert state["queue"] == []
+    assert state["now"] is None
+    assert state["volume"] == 100
+
+
+def test_replay_operations():
+    records = [
+        {"op": "put", "t": [["a", 1], ["b", 1], ["c", 2]]},
+        {"op": "ins", "i": 1, "t": ["d", 3]},
+        {"op": "ins", "i": 0, "ts": [["e", 1], ["f", 1]]},
+        {"op": "move", "s": 0, "d": 4},
+        {"op": "del", "i": 1},
+        {"op": "range", "s": 3, "e": 5},
+        {"op": "get"},
+        {"op": "play", "t": ["a", 1], "s": 1000},
+        {"op": "pos", "p": 5000},
+        {"op": "state", "d": {"volume": 50, "loop": True}},
+    ]
+    state = replay(None, records)
+    # e f a d b c -> f a d b e c -> f d b e c -> f d b -> d b
+    assert state["queue"] == [["d", 3], ["b", 1]]
+    assert state["now"] == ["a", 1]
+    assert state["position"] == 5000
+    assert state["volume"] == 50
+    assert state["loop"] is True
+
+
+def test_replay_on_top_of_snapshot():
+    snapshot = {"queue": [["a", 1]], "volume": 70}
+    state = replay(snapshot, [{"op": "put", "t": [["b", 1]]}, {"op": "clear"}, {"op": "put", "t": [["c", 1]]}])
+    assert state["queue"] == [["c", 1]]
+    assert state["volume"] == 70
+
+
+class _Player:
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        self.queue = []
+        self.current = None
+        self.position = 0
+        self.volume = 100
+        self.loop = False
+        self.channel_id = None
+        self.is_playing = False
+        self.is_paused = False
+
+
+class _Track:
+    def __init__(self, id_: str):
+        self.id = id_
+        self.requester = None
+
+
+def test_flush_and_load(tmp_path):
+    journal = PlayerJournal(str(tmp_path), snapshot_every=5)
+    player = _Player(1)
+    journal.attach(player)
+
+    async def run():
+        # the first flush writes the snapshot requested by `attach`.
+        await journal.flush()
+        for id_ in "abcdefg":
+            player.queue.append(_Track(id_))
+            journal.record(1, "put", t=[[id_, None]])
+            await journal.flush()
+
+    asyncio.run(run())
+    assert journal.guild_ids() == [1]
+    assert journal.load(1)["queue"] == [[track.id, None] for track in player.queue]
+    assert journal.snapshots >= 2
+
+    journal.discard(1)
+    asyncio.run(journal.flush())
+    assert journal.load(1) is None
+
+
+def test_load_ignores_torn_write(tmp_path):
+    (tmp_path / "1.log").write_bytes(b'{"op":"put","t":[["a",null]]}\n{"op":"put","t":[["b"')
+    journal = PlayerJournal(str(tmp_path))
+    assert journal.load(1)["queue"] == [["a", None]]
+
+
+def test_close_waits_for_the_write_of_a_cancelled_flush(tmp_path, monkeypatch):
+    import threading
+    import time
+
+    journal = PlayerJournal(str(tmp_path))
+    journal.attach(_Player(1))
+    write = journal._write
+    running = []
+    overlapped = threading.Event()
+
+    def slow_write(*args):
+        if running:
+            overlapped.set()
+        running.append(None)
+        time.sleep(0.2)
+        write(*args)
+        running.pop()
+
+    monkeypatch.setattr(journal, "_write", slow_write)
+
+    async def run():
+        flush = asyncio.ensure_future(journal.flush())
+        await asyncio.sleep(0.05)
+        flush.cancel()
+        journal.record(1, "put", t=[["a", None]])
+        await journal.close()
+
+    asyncio.run(run())
+    assert not overlapped.is_set()
+    assert journal.load(1)["queue"] == [["a", None]]
+
+
+def test_replay_matches_live_queue():
+    import random
+
+    for module in ("disnake", "aiohttp", "humanize", "mystbin"):
+        pytest.importorskip(module)
+    from utils.journal import track_blob
+    from utils.MusicPlayerInteraction import Queue, Track
+
+    rng = random.Random(31)
+    records = []
+    queue = Queue(journal=lambda op, **data: records.append({"op": op, **data}))
+    counter = 0
+
+    def new_tracks(amount):
+        nonlocal counter
+        tracks = [
+            Track(f"id{counter + i}", {"identifier": "", "length": 1000}, requester=rng.randrange(3))
+            for i in range(amount)
+        ]
+        counter += amount
+        return tracks
+
+    queue.extend(new_tracks(20))
+    for _ in range(500):
+        op = rng.randrange(7)
+        size = len(queue)
+        if op == 0:
+            queue.put_nowait(new_tracks(1)[0])
+        elif op == 1:
+            queue.insert(rng.randint(0, size), new_tracks(1)[0])
+        elif op == 2:
+            queue.insert_many(rng.randint(0, size), new_tracks(rng.randrange(1, 5)))
+        elif op == 3 and size:
+            queue.move(rng.randrange(size), rng.randrange(size))
+        elif op == 4 and size:
+            start = rng.randrange(size)
+            queue.remove_range(start, min(start + rng.randrange(1, 4), size))
+        elif op == 5 and size:
+            queue.remove(rng.randrange(size))
+        elif op == 6 and size:
+            queue.get_nowait()
+
+    assert replay(None, records)["queue"] == [track_blob(track) for track in queue]
+
+    queue.clear()
+    queue.extend(new_tracks(3))
+    assert replay(None, records)["queue"] == [track_blob(track) for track in queue]
@@ -0,0 +1,72 @@
+import asyncio
+import types
+
+import pytest
+
+for module in ("aiohttp", "loguru"):
+    pytest.importorskip(module)
+
+from utils.lyrics import LyricsProvider, LyricsService, lyrics_key, normalize_title
+
+
+@pytest.mark.parametrize(
+    "title, author, expected",
+    [
+        ("Song", "Artist - Topic", ("Song", "Artist")),
+        ("Song (Official Video) [HD]", "ArtistVEVO", ("Song", "Artist")),
+        ("Artist - Song (Lyrics)", "Some Channel", ("Song", "Artist")),
+        ("Artist - Song ft. Other", "Some Channel", ("Song", "Artist")),
+        ("Song (feat. Other)", "Artist", ("Song", "Artist")),
+        ("Song (Remix)", "Artist", ("Song (Remix)", "Artist")),
+        ("", "", ("", "")),
+    ],
+)
+def test_normalize_title(title, author, expected):
+    assert normalize_title(title, author) == expected
+
+
+def test_lyrics_key_ignores_case_and_decorations():
+    assert lyrics_key("Artist - SONG (Official Audio)") == lyrics_key("song", "artist - Topic")
+
+
+class _Provider(LyricsProvider):
+    def __init__(self):
+        self.calls = []
+
+    async def fetch(self, title, artist):
+        self.calls.append((title, artist))
+        await asyncio.sleep(0.01)
+        return None if title == "Missing" else f"lyrics of {title}"
+
+
+def _track(title, author):
+    return types.SimpleNamespace(title=title, author=author, is_stream=False)
+
+
+def test_prefetched_lyrics_are_cached_for_pages():
+    provider = _Provider()
+    service = LyricsService(provider)
+
+    async def run():
+        service.prefetch(_track("Artist - Song (Official Video)", "Some Channel"))
+        await asyncio.gather(*service._prefetches)
+        return await service.pages(_track("Song", "Artist - Topic"))
+
+    assert asyncio.run(run()) == ["lyrics of Song"]
+    assert provider.calls == [("Song", "Artist")]
+    assert service.hits == 1
+
+
+def test_concurrent_lookups_are_coalesced_and_misses_cached():
+    provider = _Provider()
+    service = LyricsService(provider)
+
+    async def run():
+        pages = await asyncio.gather(*(service.pages(_track("Song", "Artist")) for _ in range(5)))
+        missing = [await service.pages(_track("Missing", "Artist")) for _ in range(2)]
+        return pages, missing
+
+    pages, missing = asyncio.run(run())
+    assert pages == [["lyrics of Song"]] * 5
+    assert missing == [None, None]
+    assert provider.calls == [("Song", "Artist"), ("Missing", "Artist")]
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+for module in ("disnake", "aiohttp", "loguru", "humanize", "mystbin"):
+    pytest.importorskip(module)
+
+from utils.MusicPlayerInteraction import Queue, Track
+
+
+def make_track(index: int, length: int = 1000, stream: bool = False, requester: int = 1) -> Track:
+    info = {"title": f"Track {index}", "identifier": f"track{index}", "length": length, "isStream": stream}
+    return Track(f"id{index}", info, requester=requester)
+
+
+def ids(queue: Queue) -> list:
+    return [track.id for track in queue]
+
+
+def test_positional_operations():
+    queue = Queue()
+    for index in range(5):
+        queue.put_nowait(make_track(index))
+    queue.insert(1, make_track(5))
+    assert ids(queue) == ["id0", "id5", "id1", "id2", "id3", "id4"]
+
+    assert queue.move(0, 3).id == "id0"
+    assert ids(queue) == ["id5", "id1", "id2", "id0", "id3", "id4"]
+
+    assert [track.id for track in queue.remove_range(1, 3)] == ["id1", "id2"]
+    queue.remove(0)
+    assert ids(queue) == ["id0", "id3", "id4"]
+    assert queue[1].id == "id3"
+    assert [track.id for track in queue[1:]] == ["id3", "id4"]
+    assert queue.get_nowait().id == "id0"
+    assert len(queue) == 2
+
+
+def test_insert_wakes_getter():
+    async def run():
+        queue = Queue()
+        getter = asyncio.ensure_future(queue.get())
+        await asyncio.sleep(0)
+        queue.insert(0, make_track(0))
+        return await asyncio.wait_for(getter, 1)
+
+    assert asyncio.run(run()).id == "id0"
+
+
+@pytest.mark.parametrize("fair", [False, True])
+def test_shuffle_in_executor(monkeypatch, fair):
+    import utils.MusicPlayerInteraction
+
+    monkeypatch.setattr(utils.MusicPlayerInteraction, "EXECUTOR_SHUFFLE_SIZE", 10)
+    queue = Queue()
+    queue.extend(make_track(index, length=index, requester=index % 3) for index in range(50))
+    duration = queue.duration
+
+    asyncio.run(queue.shuffle(fair=fair))
+    assert sorted(ids(queue)) == sorted(f"id{index}" for index in range(50))
+    assert queue.duration == duration
+    assert queue.duration_before(len(queue)) == duration
+
+
+def test_shuffle_retries_when_the_queue_changes(monkeypatch):
+    import utils.MusicPlayerInteraction
+
+    monkeypatch.setattr(utils.MusicPlayerInteraction, "EXECUTOR_SHUFFLE_SIZE", 10)
+
+    async def run():
+        queue = Queue()
+        queue.extend(make_track(index) for index in range(50))
+        shuffle = asyncio.ensure_future(queue.shuffle())
+        await asyncio.sleep(0)
+        taken = queue.get_nowait()
+        await shuffle
+        return taken, queue
+
+    taken, queue = asyncio.run(run())
+    assert len(queue) == 49
+    assert taken.id not in ids(queue)
+
+
+def test_aggregates():
+    queue = Queue()
+    queue.put_nowait(make_track(0, 1000, requester=1))
+    queue.extend([make_track(1, 2000, requester=2), make_track(2, 0, stream=True, requester=2)])
+    assert len(queue) == 3
+    assert queue.duration == 3000
+    assert queue.streams == 1
+    assert queue.requesters == {1: [1, 1000], 2: [2, 2000]}
+    assert queue.duration_before(2) == 3000
+
+    queue.remove(0)
+    assert queue.duration == 2000
+    assert 1 not in queue.requesters
+    queue.clear()
+    assert queue.duration == 0
+    assert queue.streams == 0
+    assert queue.requesters == {}
+
+
+def test_version_bumps_on_mutation():
+    queue = Queue()
+    version = queue.version
+    queue.put_nowait(make_track(0))
+    queue.move(0, 0)
+    queue.get_nowait()
+    assert queue.version == version + 3
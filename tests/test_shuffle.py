@@ -0,0 +1,35 @@
+import collections
+import random
+
+from utils.shuffle import fair_shuffled, shuffled
+
+
+def test_shuffled_keeps_every_item():
+    items = list(range(100))
+    result = shuffled(items)
+    assert sorted(result) == items
+    assert items == list(range(100))
+
+
+def test_fair_shuffle_interleaves_groups():
+    random.seed(30)
+    items = [("a", index) for index in range(10)] + [("b", index) for index in range(3)] + [("c", 0)]
+    result = fair_shuffled(items, lambda item: item[0])
+    assert sorted(result) == sorted(items)
+
+    # every round has one item of every group that has items left.
+    assert {item[0] for item in result[:3]} == {"a", "b", "c"}
+    assert {item[0] for item in result[3:5]} == {"a", "b"}
+    assert {item[0] for item in result[5:7]} == {"a", "b"}
+    assert {item[0] for item in result[7:]} == {"a"}
+
+
+def test_fair_shuffle_of_one_group_is_a_shuffle():
+    items = list(range(50))
+    result = fair_shuffled(items, lambda item: 0)
+    assert sorted(result) == items
+    assert collections.Counter(result) == collections.Counter(items)
+
+
+def test_fair_shuffle_empty():
+    assert fair_shuffled([], lambda item: item) == []
@@ -0,0 +1,88 @@
+import types
+
+import pytest
+
+for module in ("aiohttp", "numpy"):
+    pytest.importorskip(module)
+
+from wavelink.stats import LoadEstimator, StatsHistory
+
+
+def sample(load: float) -> types.SimpleNamespace:
+    return types.SimpleNamespace(
+        system_load=load,
+        lavalink_load=load / 2,
+        memory_used=100,
+        memory_allocated=200,
+        playing_players=1,
+        frames_sent=3000,
+        frames_nulled=0,
+        frames_deficit=-1,
+    )
+
+
+def test_empty():
+    history = StatsHistory(4)
+    assert len(history) == 0
+    assert history.mean("system_load") == 0.0
+    assert history.percentile("system_load") == 0.0
+    assert history.slope("system_load") == 0.0
+    assert history.sparkline("system_load") == ""
+
+
+def test_ring_buffer_keeps_the_last_samples_in_order():
+    history = StatsHistory(4)
+    for minute in range(6):
+        history.append(sample(minute), now=minute * 60)
+    assert len(history) == 4
+    assert history.window("system_load").tolist() == [2, 3, 4, 5]
+    assert history.window("time").tolist() == [120, 180, 240, 300]
+    assert history.window("system_load", seconds=60).tolist() == [4, 5]
+
+
+def test_aggregates():
+    history = StatsHistory(10)
+    for minute in range(5):
+        history.append(sample(minute * 2), now=minute * 60)
+    assert history.mean("system_load") == pytest.approx(4.0)
+    assert history.percentile("system_load", 50) == pytest.approx(4.0)
+    # 2 per minute.
+    assert history.slope("system_load") == pytest.approx(2.0)
+    assert history.mean("frames_deficit") == -1
+
+
+def test_sparkline():
+    history = StatsHistory(100)
+    for minute in range(40):
+        history.append(sample(minute), now=minute * 60)
+    line = history.sparkline("system_load", width=8)
+    assert len(line) == 8
+    assert line[0] == StatsHistory.BLOCKS[0]
+    assert line[-1] == StatsHistory.BLOCKS[-1]
+
+    flat = StatsHistory(4)
+    flat.append(sample(1), now=0)
+    flat.append(sample(1), now=60)
+    assert flat.sparkline("system_load") == StatsHistory.BLOCKS[0] * 2
+
+
+def frame(load: float, players: int) -> types.SimpleNamespace:
+    penalty = types.SimpleNamespace(total=load + players, player_penalty=players)
+    return types.SimpleNamespace(penalty=penalty, playing_players=players)
+
+
+def test_score_before_the_first_frame_is_on_the_player_scale():
+    fresh = LoadEstimator()
+    assert fresh.score(now=0, players=3) == 3.0
+    fresh.place()
+    assert fresh.score(now=0, players=3) == 3.0
+    assert fresh.score(now=0) == 1.0
+
+    # an idle node with a frame scores the same as a fresh node with as many players.
+    idle = LoadEstimator()
+    idle.update(frame(0.0, 3), now=0)
+    assert idle.score(now=0) == fresh.score(now=0, players=3)
+
+    busy = LoadEstimator()
+    busy.update(frame(50.0, 3), now=0)
+    assert busy.score(now=0) > fresh.score(now=0, players=3)
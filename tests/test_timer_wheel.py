@@ -0,0 +1,92 @@
+import pytest
+
+for module in ("disnake", "loguru"):
+    pytest.importorskip(module)
+
+from utils.timer_wheel import TimerWheel
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_wheel(tick: float = 1, slots: int = 4, levels: int = 2):
+    clock = Clock()
+    return TimerWheel(tick=tick, slots=slots, levels=levels, clock=clock), clock
+
+
+def run_until(wheel: TimerWheel, clock: Clock, until: float, step: float) -> None:
+    while clock.now < until:
+        clock.now += step
+        wheel.advance()
+
+
+def test_fires_in_order_and_not_early():
+    wheel, clock = make_wheel()
+    start = clock.now
+    fired = []
+    for delay in (7, 2, 5):
+        wheel.schedule(delay, fired.append, delay)
+    assert wheel.scheduled == 3
+
+    run_until(wheel, clock, start + 1.5, 0.5)
+    assert fired == []
+    run_until(wheel, clock, start + 10, 0.5)
+    assert fired == [2, 5, 7]
+    assert wheel.scheduled == 0
+    assert wheel.fired == 3
+
+
+def test_fires_at_most_one_tick_late():
+    wheel, clock = make_wheel(tick=0.5, slots=8)
+    due = {}
+    for delay in (0.1, 0.5, 3.3, 10.0, 31.9):
+        timer = wheel.schedule(delay, lambda: None)
+        due[timer] = timer.deadline
+    while wheel.scheduled:
+        clock.now += 0.1
+        wheel.advance()
+        for timer, deadline in list(due.items()):
+            if not timer.active:
+                assert deadline <= clock.now <= deadline + wheel.tick + 0.1
+                del due[timer]
+    assert not due
+
+
+def test_cancel():
+    wheel, clock = make_wheel()
+    fired = []
+    timer = wheel.schedule(3, fired.append, 1)
+    assert timer.active
+    timer.cancel()
+    timer.cancel()
+    assert not timer.active
+    assert wheel.scheduled == 0
+    run_until(wheel, clock, clock.now + 10, 1)
+    assert fired == []
+
+
+def test_beyond_the_range_of_the_wheels():
+    # 2 wheels of 4 slots cover 16 ticks, later timers are cascaded again until they are due.
+    wheel, clock = make_wheel()
+    start = clock.now
+    fired = []
+    wheel.schedule(40, fired.append, 40)
+    run_until(wheel, clock, start + 39.5, 0.5)
+    assert fired == []
+    run_until(wheel, clock, start + 41, 0.5)
+    assert fired == [40]
+
+
+def test_failing_callback_does_not_stop_the_wheel():
+    wheel, clock = make_wheel()
+    fired = []
+    wheel.schedule(1, lambda: 1 / 0)
+    wheel.schedule(1, fired.append, 1)
+    clock.now += 3
+    wheel.advance()
+    assert fired == [1]
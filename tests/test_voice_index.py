@@ -0,0 +1,111 @@
+import types
+
+import pytest
+
+pytest.importorskip("disnake")
+
+from utils.voice_index import VoiceMembershipIndex
+
+GUILD = types.SimpleNamespace(id=1)
+
+
+def member(id_: int, bot: bool = False) -> types.SimpleNamespace:
+    return types.SimpleNamespace(id=id_, guild=GUILD, bot=bot)
+
+
+def state(channel_id=None) -> types.SimpleNamespace:
+    return types.SimpleNamespace(channel=types.SimpleNamespace(id=channel_id) if channel_id else None)
+
+
+def test_join_move_leave():
+    index = VoiceMembershipIndex()
+    alice, bob = member(10), member(11)
+    index.update(alice, state(), state(100))
+    index.update(bob, state(), state(100))
+    assert index.members(100) == [alice, bob]
+    assert index.count(100) == 2
+    assert index.first(100) is alice
+    assert index.first(100, exclude=alice.id) is bob
+
+    index.update(alice, state(100), state(200))
+    assert index.members(100) == [bob]
+    assert index.contains(200, alice.id)
+    assert len(index) == 2
+
+    index.update(bob, state(100), state())
+    assert index.count(100) == 0
+    assert index.first(100) is None
+
+
+def test_bots_are_ignored():
+    index = VoiceMembershipIndex()
+    index.update(member(1, bot=True), state(), state(100))
+    assert index.count(100) == 0
+
+
+def test_mute_keeps_the_join_order():
+    index = VoiceMembershipIndex()
+    alice, bob = member(10), member(11)
+    index.update(alice, state(), state(100))
+    index.update(bob, state(), state(100))
+    muted = member(10)
+    index.update(muted, state(100), state(100))
+    assert index.members(100) == [muted, bob]
+
+
+def test_missed_join_is_indexed():
+    index = VoiceMembershipIndex()
+    alice = member(10)
+    # the join was missed, the next update of the member is a mute in the channel.
+    index.update(alice, state(100), state(100))
+    assert index.contains(100, alice.id)
+
+
+def make_guild(channels: dict, cached=(), id_=1) -> types.SimpleNamespace:
+    cached = {member.id: member for member in cached}
+    return types.SimpleNamespace(
+        id=id_,
+        me=types.SimpleNamespace(id=1),
+        get_member=cached.get,
+        voice_channels=[
+            types.SimpleNamespace(id=channel_id, voice_states=dict.fromkeys(user_ids))
+            for channel_id, user_ids in channels.items()
+        ],
+        stage_channels=[],
+    )
+
+
+def test_seed_and_drop():
+    index = VoiceMembershipIndex()
+    alice, bot = member(10), member(2, bot=True)
+    index.seed(make_guild({100: [10, 2, 1], 300: []}, cached=[alice, bot]))
+    assert index.members(100) == [alice]
+    index.seed(make_guild({500: [20]}, id_=2))
+    index.drop(1)
+    assert len(index) == 1
+    assert index.members(100) == []
+    assert index.count(500) == 1
+
+
+def test_seed_from_voice_states_without_cached_members():
+    # the lean cache profile, the members in voice are not cached when the guild becomes available.
+    index = VoiceMembershipIndex()
+    index.seed(make_guild({100: [10, 11, 1]}))
+    assert index.count(100) == 2
+    assert index.contains(100, 10)
+    assert index.members(100) == []
+    assert index.first(100) is None
+
+    # the member is filled in by the next voice state update, and keeps its place.
+    bob = member(11)
+    index.update(bob, state(100), state(100))
+    assert index.members(100) == [bob]
+    assert index.count(100) == 2
+    assert index.first(100) is bob
+
+
+def test_seeded_bot_is_removed_on_its_update():
+    index = VoiceMembershipIndex()
+    index.seed(make_guild({100: [5]}))
+    index.update(member(5, bot=True), state(100), state(100))
+    assert index.count(100) == 0
@@ -1,14 +1,13 @@
 #  -*- coding: utf-8 -*-
 import asyncio
+import collections
 import datetime
-import itertools
 import math
-import random
 import sys
+import time
 import traceback
 import typing
 
-import async_timeout
 import disnake
 import humanize
 from disnake.ui import Item
@@ -16,8 +15,21 @@ from loguru import logger
 
 import wavelink
 from core.MusicBot import Bot
+from utils.cache import LRUCache
 from utils.helpers import ErrorView, LyricsPaginator
-from utils.paginators import RichPager, ViewPages, WrapText
+from utils.indexed_list import IndexedList
+from utils.journal import PlayerJournal, track_blob
+from utils.menus import ListPageSource
+from utils.paginators import ViewPages
+from utils.shuffle import fair_shuffled, requester_key, shuffled
+from utils.timer_wheel import Timer
+
+# how long a player waits for a track to be queued before it disconnects, in seconds.
+IDLE_TIMEOUT = 120
+# how long the votes of a vote stay valid after the last vote, in seconds.
+VOTE_TIMEOUT = 60
+# queues with more tracks than this are shuffled in an executor, so the event loop is not blocked.
+EXECUTOR_SHUFFLE_SIZE = 10_000
 
 
 class Track(wavelink.Track):
@@ -33,16 +45,103 @@ class Track(wavelink.Track):
         self.requester = kwargs.get("requester")
 
 
+def track_duration(track: wavelink.Track) -> int:
+    """
+    A function that returns the duration of a track in milliseconds, 0 for streams since they have no end.
+    """
+    if track.is_stream:
+        return 0
+    return track.length or 0
+
+
 class Queue(asyncio.Queue):
     """
     Custom Queue Class.
+
+    The tracks are stored in an `IndexedList` instead of a deque, so positional access, insert, remove and move
+    are O(log n) and slicing a page of the queue does not walk it from the head.
+
+    The queue keeps running aggregates that are updated as tracks are added and removed: the total duration, the
+    amount of streams and the amount and duration of the tracks of every requester. The durations are also kept
+    as prefix sums by the `IndexedList`, so the time until a track plays is O(log n).
+
+    Every mutation bumps ``version``, so anything derived from the queue, like rendered queue pages, can tell
+    whether it is still current.
     """
 
+    def __init__(
+        self,
+        maxsize: int = 0,
+        *,
+        journal: typing.Callable[..., None] = None,
+        on_put: typing.Callable[[], None] = None,
+    ):
+        self._journal = journal
+        self._on_put = on_put
+        super().__init__(maxsize)
+
+    def _init(self, maxsize):
+        self._queue = IndexedList(weight=track_duration)
+        self.streams = 0
+        # the amount and the duration of the queued tracks of every requester, by requester ID.
+        self.requesters: typing.Dict[typing.Hashable, typing.List[int]] = {}
+        self.version = 0
+
+    def _record(self, op: str, **data) -> None:
+        self.version += 1
+        if self._journal:
+            self._journal(op, **data)
+
+    def _account(self, tracks: typing.Iterable[Track], sign: int) -> None:
+        # updates the aggregates for tracks that were added (1) or removed (-1).
+        for track in tracks:
+            if track.is_stream:
+                self.streams += sign
+            key = requester_key(track)
+            entry = self.requesters.setdefault(key, [0, 0])
+            entry[0] += sign
+            entry[1] += sign * track_duration(track)
+            if not entry[0]:
+                del self.requesters[key]
+
+    def _put(self, item):
+        super()._put(item)
+        self._account((item,), 1)
+        self._record("put", t=[track_blob(item)])
+        if self._on_put:
+            self._on_put()
+
+    def _get(self):
+        item = super()._get()
+        self._account((item,), -1)
+        self._record("get")
+        return item
+
+    @property
+    def duration(self) -> int:
+        """
+        The total duration of the queued tracks in milliseconds, without the streams.
+        """
+        return self._queue.total_weight  # type: ignore
+
+    def duration_before(self, index: int) -> int:
+        """
+        A method that returns the duration of the tracks that play before the track at a position, in O(log n).
+
+        Parameters
+        ----------
+        index : int
+            The position of the track, 0 being the next track to play.
+
+        Returns
+        -------
+        int
+            The duration in milliseconds, without the streams.
+        """
+        return self._queue.weight_before(index)  # type: ignore
+
     def __getitem__(self, item):
-        if isinstance(item, slice):
-            return list(itertools.islice(self._queue, item.start, item.stop, item.step))  # type: ignore
-        else:
-            return self._queue[item]  # type: ignore
+        return self._queue[item]  # type: ignore
 
     def __iter__(self):
         return self._queue.__iter__()  # type: ignore
@@ -59,23 +158,185 @@ class Queue(asyncio.Queue):
     def __repr__(self):
         return f"<Queue size: {self.qsize()}>"
 
+    def _notify_put(self, count: int = 1) -> None:
+        # mirrors what `asyncio.Queue.put_nowait` does after a put, so `get` wakes up for inserted tracks too.
+        # a batch of tracks is notified once, so a waiting consumer is woken up once.
+        self._unfinished_tasks += count
+        self._finished.clear()
+        self._wakeup_next(self._getters)
+        if self._on_put:
+            self._on_put()
+
     def clear(self):
         """
         A method that clears the queue.
         """
         self._queue.clear()  # type: ignore
+        self.streams = 0
+        self.requesters.clear()
+        self._record("clear")
+
+    @staticmethod
+    def _shuffled(tracks: typing.List[Track], fair: bool) -> IndexedList:
+        tracks = fair_shuffled(tracks, requester_key) if fair else shuffled(tracks)
+        return IndexedList(tracks, weight=track_duration)
 
-    def shuffle(self):
+    async def shuffle(self, fair: bool = False):
         """
-        A method that shuffles the queue.
+        A method that shuffles the queue, by shuffling a copy of it and building a new queue from it.
+
+        Queues of more than `EXECUTOR_SHUFFLE_SIZE` tracks are shuffled in an executor. If the queue changes while
+        it is shuffled, e.g. the next track is taken from it, the new queue is shuffled instead.
+
+        Parameters
+        ----------
+        fair : bool
+            If True, the tracks of every requester are shuffled and then interleaved, so one requester's
+            playlist does not fill the start of the queue.
         """
-        random.shuffle(self._queue)  # type: ignore
+        loop = asyncio.get_running_loop()
+        while True:
+            version = self.version
+            tracks = list(self._queue)
+            if len(tracks) <= EXECUTOR_SHUFFLE_SIZE:
+                queue = self._shuffled(tracks, fair)
+            else:
+                queue = await loop.run_in_executor(None, self._shuffled, tracks, fair)
+            if self.version == version:
+                break
+        # the aggregates do not depend on the order of the tracks, so only the storage is replaced.
+        self._queue = queue
+        self._record("shuffle")
 
     def remove(self, index: int):
         """
         A method that removes a track from the queue.
         """
-        del self._queue[index]  # type: ignore
+        track = self._queue.pop(index)  # type: ignore
+        self._account((track,), -1)
+        self._record("del", i=index)
+
+    def insert(self, index: int, track: Track) -> None:
+        """
+        A method that inserts a track at a position of the queue.
+
+        Parameters
+        ----------
+        index : int
+            The position to insert the track at, 0 being the next track to play.
+        track : Track
+            The track to insert.
+        """
+        self._queue.insert(index, track)  # type: ignore
+        self._account((track,), 1)
+        self._notify_put()
+        self._record("ins", i=index, t=track_blob(track))
+
+    def _check_size(self, count: int) -> None:
+        if self.maxsize > 0 and self.qsize() + count > self.maxsize:
+            raise asyncio.QueueFull
+
+    def extend(self, tracks: typing.Iterable[Track]) -> int:
+        """
+        A method that adds many tracks to the end of the queue at once, e.g. a playlist.
+        The tracks are journaled as one record and a waiting player is woken up once, instead of once per track.
+
+        Parameters
+        ----------
+        tracks : typing.Iterable[Track]
+            The tracks to add, any iterable, so the tracks of a playlist can be built while they are added.
+
+        Returns
+        -------
+        int
+            The amount of tracks that were added.
+
+        Raises
+        ------
+        asyncio.QueueFull
+            If the queue has a maximum size and the tracks do not fit in it.
+        """
+        tracks = list(tracks)
+        if not tracks:
+            return 0
+        self._check_size(len(tracks))
+        self._queue.extend(tracks)  # type: ignore
+        self._account(tracks, 1)
+        self._record("put", t=[track_blob(track) for track in tracks])
+        self._notify_put(len(tracks))
+        return len(tracks)
+
+    def insert_many(self, index: int, tracks: typing.Iterable[Track]) -> int:
+        """
+        A method that inserts many tracks at a position of the queue at once.
+
+        Parameters
+        ----------
+        index : int
+            The position to insert the tracks at, 0 being the next track to play.
+        tracks : typing.Iterable[Track]
+            The tracks to insert, in order.
+
+        Returns
+        -------
+        int
+            The amount of tracks that were inserted.
+
+        Raises
+        ------
+        asyncio.QueueFull
+            If the queue has a maximum size and the tracks do not fit in it.
+        """
+        tracks = list(tracks)
+        if not tracks:
+            return 0
+        self._check_size(len(tracks))
+        self._queue.insert_many(index, tracks)  # type: ignore
+        self._account(tracks, 1)
+        self._record("ins", i=index, ts=[track_blob(track) for track in tracks])
+        self._notify_put(len(tracks))
+        return len(tracks)
+
+    def move(self, source: int, destination: int) -> Track:
+        """
+        A method that moves a track to another position of the queue.
+
+        Parameters
+        ----------
+        source : int
+            The current position of the track.
+        destination : int
+            The new position of the track.
+
+        Returns
+        -------
+        Track
+            The moved track.
+        """
+        track = self._queue.move(source, destination)  # type: ignore
+        self._record("move", s=source, d=destination)
+        return track
+
+    def remove_range(self, start: int, stop: int) -> typing.List[Track]:
+        """
+        A method that removes every track from ``start`` up to, but not including ``stop``.
+
+        Parameters
+        ----------
+        start : int
+            The position of the first track to remove.
+        stop : int
+            The position after the last track to remove.
+
+        Returns
+        -------
+        typing.List[Track]
+            The removed tracks.
+        """
+        removed = self._queue.remove_range(start, stop)  # type: ignore
+        self._account(removed, -1)
+        self._record("range", s=start, e=stop)
+        return removed
 
 
 class Player(wavelink.Player):
@@ -87,11 +348,17 @@ class Player(wavelink.Player):
         super().__init__(*args, **kwargs)
 
         self.context: disnake.ApplicationCommandInteraction = kwargs.get("context")
+        self.dj: typing.Optional[disnake.Member] = None
         if self.context:
-            self.dj: disnake.Member = self.context.author
-
-        self.queue = Queue()
-        self.menu: disnake.Message = None  # type: ignore
+            self.dj = self.context.author
+
+        self.journal: typing.Optional[PlayerJournal] = getattr(self.bot, "journal", None)
+        self.queue = Queue(journal=self._record, on_put=self._wake)
+        # the results of the last search, as (search ID, time of the search, tracks), used by `SongSelection`.
+        self.search: typing.Optional[typing.Tuple[int, float, typing.List[wavelink.Track]]] = None
+        self.controller = ControllerManager(self)
+        # the recently rendered pages of the queue, by (queue version, entries per page, page number).
+        self.queue_pages: LRUCache[typing.Tuple[int, int, int], typing.List[str]] = LRUCache(16)
         try:
             self.channel = self.context.channel
         except AttributeError:
@@ -99,7 +366,7 @@ class Player(wavelink.Player):
         self._loop = False
 
         self.waiting = False
-        self.updating = False
+        self.idle_timer: typing.Optional[Timer] = None
         self.now = None
 
         self.pause_votes = set()
@@ -108,6 +375,108 @@ class Player(wavelink.Player):
         self.shuffle_votes = set()
         self.stop_votes = set()
         self.clear_votes = set()
+        self._vote_timers: typing.Dict[int, Timer] = {}
+
+        # the time from a TrackEnd to the next TrackStart, in milliseconds.
+        self.track_gaps: typing.Deque[float] = collections.deque(maxlen=50)
+        self._track_ended: typing.Optional[float] = None
+
+    def _record(self, op: str, **data) -> None:
+        """
+        Method which writes a change of the player to the journal, if journaling is enabled.
+        """
+        if not self.journal:
+            return
+        if op == "shuffle":
+            # a shuffle rewrites the whole queue, so it is cheaper to snapshot than to log.
+            self.journal.request_snapshot(self.guild_id)
+        else:
+            self.journal.record(self.guild_id, op, **data)
+
+    def _record_state(self) -> None:
+        channel = getattr(self, "channel", None)
+        self._record(
+            "state",
+            d={
+                "channel": self.channel_id,
+                "text": getattr(channel, "id", None),
+                "dj": getattr(self.dj, "id", None),
+            },
+        )
+
+    async def connect(self, channel_id: int, self_deaf: bool = False):
+        await super().connect(channel_id, self_deaf=self_deaf)
+        if self.journal:
+            self.journal.attach(self)
+            self._record_state()
+
+    async def play(
+        self, track: Track, *, replace: bool = True, start: int = 0, end: int = 0
+    ) -> None:
+        await super().play(track, replace=replace, start=start, end=end)
+        if self.current is track:
+            self._record("play", t=track_blob(track), s=int(start))
+
+    async def set_volume(self, vol: int) -> None:
+        await super().set_volume(vol)
+        self._record("state", d={"volume": self.volume})
+        self.controller.request_update()
+
+    async def _send_filters(self) -> bool:
+        sent = await super()._send_filters()
+        if sent:
+            self._record("state", d={"filter": self.filters.payload or None})
+        return sent
+
+    async def restore(
+        self, state: dict, tracks: typing.Dict[str, wavelink.Track], members: dict
+    ) -> None:
+        """
+        Method which rebuilds the player from its journaled state and resumes the current track where it stopped.
+
+        Parameters
+        ----------
+        state : dict
+            The journaled state of the player.
+        tracks : typing.Dict[str, wavelink.Track]
+            The decoded tracks, by their Base64 track ID.
+        members : dict
+            The requesters of the tracks and the DJ, by their ID. Requesters that are not cached are a
+            `disnake.Object` of their ID.
+        """
+
+        def build(blob) -> typing.Optional[Track]:
+            track = tracks.get(blob[0])
+            if not track:
+                return None
+            return Track(track.id, track.info, requester=members.get(blob[1]))
+
+        # the text channel and the DJ can be gone, or not cached under the lean cache profile. Without a text
+        # channel the player plays without a controller, and the owner of the guild stands in for the DJ.
+        guild = self.bot.get_guild(self.guild_id)
+        self.channel = self.bot.get_channel(state["text"]) if state["text"] else None
+        dj = members.get(state["dj"])
+        self.dj = dj if isinstance(dj, disnake.Member) else (guild.owner if guild else None)
+        self._loop = state["loop"]
+
+        await self.connect(state["channel"])
+        if state["volume"] != 100:
+            await self.set_volume(state["volume"])
+        if state["filter"]:
+            await self.set_flr(wavelink.BaseFilter(filter_name="Restored", payload=state["filter"]))
+
+        self.queue.extend(track for track in map(build, state["queue"]) if track)
+
+        now = build(state["now"]) if state["now"] else None
+        if now:
+            self.now = now
+            await self.play(now, start=state["position"])
+            await self.songmenucontroller()
+        else:
+            await self.play_next_song()
+
+        # the restored state was logged again while it was rebuilt, a snapshot replaces those records.
+        self.journal.request_snapshot(self.guild_id)
 
     async def play_next_song(
         self, position: dict = None, play_immediately: bool = False
@@ -128,7 +497,28 @@ class Player(wavelink.Player):
         """
         if position is None:
             position = {"start": 0, "end": 0}
-        if self.is_playing or self.waiting:
+        if self.is_playing or (self.waiting and self.queue.empty()):
+            return
+        self._stop_waiting()
+
+        # Only sending the next track to Lavalink is on the path between two songs, everything else runs after it.
+        if self._loop:
+            await self.play(self.now)
+        elif not self.queue.empty():
+            track = self.queue.get_nowait()
+            self.now = track
+            await self.play(
+                track,
+                start=position["start"],
+                end=position["end"],
+                replace=play_immediately,
+            )
+        else:
+            # the time spent waiting for a song to be queued is not a gap between two tracks.
+            self._track_ended = None
+            # nothing is parked on the queue, the next put wakes the player up, or the timer wheel tears it down.
+            self.waiting = True
+            self.idle_timer = self.bot.timers.schedule(IDLE_TIMEOUT, self._idle_timeout)
             return
 
         # Clear the votes for a new song...
@@ -138,72 +528,113 @@ class Player(wavelink.Player):
         self.shuffle_votes.clear()
         self.stop_votes.clear()
 
-        if not self._loop:
+        # Start our song menu
+        await self.songmenucontroller()
 
-            try:
-                self.waiting = True
-                with async_timeout.timeout(120):
-                    track = await self.queue.get()
-                    self.now = track
-                await self.play(
-                    track,
-                    start=position["start"],
-                    end=position["end"],
-                    replace=play_immediately,
-                )
-                self.waiting = False
+        suggestions = getattr(self.bot, "track_suggestions", None)
+        if suggestions:
+            suggestions.record(self.guild_id, self.now)
 
-                # Start our song menu
-                await self.songmenucontroller()
-            except asyncio.TimeoutError:
-                # No music has been played for 2 minutes, cleanup and disconnect.
-                return await self.teardown()
-        if self._loop:
-            track = self.now
-            await self.play(track)
-            await self.songmenucontroller()
+        # the lyrics of the next track are looked up while this one plays.
+        lyrics = getattr(self.bot, "lyrics", None)
+        if lyrics and not self.queue.empty():
+            lyrics.prefetch(self.queue[0])
 
-    async def songmenucontroller(self) -> None:
+    def _stop_waiting(self) -> None:
+        self.waiting = False
+        if self.idle_timer:
+            self.idle_timer.cancel()
+            self.idle_timer = None
+
+    def _wake(self) -> None:
         """
-        Method which handles the song menu.
+        Method which is called when a track is queued, and resumes the player if it was waiting for one.
         """
-        if self.updating:
-            return
+        if self.waiting:
+            self._stop_waiting()
+            asyncio.ensure_future(self.play_next_song())
 
-        self.updating = True
+    async def _idle_timeout(self) -> None:
+        """
+        Method which is called by the timer wheel when no track was queued for `IDLE_TIMEOUT` seconds.
+        """
+        self.idle_timer = None
+        if self.waiting and self.queue.empty():
+            # No music has been played for 2 minutes, cleanup and disconnect.
+            await self.teardown()
 
-        if not self.menu:
-            self.menu = await self.channel.send(
-                content=None,
-                embed=await self.make_song_embed(),
-                view=MenuControllerView(
-                    player=self, interaction=self.context, bot=self.bot
-                ),
-            )
+    def add_vote(self, votes: set, member: disnake.Member) -> int:
+        """
+        Method which adds the vote of a member, and clears the votes if nobody votes for `VOTE_TIMEOUT` seconds.
 
-        elif not await self.is_menu_available():
-            try:
-                await self.menu.delete()
-            except disnake.HTTPException as e:
-                logger.warning(f"Failed to delete menu message: {e}")
-            except AttributeError as e:
-                logger.warning(f"Failed to delete menu message: {e}")
+        Parameters
+        ----------
+        votes : set
+            The votes, e.g. `skip_votes`.
+        member : disnake.Member
+            The member who voted.
 
-            await self.channel.send(
-                content=None,
-                embed=await self.make_song_embed(),
-                view=MenuControllerView(self, self.context, bot=self.bot),
-            )
+        Returns
+        -------
+        int
+            The amount of votes.
+        """
+        votes.add(member)
+        timer = self._vote_timers.pop(id(votes), None)
+        if timer:
+            timer.cancel()
+        self._vote_timers[id(votes)] = self.bot.timers.schedule(VOTE_TIMEOUT, votes.clear)
+        return len(votes)
+
+    async def hook(self, event) -> None:
+        """
+        Method which handles the events of the player, and measures the gap between the end of a track and the
+        start of the next one.
+        """
+        await super().hook(event)
 
-        else:
-            embed = await self.make_song_embed()
-            await self.channel.send(
-                content=None,
-                embed=embed,
-                view=MenuControllerView(self, self.context, bot=self.bot),
-            )
+        if isinstance(event, (wavelink.TrackEnd, wavelink.TrackStuck, wavelink.TrackException)):
+            self._track_ended = time.perf_counter()
+        elif isinstance(event, wavelink.TrackStart) and self._track_ended is not None:
+            self.track_gaps.append((time.perf_counter() - self._track_ended) * 1000)
+            self._track_ended = None
+
+    @property
+    def average_gap(self) -> typing.Optional[float]:
+        """
+        Property which returns the average gap between the last tracks, in milliseconds.
+        """
+        if not self.track_gaps:
+            return None
+        return sum(self.track_gaps) / len(self.track_gaps)
+
+    def eta(self, index: int) -> typing.Optional[int]:
+        """
+        Method which returns how long it takes until the track at a position of the queue plays.
+        Streams in the queue do not count, since they have no end.
+
+        Parameters
+        ----------
+        index : int
+            The position of the track in the queue, 0 being the next track to play.
 
-        self.updating = False
+        Returns
+        -------
+        typing.Optional[int]
+            The time in milliseconds, or None if the current track never ends, because it loops or is a stream.
+        """
+        remaining = 0
+        if self.is_playing:
+            if self._loop or self.current.is_stream:
+                return None
+            remaining = max(track_duration(self.current) - int(self.position), 0)
+        return remaining + self.queue.duration_before(index)
+
+    async def songmenucontroller(self) -> None:
+        """
+        Method which handles the song menu. The controller message is edited in place by the `ControllerManager`.
+        """
+        self.controller.request_update(transition=True)
 
     async def make_song_embed(self) -> typing.Optional[disnake.Embed]:
         """
@@ -218,9 +649,9 @@ class Player(wavelink.Player):
         if not track:
             return None
 
-        channel = self.bot.get_channel(int(self.channel_id))
+        channel = self.bot.get_channel(int(self.channel_id)) if self.channel_id else None
         position = divmod(self.position, 60000)
-        length = divmod(self.now.length, 60000)
+        length = divmod(track.length, 60000)
         mode = "yes" if self._loop else "off"
 
         embed = disnake.Embed(
@@ -243,44 +674,66 @@ class Player(wavelink.Player):
         )
         embed.add_field(name="Track on loop?", value=f"**`{mode}`**")
         embed.add_field(name="Channel", value=f"**`{channel}`**")
-        embed.add_field(name="DJ", value=self.dj.mention)
+        # the DJ and the requester can be gone, e.g. after a restore when the member is no longer cached.
+        embed.add_field(name="DJ", value=self.dj.mention if self.dj else "`None`")
         embed.add_field(name="Video URL", value=f"[Click Here!]({track.uri})")
         embed.add_field(name="Author", value=f"`{track.author}`")
-        embed.set_footer(
-            text=f"Requested By {track.requester}",
-            icon_url=track.requester.display_avatar,
-        )
+        requester = await self.resolve_requester(track)
+        if requester:
+            embed.set_footer(
+                text=f"Requested By {requester}",
+                icon_url=requester.display_avatar,
+            )
+        else:
+            embed.set_footer(text="Requested By Unknown")
 
         return embed
 
-    async def is_menu_available(self) -> bool:
+    async def resolve_requester(self, track: Track) -> typing.Optional[disnake.Member]:
         """
-        Method which checks whether the player controller should be remade or updated.
+        Method which returns the requester of a track. Restored tracks whose requester was not cached only keep
+        the ID of the requester, the member is looked up the first time the track is shown.
+
+        Parameters
+        ----------
+        track : Track
+            The track.
 
         Returns
         -------
-        bool
-            Whether the player controller should be remade or updated.
+        typing.Optional[disnake.Member]
+            The requester, or None if it is unknown or no longer in the guild.
         """
-        try:
-            async for message in self.context.channel.history(limit=10):
-                if message.id == self.menu.message.id:
-                    return True
-        except (disnake.HTTPException, AttributeError):
-            return False
+        requester = track.requester
+        if not isinstance(requester, disnake.Object):
+            return requester
 
-        return False
+        guild = self.bot.get_guild(self.guild_id)
+        if guild is None:
+            return None
+        member = guild.get_member(requester.id)
+        if member is None:
+            try:
+                member = await guild.fetch_member(requester.id)
+            except disnake.HTTPException:
+                # the ID is kept, so the track stays credited to its requester in the queue and the journal.
+                return None
+        track.requester = member
+        return member
 
     async def teardown(self):
         """
         Method which handles the teardown(clearing and disconnection) of the player.
         """
-        try:
-            await self.menu.delete()
-        except disnake.HTTPException as e:
-            logger.warning(f"Failed to delete menu message: {e}")
-        except AttributeError:
-            logger.warning("Failed to delete menu message: No menu message")
+        if self.journal:
+            self.journal.discard(self.guild_id)
+
+        self._stop_waiting()
+        for timer in self._vote_timers.values():
+            timer.cancel()
+        self._vote_timers.clear()
+
+        await self.controller.close()
 
         try:
             await self.destroy()
@@ -305,42 +758,300 @@ class Player(wavelink.Player):
             The value to set the loop to.
         """
         self._loop = value
+        self._record("state", d={"loop": value})
+        self.controller.request_update()
+
+
+class ControllerManager:
+    """
+    A class that keeps a single now playing controller message per player, and edits it in place.
+
+    Updates are debounced, so a burst of changes results in a single edit. The state of the message is tracked
+    locally from the gateway, through `on_message` and `on_delete`, instead of looking it up in the channel history.
+    The controller is only sent again when its message was deleted or buried under other messages.
+
+    Parameters
+    ----------
+    player : Player
+        The player the controller belongs to.
+    delay : float
+        The minimum time between two updates of the message, in seconds.
+    buried_after : int
+        After how many newer messages in the channel the controller is sent again, so it stays visible.
+    """
+
+    def __init__(self, player: Player, *, delay: float = 1.0, buried_after: int = 10):
+        self.player = player
+        self.delay = delay
+        self.buried_after = buried_after
+
+        self.message: typing.Optional[disnake.Message] = None
+        self.deleted = False
+        self.messages_after = 0
+
+        self.rest_calls = 0
+        self.transitions = 0
+
+        self._last_update = 0.0
+        self._task: typing.Optional[asyncio.Task] = None
+        # whether an update was requested that the running task has not rendered yet.
+        self._dirty = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_available(self) -> bool:
+        """
+        Whether the controller message can be edited, instead of being sent again.
+        """
+        return (
+            self.message is not None
+            and not self.deleted
+            and self.messages_after < self.buried_after
+        )
+
+    @property
+    def calls_per_transition(self) -> float:
+        """
+        The average amount of REST calls made by the controller for every track transition.
+        """
+        return self.rest_calls / self.transitions if self.transitions else 0.0
+
+    def on_message(self, message: disnake.Message) -> None:
+        """
+        Method which tracks the messages sent after the controller, in the channel of the controller.
+        """
+        if (
+            self.message
+            and message.channel.id == self.message.channel.id
+            and message.id != self.message.id
+        ):
+            self.messages_after += 1
+
+    def on_delete(self, message_id: int) -> None:
+        """
+        Method which tracks whether the controller message was deleted.
+        """
+        if self.message and message_id == self.message.id:
+            self.deleted = True
+
+    def request_update(self, *, transition: bool = False) -> None:
+        """
+        Method which schedules an update of the controller. Requests that arrive while an update is already
+        scheduled are merged into it, and requests that arrive while an update is being sent cause one more
+        update after it.
+
+        Parameters
+        ----------
+        transition : bool
+            Whether the update is caused by a new track.
+        """
+        if transition:
+            self.transitions += 1
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._debounced())
+
+    async def _debounced(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._dirty:
+            wait = self._last_update + self.delay - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            # cleared before rendering, so a request made during the update is rendered by the next iteration.
+            self._dirty = False
+            self._last_update = loop.time()
+            try:
+                await self.update()
+            except disnake.HTTPException as e:
+                logger.warning(f"Failed to update the controller: {e}", __name="Music Bot")
+            except Exception:
+                logger.exception("Failed to update the controller", __name="Music Bot")
+
+    async def update(self) -> None:
+        """
+        Method which edits the controller message, or sends it again if it is gone or buried.
+        """
+        if getattr(self.player, "channel", None) is None:
+            # e.g. a restored player whose text channel is gone.
+            return
+        embed = await self.player.make_song_embed()
+        if embed is None:
+            return
+
+        async with self._lock:
+            if self.is_available:
+                self.rest_calls += 1
+                try:
+                    await self.message.edit(embed=embed)
+                    return
+                except disnake.NotFound:
+                    self.deleted = True
+
+            if self.message and not self.deleted:
+                self.rest_calls += 1
+                try:
+                    await self.message.delete()
+                except disnake.HTTPException as e:
+                    logger.warning(f"Failed to delete menu message: {e}", __name="Music Bot")
+
+            self.rest_calls += 1
+            # only the components are sent, the clicks are handled by the persistent `MenuControllerView`.
+            self.message = await self.player.channel.send(
+                embed=embed, components=self.player.bot.controller_view.children
+            )
+            self.deleted = False
+            self.messages_after = 0
+
+    async def close(self) -> None:
+        """
+        Method which cancels pending updates and deletes the controller message.
+        """
+        if self._task:
+            self._task.cancel()
+        if self.message and not self.deleted:
+            self.rest_calls += 1
+            try:
+                await self.message.delete()
+            except disnake.HTTPException as e:
+                logger.warning(f"Failed to delete menu message: {e}", __name="Music Bot")
+        self.message = None
+        logger.debug(
+            f"Controller of {self.player.guild_id} made {self.rest_calls} REST calls over "
+            f"{self.transitions} track transitions ({self.calls_per_transition:.2f} per transition).",
+            __name="Music Bot",
+        )
+
+
+class QueuePageSource(ListPageSource):
+    """
+    A page source that renders the pages of the queue of a player when they are shown, instead of formatting
+    every track of the queue up front.
+
+    Only the tracks of the requested page are sliced from the queue and formatted. Rendered pages are cached on the
+    player by the version of the queue, so paging back and forth or several people paging the same queue does not
+    format them again, and a page that was rendered before the queue changed is never shown after it.
+
+    Parameters
+    ----------
+    player : Player
+        The player whose queue is paginated.
+    per_page : int
+        The amount of tracks on a page.
+    """
+
+    def __init__(self, player: "Player", *, per_page: int = 5):
+        super().__init__(player.queue, per_page=per_page)
+        self.player = player
+
+    def is_paginating(self) -> bool:
+        return len(self.entries) > self.per_page
+
+    def get_max_pages(self) -> int:
+        # the queue can change while it is paginated, so the amount of pages is not fixed.
+        return max(math.ceil(len(self.entries) / self.per_page), 1)
+
+    def render(self, page_number: int) -> typing.List[str]:
+        """
+        A method that returns the lines of a page of the queue, from the cache if the queue has not changed since
+        the page was rendered.
+
+        Parameters
+        ----------
+        page_number : int
+            The page number, 0 being the first page.
+
+        Returns
+        -------
+        typing.List[str]
+            The numbered tracks of the page.
+        """
+        queue = self.player.queue
+        key = (queue.version, self.per_page, page_number)
+        lines = self.player.queue_pages.get(key)
+        if lines is None:
+            base = page_number * self.per_page
+            lines = [
+                f"{index}. [{track.title}]({track.uri}) - `{track.author}` - "
+                f"`{humanize.precisedelta(datetime.timedelta(milliseconds=track.length))}`"
+                for index, track in enumerate(queue[base: base + self.per_page], start=base + 1)
+            ]
+            self.player.queue_pages[key] = lines
+        return lines
+
+    async def get_page(self, page_number: int) -> typing.Tuple[int, typing.List[str]]:
+        return page_number, self.render(page_number)
+
+    async def format_page(self, menu, page: typing.Tuple[int, typing.List[str]]):
+        page_number, lines = page
+        queue = self.player.queue
+
+        menu.embed.title = (
+            f"**{len(queue)}** songs in Queue... "
+            f"`{humanize.precisedelta(datetime.timedelta(milliseconds=queue.duration))}` in total"
+        )
+        if queue.streams:
+            menu.embed.title += f", and `{queue.streams}` streams"
+
+        menu.embed.clear_fields()
+        requesters = sorted(
+            (item for item in queue.requesters.items() if item[0] is not None),
+            key=lambda item: item[1][0],
+            reverse=True,
+        )
+        if requesters:
+            menu.embed.add_field(
+                name="Requesters",
+                value="\n".join(
+                    f"<@{requester}>: `{count}` songs, "
+                    f"`{humanize.naturaldelta(datetime.timedelta(milliseconds=duration))}`"
+                    for requester, (count, duration) in requesters[:5]
+                ),
+                inline=False,
+            )
+
+        maximum = self.get_max_pages()
+        if maximum > 1:
+            menu.embed.set_footer(text=f"Page {page_number + 1}/{maximum} ({len(queue)} entries)")
+
+        menu.embed.description = "\n".join(lines) or "The queue is empty."
+        return menu.embed
 
 
 class QueuePages(ViewPages):
     """
     A simple paginator interface that is a subclass of :class: ViewPages.
-    This class is used to paginate the queue.
+    This class is used to paginate the queue, the pages are rendered by `QueuePageSource` when they are shown.
     """
 
     def __init__(
-        self, entries, ctx: disnake.ApplicationCommandInteraction, per_page: int = 5
+        self, player: "Player", ctx: disnake.ApplicationCommandInteraction, per_page: int = 5
     ):
-        super().__init__(RichPager(entries, per_page=per_page), ctx=ctx)
-        self.embed = disnake.Embed(
-            title=f"**{len(entries)}** songs in Queue...",
-            colour=disnake.Colour.random(),
-        ).set_footer(
+        super().__init__(QueuePageSource(player, per_page=per_page), ctx=ctx)
+        self.embed = disnake.Embed(colour=disnake.Colour.random()).set_footer(
             text=f"Requested By {ctx.author}", icon_url=ctx.author.display_avatar.url
         )
 
+    async def show_page(self, interaction: disnake.Interaction, page_number: int) -> None:
+        # tracks may have been removed since the page was opened, so the last page is shown instead of an empty one.
+        page_number = max(min(page_number, self.source.get_max_pages() - 1), 0)
+        await super().show_page(interaction, page_number)
+
 
 class MenuControllerView(disnake.ui.View):
-    def __init__(
-        self,
-        player: Player,
-        interaction: disnake.ApplicationCommandInteraction,
-        bot: Bot,
-    ):
+    """
+    The persistent view of the now playing controller.
+
+    A single instance is registered with the bot at startup. Controller messages are sent with its components only,
+    so no view is stored per message. The buttons have fixed custom IDs and route to the player of the guild the
+    button was clicked in, so they keep working after the bot restarts.
+    """
+
+    def __init__(self, bot: Bot):
         super().__init__(timeout=None)
-        self.player = player
-        self.interaction = interaction
         self.bot = bot
-        self.controller = MenuController(
-            self.player, bot=self.bot, interaction=self.interaction
-        )
+        self.controller = MenuController(bot=self.bot)
 
-    @disnake.ui.button(label="⏸️", style=disnake.ButtonStyle.gray)
+    @disnake.ui.button(label="⏸️", style=disnake.ButtonStyle.gray, custom_id="music:pause")
     async def pause_song(
         self, button: disnake.Button, interaction: disnake.ApplicationCommandInteraction
     ):
@@ -350,7 +1061,7 @@ class MenuControllerView(disnake.ui.View):
 
         await self.controller.pause(interaction=interaction)
 
-    @disnake.ui.button(label="▶", style=disnake.ButtonStyle.gray)
+    @disnake.ui.button(label="▶", style=disnake.ButtonStyle.gray, custom_id="music:resume")
     async def resume_song(
         self, button: disnake.Button, interaction: disnake.ApplicationCommandInteraction
     ):
@@ -360,7 +1071,7 @@ class MenuControllerView(disnake.ui.View):
 
         await self.controller.resume(interaction=interaction)
 
-    @disnake.ui.button(label="⏩", style=disnake.ButtonStyle.gray)
+    @disnake.ui.button(label="⏩", style=disnake.ButtonStyle.gray, custom_id="music:skip")
     async def skip_song(
         self, button: disnake.Button, interaction: disnake.ApplicationCommandInteraction
     ):
@@ -370,7 +1081,7 @@ class MenuControllerView(disnake.ui.View):
 
         await self.controller.skip(interaction=interaction)
 
-    @disnake.ui.button(label="🔁", style=disnake.ButtonStyle.gray)
+    @disnake.ui.button(label="🔁", style=disnake.ButtonStyle.gray, custom_id="music:loop")
     async def loop_song(
         self, button: disnake.Button, interaction: disnake.ApplicationCommandInteraction
     ):
@@ -380,7 +1091,7 @@ class MenuControllerView(disnake.ui.View):
 
         await self.controller.loop(interaction=interaction)
 
-    @disnake.ui.button(label="💺", style=disnake.ButtonStyle.gray)
+    @disnake.ui.button(label="💺", style=disnake.ButtonStyle.gray, custom_id="music:queue")
     async def show_queue(
         self, button: disnake.Button, interaction: disnake.ApplicationCommandInteraction
     ):
@@ -389,7 +1100,7 @@ class MenuControllerView(disnake.ui.View):
         """
         await self.controller.show_queue(interaction=interaction)
 
-    @disnake.ui.button(label="📃", style=disnake.ButtonStyle.gray)
+    @disnake.ui.button(label="📃", style=disnake.ButtonStyle.gray, custom_id="music:lyrics")
     async def show_lyrics(
         self, button: disnake.Button, interaction: disnake.ApplicationCommandInteraction
     ):
@@ -398,7 +1109,7 @@ class MenuControllerView(disnake.ui.View):
         """
         await self.controller.show_lyrics(interaction=interaction)
 
-    @disnake.ui.button(label="🔀", style=disnake.ButtonStyle.gray)
+    @disnake.ui.button(label="🔀", style=disnake.ButtonStyle.gray, custom_id="music:shuffle")
     async def shuffle_queue(
         self, button: disnake.Button, interaction: disnake.ApplicationCommandInteraction
     ):
@@ -407,7 +1118,7 @@ class MenuControllerView(disnake.ui.View):
         """
         await self.controller.shuffle(interaction=interaction)
 
-    @disnake.ui.button(label="⏹", style=disnake.ButtonStyle.gray)
+    @disnake.ui.button(label="⏹", style=disnake.ButtonStyle.gray, custom_id="music:stop")
     async def stop_song(
         self, button: disnake.Button, interaction: disnake.ApplicationCommandInteraction
     ):
@@ -416,6 +1127,27 @@ class MenuControllerView(disnake.ui.View):
         """
         await self.controller.stop(interaction=interaction)
 
+    async def interaction_check(self, interaction: disnake.MessageInteraction) -> bool:
+        """
+        Check if the guild the button was clicked in has a player, so a click on an old controller does not create one.
+
+        Parameters
+        ----------
+        interaction : disnake.MessageInteraction
+            The interaction to check.
+
+        Returns
+        -------
+        bool
+            Whether the guild has a player.
+        """
+        if not self.bot.wavelink.peek_player(interaction.guild.id):
+            await interaction.response.send_message(
+                f"{self.bot.icons['redtick']} `Nothing is playing in this server.`", ephemeral=True
+            )
+            return False
+        return True
+
     async def on_error(
         self,
         error: Exception,
@@ -441,7 +1173,7 @@ class MenuControllerView(disnake.ui.View):
         await safe_send(
             embed=disnake.Embed(
                 description=f"{self.bot.icons['redtick']} `An error has occurred while "
-                f"executing {interaction.data.name} command. The error has been generated on "
+                f"executing {interaction.data.custom_id} button. The error has been generated on "
                 f"mystbin. "
                 f"Please report this to {', '.join([str(owner) for owner in await self.bot.get_owners])}`",
                 colour=disnake.Colour.random(),
@@ -450,7 +1182,7 @@ class MenuControllerView(disnake.ui.View):
         )
 
         print(
-            f"Ignoring exception in command {interaction.data.name}: ",
+            f"Ignoring exception in button {interaction.data.custom_id}: ",
             file=sys.stderr,
         )
         traceback.print_exception(
@@ -459,14 +1191,7 @@ class MenuControllerView(disnake.ui.View):
 
 
 class MenuController:
-    def __init__(
-        self,
-        player: Player,
-        interaction: disnake.ApplicationCommandInteraction,
-        bot: Bot,
-    ):
-        self.player = player
-        self.interaction = interaction
+    def __init__(self, bot: Bot):
         self.bot = bot
 
     def is_author(self, interaction: disnake.ApplicationCommandInteraction):
@@ -483,9 +1208,7 @@ class MenuController:
         bool
             Whether the user is the command invoker / interaction Author or do they have permissions to kick members.`.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
         return (
             player.dj == interaction.author
@@ -507,14 +1230,12 @@ class MenuController:
         int
             The required votes.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
-        channel = self.bot.get_channel(int(player.channel_id))
-        required = math.ceil((len(channel.members) - 1) / 2.5)
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
+        listeners = self.bot.voice_index.count(int(player.channel_id))
+        required = math.ceil(listeners / 2.5)
 
         if interaction.application_command.name == "stop":
-            if len(channel.members) == 3:
+            if listeners == 2:
                 required = 2
 
         return required
@@ -528,9 +1249,7 @@ class MenuController:
         interaction: disnake.ApplicationCommandInteraction
             The Interaction of the command.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
         if player.is_paused:
             return await interaction.response.send_message(
@@ -554,7 +1273,7 @@ class MenuController:
             return await player.set_pause(True)
 
         required = self.vote_check(interaction)
-        player.pause_votes.add(interaction.author)
+        player.add_vote(player.pause_votes, interaction.author)
 
         if len(player.pause_votes) >= required:
             await interaction.response.send_message(
@@ -584,11 +1303,9 @@ class MenuController:
         interaction : disnake.ApplicationCommandInteraction
             The Interaction of the command.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -628,7 +1345,7 @@ class MenuController:
             return await player.set_pause(False)
 
         required = self.vote_check(interaction)
-        player.resume_votes.add(interaction.author)
+        player.add_vote(player.resume_votes, interaction.author)
 
         if len(player.resume_votes) >= required:
             await interaction.response.send_message(
@@ -651,11 +1368,9 @@ class MenuController:
         interaction: disnake.ApplicationCommandInteraction
             The Interaction of the command.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -685,7 +1400,7 @@ class MenuController:
             return await player.stop()
 
         required = self.vote_check(interaction)
-        player.skip_votes.add(interaction.author)
+        player.add_vote(player.skip_votes, interaction.author)
 
         if len(player.skip_votes) >= required:
             await interaction.response.send_message(
@@ -712,11 +1427,9 @@ class MenuController:
         interaction : disnake.ApplicationCommandInteraction
             The Interaction of the command.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -733,29 +1446,21 @@ class MenuController:
                 )
             )
 
-        name = player.now.title
-
-        lyrics_query = (
-            f"https://some-random-api.ml/lyrics?title={name}-{player.now.author}"
-        )
-        resp = await self.bot.session.get(lyrics_query)
+        # the lookup can take a while when the lyrics are not cached, so the interaction is answered first.
+        await interaction.response.send_message(content="Generating lyrics....")
+        pages = await self.bot.lyrics.pages(player.now)
 
-        if resp.status != 200:
-            return await interaction.response.send_message(
+        if not pages:
+            return await interaction.edit_original_message(
+                content=None,
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `Lyrics for this song is not found.`",
                     colour=disnake.Colour.random(),
                 ),
-                ephemeral=True,
             )
 
-        data = await resp.json()
-        await interaction.response.send_message(content="Generating lyrics....")
-
-        lyrics = data["lyrics"]
-        content = WrapText(lyrics, length=1000)
         pag = LyricsPaginator(
-            lyrics=content, ctx=interaction, thumbnail=player.current.thumbnail
+            lyrics=pages, ctx=interaction, thumbnail=player.current.thumbnail
         )
         await pag.start()
 
@@ -769,11 +1474,9 @@ class MenuController:
         interaction: disnake.ApplicationCommandInteraction
             The Interaction of the command.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -818,10 +1521,10 @@ class MenuController:
             )
 
             player.shuffle_votes.clear()
-            return player.queue.shuffle()
+            return await player.queue.shuffle()
 
         required = self.vote_check(interaction)
-        player.shuffle_votes.add(interaction.author)
+        player.add_vote(player.shuffle_votes, interaction.author)
 
         if len(player.shuffle_votes) >= required:
             await interaction.channel.send(
@@ -833,7 +1536,7 @@ class MenuController:
             )
 
             player.shuffle_votes.clear()
-            player.queue.shuffle()
+            await player.queue.shuffle()
         else:
             return await interaction.channel.send(
                 embed=disnake.Embed(
@@ -852,11 +1555,9 @@ class MenuController:
         interaction : disnake.ApplicationCommandInteraction
             The Interaction of the command.`
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
 
-        if not player.is_connected:
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -892,16 +1593,9 @@ class MenuController:
                 ephemeral=True,
             )
 
-        entries = []
-        for track in player.queue._queue:
-            entries.append(
-                f"[{track.title}]({track.uri}) - `{track.author}` - "
-                f"`{humanize.precisedelta(datetime.timedelta(milliseconds=track.length))}`"
-            )
-
         await interaction.response.send_message("Loading...")
 
-        paginator = QueuePages(entries=entries, ctx=interaction)
+        paginator = QueuePages(player, ctx=interaction)
 
         await paginator.start()
 
@@ -914,10 +1608,8 @@ class MenuController:
         interaction: disnake.ApplicationCommandInteraction
             The Interaction of the command.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
-        if not player.is_connected:
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -983,10 +1675,8 @@ class MenuController:
         interaction: disnake.ApplicationCommandInteraction
             The Interaction of the command.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
-        if not player.is_connected:
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
+        if not player or not player.is_connected:
             return await interaction.response.send_message(
                 embed=disnake.Embed(
                     description=f"{self.bot.icons['redtick']} `You must be connected to a voice channel.`",
@@ -1023,7 +1713,7 @@ class MenuController:
             return await player.teardown()
 
         required = self.vote_check(interaction)
-        player.stop_votes.add(interaction.author)
+        player.add_vote(player.stop_votes, interaction.author)
 
         if len(player.stop_votes) >= required:
             await interaction.response.send_message(
@@ -0,0 +1,229 @@
+#  -*- coding: utf-8 -*-
+"""
+Small in-memory caches shared by the features of the bot.
+"""
+import asyncio
+import collections
+import time
+import typing
+
+K = typing.TypeVar("K")
+V = typing.TypeVar("V")
+
+
+class LRUCache(typing.Generic[K, V]):
+    """
+    A mapping that keeps at most ``maxsize`` items, and evicts the least recently used item when it is full.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum amount of items.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: "collections.OrderedDict[K, V]" = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        return f"<LRUCache size={len(self._data)}/{self.maxsize} hits={self.hits} misses={self.misses}>"
+
+    def get(self, key: K, default: typing.Optional[V] = None) -> typing.Optional[V]:
+        """
+        A method that returns the item of a key and marks it as recently used.
+
+        Parameters
+        ----------
+        key : K
+            The key of the item.
+        default : typing.Optional[V]
+            What to return if the key is not cached.
+
+        Returns
+        -------
+        typing.Optional[V]
+            The cached item, or the default.
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            evicted, _ = self._data.popitem(last=False)
+            self._evicted(evicted)
+
+    def _evicted(self, key: K) -> None:
+        # called with the key of the least recently used item when it is evicted.
+        pass
+
+    def pop(self, key: K, default: typing.Optional[V] = None) -> typing.Optional[V]:
+        """
+        A method that removes the item of a key and returns it.
+        """
+        return self._data.pop(key, default)
+
+    def items(self) -> typing.ItemsView[K, V]:
+        """
+        A method that returns the items, from the least to the most recently used. It does not mark them as used.
+        """
+        return self._data.items()
+
+    def clear(self) -> None:
+        """
+        A method that removes every item.
+        """
+        self._data.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of the lookups that were answered from the cache.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache(LRUCache[K, V]):
+    """
+    An `LRUCache` whose items also expire a while after they were set.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum amount of items.
+    ttl : float
+        How long an item is kept by default, in seconds.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 3600.0):
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self._expires: typing.Dict[K, float] = {}
+
+    def get(self, key: K, default: typing.Optional[V] = None) -> typing.Optional[V]:
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self.pop(key)
+        return super().get(key, default)
+
+    def __contains__(self, key: K) -> bool:
+        expires = self._expires.get(key)
+        return expires is not None and expires > time.monotonic()
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self.set(key, value)
+
+    def set(self, key: K, value: V, ttl: typing.Optional[float] = None) -> None:
+        """
+        A method that sets the item of a key.
+
+        Parameters
+        ----------
+        key : K
+            The key of the item.
+        value : V
+            The item.
+        ttl : typing.Optional[float]
+            How long the item is kept, in seconds, the ``ttl`` of the cache by default.
+        """
+        self._expires[key] = time.monotonic() + (self.ttl if ttl is None else ttl)
+        super().__setitem__(key, value)
+
+    def _evicted(self, key: K) -> None:
+        self._expires.pop(key, None)
+
+    def pop(self, key: K, default: typing.Optional[V] = None) -> typing.Optional[V]:
+        self._expires.pop(key, None)
+        return super().pop(key, default)
+
+    def clear(self) -> None:
+        self._expires.clear()
+        super().clear()
+
+
+class InFlight(typing.Generic[K, V]):
+    """
+    The lookups that are running, by their key, so concurrent lookups of the same key share one call, e.g. in front
+    of a `TTLCache` that the call fills.
+
+    The call runs as its own task and is awaited through `asyncio.shield`, so a caller that is cancelled or times out
+    does not cancel it for the other callers. Its exception is raised to every caller that waits on it.
+    """
+
+    def __init__(self):
+        self._pending: typing.Dict[K, asyncio.Future] = {}
+        # the lookups that joined a call that was already running.
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._pending
+
+    def start(self, key: K, call: typing.Callable[[], typing.Awaitable[V]]) -> asyncio.Future:
+        """
+        A method that returns the running call of a key, and starts it if there is none.
+
+        Parameters
+        ----------
+        key : K
+            The key of the lookup.
+        call : typing.Callable[[], typing.Awaitable[V]]
+            A function that returns the awaitable of the call, it is only called if no call of the key is running.
+
+        Returns
+        -------
+        asyncio.Future
+            The call. Await it through `asyncio.shield`, or use `wait`.
+        """
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self._pending[key] = future
+            future.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self.coalesced += 1
+        return future
+
+    async def wait(self, key: K, call: typing.Callable[[], typing.Awaitable[V]]) -> V:
+        """
+        A method that waits for the running call of a key, and starts it if there is none.
+
+        Parameters
+        ----------
+        key : K
+            The key of the lookup.
+        call : typing.Callable[[], typing.Awaitable[V]]
+            A function that returns the awaitable of the call.
+
+        Returns
+        -------
+        V
+            The result of the call.
+        """
+        return await asyncio.shield(self.start(key, call))
+
+    def _done(self, key: K, future: asyncio.Future) -> None:
+        if self._pending.get(key) is future:
+            del self._pending[key]
+        if not future.cancelled():
+            # marks the exception as retrieved, it is raised to the callers that waited on the call, and a call that
+            # nobody waits on anymore must not log that its exception was never retrieved.
+            future.exception()
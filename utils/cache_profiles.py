@@ -0,0 +1,288 @@
+#  -*- coding: utf-8 -*-
+"""
+Gateway intent and cache profiles of the bot.
+
+The ``full`` profile requests every intent and caches every member and the last 1000 messages, like the bot always did.
+The ``lean`` profile only requests what the music features need: guilds, voice states and guild messages (for prefix
+commands), caches only the members that are connected to a voice channel and keeps a small message cache.
+
+Without the members intent, disnake drops the members of the guild create payload, so the members that are already
+connected to a voice channel when a guild becomes available are not cached, only the members whose voice state changes
+afterwards are. `cache_voice_members` requests the missing ones by their IDs when a guild becomes available, so DJ
+assignment and vote checks work the same under both profiles.
+
+Running this module measures the RSS of every profile against synthetic guilds:
+
+    python -m utils.cache_profiles --guilds 1000 --members 250
+"""
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import typing
+
+import disnake
+import psutil
+from disnake import Intents, MemberCacheFlags
+
+PROFILES = ("full", "lean")
+
+
+def cache_options(profile: str, max_messages: typing.Optional[int] = None) -> dict:
+    """
+    A function that returns the keyword arguments of `commands.AutoShardedBot` for a cache profile.
+
+    Parameters
+    ----------
+    profile : str
+        The name of the profile, either ``"full"`` or ``"lean"``.
+    max_messages : typing.Optional[int]
+        The size of the message cache. If not passed, the default of the profile is used.
+
+    Returns
+    -------
+    dict
+        The ``intents``, ``member_cache_flags``, ``max_messages`` and ``chunk_guilds_at_startup`` options.
+
+    Raises
+    ------
+    ValueError
+        If the profile does not exist.
+    """
+    if profile == "full":
+        return {
+            "intents": Intents.all(),
+            "member_cache_flags": MemberCacheFlags.all(),
+            "max_messages": 1000 if max_messages is None else max_messages,
+            "chunk_guilds_at_startup": True,
+        }
+
+    if profile == "lean":
+        intents = Intents.none()
+        intents.guilds = True
+        intents.voice_states = True
+        intents.guild_messages = True
+        intents.message_content = True  # prefix commands, used by the owner commands and jishaku.
+        return {
+            "intents": intents,
+            "member_cache_flags": MemberCacheFlags(voice=True, joined=False),
+            "max_messages": 100 if max_messages is None else max_messages,
+            "chunk_guilds_at_startup": False,
+        }
+
+    raise ValueError(f"Unknown cache profile '{profile}', expected one of {PROFILES}")
+
+
+def uncached_voice_members(guild: disnake.Guild) -> typing.List[int]:
+    """
+    A function that returns the IDs of the users connected to a voice channel of a guild whose member is not cached.
+
+    Parameters
+    ----------
+    guild : disnake.Guild
+        The guild.
+
+    Returns
+    -------
+    typing.List[int]
+        The user IDs, from the voice states of the guild.
+    """
+    return [
+        user_id
+        for channel in guild.voice_channels + guild.stage_channels
+        for user_id in channel.voice_states
+        if guild.get_member(user_id) is None
+    ]
+
+
+async def cache_voice_members(guild: disnake.Guild) -> int:
+    """
+    A function that requests the members connected to a voice channel of a guild that are not cached, and caches
+    them. Members requested by their IDs do not need the members intent.
+
+    Parameters
+    ----------
+    guild : disnake.Guild
+        The guild, usually one that just became available.
+
+    Returns
+    -------
+    int
+        The amount of members that were requested.
+
+    Raises
+    ------
+    asyncio.TimeoutError
+        If Discord did not send the members in time.
+    """
+    missing = uncached_voice_members(guild)
+    # Discord returns at most 100 members per request.
+    for index in range(0, len(missing), 100):
+        user_ids = missing[index: index + 100]
+        await guild.query_members(user_ids=user_ids, limit=len(user_ids), cache=True)
+    return len(missing)
+
+
+def rss_mb() -> float:
+    """
+    A function that returns the resident set size of the current process.
+
+    Returns
+    -------
+    float
+        The RSS in megabytes.
+    """
+    return psutil.Process(os.getpid()).memory_info().rss / 1024 ** 2
+
+
+def rss_per_1k_guilds(guilds: int) -> float:
+    """
+    A function that returns the RSS of the current process, normalized per 1000 guilds.
+
+    Parameters
+    ----------
+    guilds : int
+        The amount of guilds the process has cached.
+
+    Returns
+    -------
+    float
+        The RSS in megabytes per 1000 guilds.
+    """
+    return rss_mb() / max(guilds, 1) * 1000
+
+
+def _guild_payload(guild_id: int, members: int, in_voice: int) -> dict:
+    channel_id = guild_id + 1
+    member_payloads = [
+        {
+            "user": {
+                "id": str(guild_id * 10_000 + index),
+                "username": f"user{index}",
+                "discriminator": "0001",
+                "avatar": None,
+            },
+            "roles": [],
+            "joined_at": "2021-01-01T00:00:00+00:00",
+            "deaf": False,
+            "mute": False,
+        }
+        for index in range(members)
+    ]
+    return {
+        "id": str(guild_id),
+        "name": f"guild {guild_id}",
+        "owner_id": member_payloads[0]["user"]["id"] if member_payloads else "1",
+        "roles": [],
+        "emojis": [],
+        "features": [],
+        "member_count": members,
+        "members": member_payloads,
+        "channels": [
+            {"id": str(channel_id), "type": 2, "name": "Music", "position": 0, "bitrate": 64000}
+        ],
+        "voice_states": [
+            {
+                "user_id": member["user"]["id"],
+                "channel_id": str(channel_id),
+                "session_id": "0",
+                "deaf": False,
+                "mute": False,
+                "self_deaf": False,
+                "self_mute": False,
+                "suppress": False,
+            }
+            for member in member_payloads[:in_voice]
+        ],
+    }
+
+
+def measure(profile: str, guilds: int, members: int, in_voice: int) -> dict:
+    """
+    A function that fills the cache of a client using a profile with synthetic guilds and measures the memory used.
+
+    Parameters
+    ----------
+    profile : str
+        The name of the profile.
+    guilds : int
+        The amount of guilds to create.
+    members : int
+        The amount of members in every guild, as sent in the guild create payload.
+    in_voice : int
+        The amount of members connected to a voice channel in every guild.
+
+    Returns
+    -------
+    dict
+        The profile, the amount of cached members and voice channel members, and the RSS per 1000 guilds.
+    """
+    options = cache_options(profile)
+    options.pop("chunk_guilds_at_startup")
+    client = disnake.Client(**options)
+    state = client._connection
+
+    gc.collect()
+    before = rss_mb()
+    for index in range(guilds):
+        payload = _guild_payload((index + 1) << 32, members, in_voice)
+        guild = state._add_guild_from_data(payload)
+        # what `cache_voice_members` caches when the guild becomes available, as if Discord answered the request.
+        missing = set(uncached_voice_members(guild))
+        for data in payload["members"]:
+            if int(data["user"]["id"]) in missing:
+                guild._add_member(disnake.Member(data=data, guild=guild, state=state))
+    gc.collect()
+    used = rss_mb() - before
+
+    return {
+        "profile": profile,
+        "guilds": guilds,
+        "cached_members": sum(len(guild._members) for guild in state.guilds),
+        "voice_members": sum(
+            len(channel.members) for guild in state.guilds for channel in guild.voice_channels
+        ),
+        "rss_per_1k_guilds": used / max(guilds, 1) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the memory used by each cache profile.")
+    parser.add_argument("--guilds", type=int, default=1000)
+    parser.add_argument("--members", type=int, default=250)
+    parser.add_argument("--in-voice", type=int, default=3)
+    parser.add_argument("--profile", choices=PROFILES, action="append")
+    args = parser.parse_args()
+
+    # every profile is measured in a fresh process, so the allocator state of one profile does not skew the next.
+    profiles = args.profile or PROFILES
+    if len(profiles) > 1:
+        for profile in profiles:
+            subprocess.run(
+                [
+                    sys.executable, "-m", "utils.cache_profiles",
+                    "--guilds", str(args.guilds),
+                    "--members", str(args.members),
+                    "--in-voice", str(args.in_voice),
+                    "--profile", profile,
+                ],
+                check=True,
+            )
+        return
+
+    result = measure(profiles[0], args.guilds, args.members, args.in_voice)
+    print(
+        f"{result['profile']:>5}: {result['cached_members']} members cached, "
+        f"{result['voice_members']} voice channel members, "
+        f"{result['rss_per_1k_guilds']:.1f} MB RSS per 1k guilds"
+    )
+    if result["voice_members"] != args.guilds * args.in_voice:
+        raise SystemExit(
+            f"The '{result['profile']}' profile cached {result['voice_members']} voice channel members, "
+            f"expected {args.guilds * args.in_voice}."
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#  -*- coding: utf-8 -*-
+"""
+An index of the slash commands and cogs of the bot, used by the help command and its autocomplete.
+
+Discord gives autocomplete handlers a tight deadline, so the names are indexed once instead of being scanned on
+every keystroke: a sorted list finds the names that start with the input, and an index of the trigrams of every
+name finds the names that are close to it, e.g. ``plya`` finds ``play``. The help embeds of every command are
+rendered when the index is built. The bot rebuilds the index when a cog is added or removed, so loading or
+reloading a cog keeps it up to date and no lookup pays for a rebuild.
+"""
+import bisect
+import collections
+import pkgutil
+import typing
+
+import disnake
+from disnake.ext import commands
+
+
+def trigrams(text: str) -> typing.Set[str]:
+    """
+    A function that returns the trigrams of a text, padded so the start and the end of the text count too.
+
+    Parameters
+    ----------
+    text : str
+        The text, already lowercased.
+
+    Returns
+    -------
+    typing.Set[str]
+        The trigrams of the text.
+    """
+    padded = f"  {text} "
+    return {padded[i: i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """
+    A class that finds the names that start with, contain or are close to a query.
+
+    Parameters
+    ----------
+    names : typing.Iterable[str]
+        The indexed names.
+    threshold : float
+        The minimum trigram similarity of a close name, between 0 and 1.
+    """
+
+    def __init__(self, names: typing.Iterable[str] = (), *, threshold: float = 0.3):
+        self.threshold = threshold
+        self._names: typing.Dict[str, str] = {name.lower(): name for name in names}
+        self._sorted = sorted(self._names)
+        self._grams: typing.Dict[str, typing.Set[str]] = {name: trigrams(name) for name in self._sorted}
+        self._postings: typing.Dict[str, typing.List[str]] = collections.defaultdict(list)
+        for name, grams in self._grams.items():
+            for gram in grams:
+                self._postings[gram].append(name)
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._names
+
+    def search(self, query: str, limit: int = 25) -> typing.List[str]:
+        """
+        A method that returns the names matching a query: the names that start with it first, then the names that
+        contain it, then the names that are close to it by their trigrams.
+
+        Parameters
+        ----------
+        query : str
+            The query, e.g. what the user typed.
+        limit : int
+            The maximum amount of names, Discord shows at most 25 autocomplete choices.
+
+        Returns
+        -------
+        typing.List[str]
+            The names, as they were indexed.
+        """
+        query = query.strip().lower()
+        if not query:
+            return [self._names[name] for name in self._sorted[:limit]]
+
+        start = bisect.bisect_left(self._sorted, query)
+        found: typing.Dict[str, None] = {}
+        for name in self._sorted[start:]:
+            if not name.startswith(query) or len(found) >= limit:
+                break
+            found[name] = None
+
+        if len(found) < limit:
+            for name in self._sorted:
+                if query in name and name not in found:
+                    found[name] = None
+                    if len(found) >= limit:
+                        break
+
+        if len(found) < limit:
+            grams = trigrams(query)
+            shared: typing.Counter[str] = collections.Counter()
+            for gram in grams:
+                shared.update(self._postings.get(gram, ()))
+            # the Dice coefficient of the trigrams of the query and of the name.
+            scored = sorted(
+                (
+                    (2 * count / (len(grams) + len(self._grams[name])), name)
+                    for name, count in shared.items()
+                    if name not in found
+                ),
+                reverse=True,
+            )
+            for score, name in scored[: limit - len(found)]:
+                if score < self.threshold:
+                    break
+                found[name] = None
+
+        return [self._names[name] for name in found]
+
+
+def _examples(callback: typing.Callable) -> typing.Optional[str]:
+    # the examples are the part of the docstring of a command after its "Examples" header.
+    try:
+        return callback.__doc__.replace("\n", "").split("Examples")[1].replace("--------", "")
+    except (AttributeError, IndexError):
+        return None
+
+
+def _help_embed(title: str, usage: str, description: str, examples: typing.Optional[str]) -> disnake.Embed:
+    # the colour is random every time the help is shown, it is set on the copy that is sent.
+    embed = disnake.Embed(title=title)
+    embed.add_field(name="Usage", value=f"`{usage}`")
+    embed.add_field(name="Description", value=f"`{description}`", inline=False)
+    embed.add_field(name="Examples", value=f"{examples or 'No examples.'}", inline=False)
+    return embed
+
+
+class CommandHelp(typing.NamedTuple):
+    """
+    The pre-rendered help of a slash command.
+    """
+
+    name: str
+    embed: disnake.Embed
+    # the help of the sub commands, sub commands without examples are left out.
+    children: typing.List[disnake.Embed]
+
+
+class CommandIndex:
+    """
+    A class that indexes the slash commands and the cogs of a bot.
+
+    Parameters
+    ----------
+    bot : commands.InteractionBot
+        The bot whose commands are indexed.
+    cogs_directory : str
+        The directory the cogs are loaded from.
+    """
+
+    def __init__(self, bot: commands.InteractionBot, cogs_directory: str = "cogs"):
+        self.bot = bot
+        self.cogs_directory = cogs_directory
+        self._commands = FuzzyIndex()
+        self._cogs = FuzzyIndex()
+        self._help: typing.Dict[str, CommandHelp] = {}
+        self._stale = True
+        self.builds = 0
+
+    def invalidate(self) -> None:
+        """
+        A method that marks the index as stale, so it is rebuilt by the next lookup if it is not rebuilt before.
+        """
+        self._stale = True
+
+    def rebuild(self) -> None:
+        """
+        A method that rebuilds the index from the commands of the bot. Called when a cog is added or removed.
+        """
+        self._build()
+
+    def _build(self) -> None:
+        pages = {}
+        for name, command in self.bot.all_slash_commands.items():
+            children = []
+            for key, child in command.children.items():
+                examples = _examples(child.callback)
+                if examples is None:
+                    continue
+                children.append(
+                    _help_embed(
+                        f"Help for {name} {key}",
+                        f"/{name} {key} {', '.join(option.name for option in child.option.options)}",
+                        child.docstring["description"],
+                        examples,
+                    )
+                )
+            embed = _help_embed(
+                f"Help for {name}",
+                f"/{name} {', '.join(option.name for option in command.options)}",
+                command.docstring["description"],
+                _examples(command.callback),
+            )
+            pages[name] = CommandHelp(name, embed, children)
+
+        self._help = pages
+        self._commands = FuzzyIndex(pages)
+        self._cogs = FuzzyIndex(module.name for module in pkgutil.iter_modules([self.cogs_directory]))
+        self._stale = False
+        self.builds += 1
+
+    def _ensure(self) -> None:
+        if self._stale:
+            self._build()
+
+    def search_commands(self, query: str, limit: int = 25) -> typing.List[str]:
+        """
+        A method that returns the names of the slash commands matching a query.
+
+        Parameters
+        ----------
+        query : str
+            What the user typed.
+        limit : int
+            The maximum amount of names.
+
+        Returns
+        -------
+        typing.List[str]
+            The names of the commands, best matches first.
+        """
+        self._ensure()
+        return self._commands.search(query, limit)
+
+    def search_cogs(self, query: str, limit: int = 25) -> typing.List[str]:
+        """
+        A method that returns the names of the cogs matching a query, loaded or not.
+
+        Parameters
+        ----------
+        query : str
+            What the user typed.
+        limit : int
+            The maximum amount of names.
+
+        Returns
+        -------
+        typing.List[str]
+            The names of the cog modules, best matches first.
+        """
+        self._ensure()
+        return self._cogs.search(query, limit)
+
+    def help(self, name: str) -> typing.Optional[CommandHelp]:
+        """
+        A method that returns the pre-rendered help of a slash command. The embeds are shared and have no colour,
+        copy them before changing them.
+
+        Parameters
+        ----------
+        name : str
+            The name of the command.
+
+        Returns
+        -------
+        typing.Optional[CommandHelp]
+            The help of the command, or None if there is no command with the name.
+        """
+        self._ensure()
+        return self._help.get(name)
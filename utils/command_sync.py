@@ -0,0 +1,156 @@
+#  -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import typing
+
+from loguru import logger
+
+GLOBAL_SCOPE = "global"
+
+
+def command_scopes(bot) -> typing.Dict[str, list]:
+    """
+    A function that groups the registered application commands of the bot by the scope they are synced to.
+
+    Parameters
+    ----------
+    bot : Bot
+        The bot instance.
+
+    Returns
+    -------
+    typing.Dict[str, list]
+        A dict mapping a scope (``"global"`` or a guild ID as a string) to the command bodies of that scope.
+    """
+    test_guilds = getattr(bot, "_test_guilds", None)
+    scopes: typing.Dict[str, list] = {}
+
+    for command in bot.application_commands:
+        guild_ids = command.guild_ids or test_guilds
+        if not guild_ids:
+            scopes.setdefault(GLOBAL_SCOPE, []).append(command.body)
+            continue
+        for guild_id in guild_ids:
+            scopes.setdefault(str(guild_id), []).append(command.body)
+
+    return scopes
+
+
+def hash_commands(commands: list) -> str:
+    """
+    A function that computes a stable hash of a list of application command bodies.
+    The hash does not depend on the order the commands were registered in.
+
+    Parameters
+    ----------
+    commands : list
+        A list of `disnake.ApplicationCommand` objects.
+
+    Returns
+    -------
+    str
+        The hex digest of the command schema.
+    """
+    schema = sorted(
+        (command.to_dict() for command in commands),
+        key=lambda data: (data.get("type", 1), data["name"]),
+    )
+    encoded = json.dumps(schema, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CommandSyncState:
+    """
+    A helper class that stores the hashes of the last synced slash command tree on disk,
+    so the bot can skip syncing when nothing has changed between restarts.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.application_id: typing.Optional[int] = None
+        self.hashes: typing.Dict[str, str] = {}
+        self.last_duration: float = 0.0
+        self.load()
+
+    def load(self) -> None:
+        """
+        A method that loads the stored state from the state file, if there is one.
+        """
+        try:
+            with open(self.path, mode="r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read command sync state: {e}", __name="Music Bot")
+            return
+
+        self.application_id = data.get("application_id")
+        self.hashes = data.get("hashes", {})
+        self.last_duration = data.get("last_duration", 0.0)
+
+    def save(self) -> None:
+        """
+        A method that writes the state to the state file.
+        The file is replaced atomically, so a crash never leaves a half written state behind.
+        """
+        data = {
+            "application_id": self.application_id,
+            "hashes": self.hashes,
+            "last_duration": self.last_duration,
+        }
+        temp = f"{self.path}.tmp"
+        try:
+            with open(temp, mode="w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to write command sync state: {e}", __name="Music Bot")
+
+    def changed_scopes(
+        self, application_id: int, hashes: typing.Dict[str, str]
+    ) -> typing.Set[str]:
+        """
+        A method that returns the scopes whose commands differ from the last sync.
+
+        Parameters
+        ----------
+        application_id : int
+            The application ID of the bot. A different application invalidates every stored hash.
+        hashes : typing.Dict[str, str]
+            The current hash of every scope.
+
+        Returns
+        -------
+        typing.Set[str]
+            The scopes that need to be synced, including scopes that no longer have any commands.
+        """
+        if self.application_id != application_id:
+            return set(hashes) | set(self.hashes)
+
+        return {
+            scope
+            for scope in set(hashes) | set(self.hashes)
+            if hashes.get(scope) != self.hashes.get(scope)
+        }
+
+    def update(
+        self, application_id: int, hashes: typing.Dict[str, str], duration: float
+    ) -> None:
+        """
+        A method that records a successful sync and saves it.
+
+        Parameters
+        ----------
+        application_id : int
+            The application ID of the bot.
+        hashes : typing.Dict[str, str]
+            The hash of every scope that is now synced.
+        duration : float
+            How long the sync took, in seconds.
+        """
+        self.application_id = application_id
+        self.hashes = dict(hashes)
+        self.last_duration = duration
+        self.save()
@@ -0,0 +1,240 @@
+#  -*- coding: utf-8 -*-
+"""
+A pool of long-lived youtube_dl extractors in worker processes.
+
+Building a ``YoutubeDL`` and extracting the info of a video is slow and CPU-bound. In the default thread pool it
+holds the GIL next to the event loop, so every other guild waits on it. The extractors live in worker processes
+instead, one ``YoutubeDL`` per process that is built once when the process starts. The amount of extractions that
+run at once is bounded by the amount of workers, the others wait in a bounded queue, and the results are cached by
+the ID of the video.
+
+Daemonic processes cannot have children, so in one the extractors run in a thread pool instead.
+"""
+import asyncio
+import collections
+import concurrent.futures
+import multiprocessing
+import re
+import threading
+import time
+import typing
+
+from loguru import logger
+
+from utils.cache import InFlight, TTLCache
+
+YTDL_OPTIONS = {
+    "format": "bestaudio/best",
+    "restrictfilenames": True,
+    "noplaylist": True,
+    "nocheckcertificate": True,
+    "ignoreerrors": True,
+    "logtostderr": False,
+    "quiet": True,
+    "no_warnings": True,
+    "default_search": "auto",
+    "source_address": "0.0.0.0",
+}
+
+# the parts of the info that are not used by the bot and are large to send back from the worker.
+_DROPPED_KEYS = ("formats", "requested_formats", "thumbnails", "automatic_captions", "subtitles", "http_headers")
+
+_VIDEO_ID = re.compile(
+    r"(?:youtube\.com/(?:watch\?(?:.*&)?v=|embed/|shorts/|v/)|youtu\.be/)(?P<id>[\w-]{11})"
+)
+
+# the extractor of the worker, per thread, since a ``YoutubeDL`` is not safe to share between the threads of the
+# thread pool fallback.
+_local = threading.local()
+
+
+def _init_worker(options: dict) -> None:
+    # runs once in every worker, the extractor is reused by every extraction of the worker.
+    import youtube_dl
+
+    _local.ytdl = youtube_dl.YoutubeDL(options)
+
+
+def _extract(query: str, download: bool) -> typing.Tuple[typing.Optional[dict], float]:
+    # runs in a worker process, returns the info and how long the extraction took.
+    started = time.perf_counter()
+    info = _local.ytdl.extract_info(query, download=download)
+    if info:
+        info = {key: value for key, value in info.items() if key not in _DROPPED_KEYS}
+    return info, time.perf_counter() - started
+
+
+def cache_key(query: str) -> str:
+    """
+    A function that returns the key a query is cached by: the ID of the video for YouTube URLs, so every form of
+    the URL of a video shares its result, and the normalized query otherwise.
+
+    Parameters
+    ----------
+    query : str
+        The URL or the search query.
+
+    Returns
+    -------
+    str
+        The cache key.
+    """
+    match = _VIDEO_ID.search(query)
+    if match:
+        return f"youtube:{match.group('id')}"
+    return " ".join(query.split()).casefold()
+
+
+class ExtractorBusy(Exception):
+    """
+    An exception raised when the queue of the extractor pool is full.
+    """
+
+
+class ExtractorPool:
+    """
+    A class that runs youtube_dl extractions in a pool of worker processes.
+
+    Parameters
+    ----------
+    workers : int
+        The amount of worker processes, and of extractions that run at once.
+    max_pending : int
+        The maximum amount of extractions that wait for a worker, `ExtractorBusy` is raised after that.
+    cache_size : int
+        The maximum amount of cached results.
+    cache_ttl : float
+        How long results are cached, in seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 2,
+        max_pending: int = 32,
+        cache_size: int = 256,
+        cache_ttl: float = 3600.0,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+
+        self._executor: typing.Optional[concurrent.futures.Executor] = None
+        self._semaphore: typing.Optional[asyncio.Semaphore] = None
+        self._cache: TTLCache[str, typing.Optional[dict]] = TTLCache(cache_size, ttl=cache_ttl)
+        self._pending: InFlight[str, typing.Optional[dict]] = InFlight()
+        self.waiting = 0
+
+        # statistics, reported by the bot. Times are in milliseconds.
+        self.calls = 0
+        self.cache_hits = 0
+        self.rejected = 0
+        self.queue_waits: typing.Deque[float] = collections.deque(maxlen=100)
+        self.run_times: typing.Deque[float] = collections.deque(maxlen=100)
+
+    def _start(self) -> None:
+        if self._executor is None:
+            if multiprocessing.current_process().daemon:
+                logger.warning(
+                    "Running in a daemonic process, youtube_dl extractions run in threads instead of processes.",
+                    __name="Music Bot",
+                )
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="extractor",
+                    initializer=_init_worker,
+                    initargs=(YTDL_OPTIONS,),
+                )
+            else:
+                # spawned instead of forked, so the workers do not inherit the event loop and the threads of the bot.
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(YTDL_OPTIONS,),
+                )
+            self._semaphore = asyncio.Semaphore(self.workers)
+
+    def stats(self) -> dict:
+        """
+        A method that returns the statistics of the pool.
+        """
+        waits, runs = list(self.queue_waits), list(self.run_times)
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "rejected": self.rejected,
+            "waiting": self.waiting,
+            "average_wait": round(sum(waits) / len(waits), 1) if waits else 0.0,
+            "max_wait": round(max(waits), 1) if waits else 0.0,
+            "average_run": round(sum(runs) / len(runs), 1) if runs else 0.0,
+            "max_run": round(max(runs), 1) if runs else 0.0,
+        }
+
+    async def _run(self, key: str, query: str, download: bool) -> typing.Optional[dict]:
+        if self.waiting >= self.max_pending:
+            self.rejected += 1
+            raise ExtractorBusy("Too many videos are being looked up, try again in a moment.")
+
+        queued = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            wait = (time.perf_counter() - queued) * 1000
+            info, run = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _extract, query, download
+            )
+        finally:
+            self._semaphore.release()
+
+        self.queue_waits.append(wait)
+        self.run_times.append(run * 1000)
+        logger.debug(
+            f"Extracted {key!r} in {run * 1000:.0f} ms after waiting {wait:.0f} ms.", __name="Music Bot"
+        )
+        if not download:
+            self._cache[key] = info
+        return info
+
+    async def extract(self, query: str, *, download: bool = False) -> typing.Optional[dict]:
+        """
+        A method that extracts the info of a video, from the cache if it was extracted before.
+
+        Parameters
+        ----------
+        query : str
+            The URL of the video or a search query.
+        download : bool
+            Whether to download the video. Downloads are not cached.
+
+        Returns
+        -------
+        typing.Optional[dict]
+            The info of the video, without its formats, or None if it could not be extracted.
+
+        Raises
+        ------
+        ExtractorBusy
+            If too many extractions are waiting for a worker.
+        """
+        self._start()
+        self.calls += 1
+        key = cache_key(query)
+
+        if not download:
+            if key in self._cache:
+                self.cache_hits += 1
+                return self._cache.get(key)
+            return await self._pending.wait(key, lambda: self._run(key, query, download))
+
+        return await self._run(key, query, download)
+
+    def close(self) -> None:
+        """
+        A method that stops the workers.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -2,7 +2,6 @@
 import asyncio
 import datetime
 import functools
-import pathlib
 import random
 import sys
 import time
@@ -18,6 +17,7 @@ from loguru import logger
 
 import wavelink
 from utils.paginators import RichPager, ViewPages
+from utils.timer_wheel import TimedView
 from wavelink import Player
 
 
@@ -53,27 +53,69 @@ class BotInformation:
         `disnake.Embed`
             An embed containing information about the Lavalink node connected to the bot.
         """
-        player: Player = self.bot.wavelink.get_player(
-            guild_id=interaction.guild.id, cls=Player, context=interaction
-        )
-        node: wavelink.Node = player.node
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
+        node: wavelink.Node = player.node if player else self.bot.wavelink.get_best_node()
 
         used = humanize.naturalsize(node.stats.memory_used)
         total = humanize.naturalsize(node.stats.memory_allocated)
         free = humanize.naturalsize(node.stats.memory_free)
         cpu = node.stats.cpu_cores
+        clusters = await self.bot.cluster_stats()
+        players = sum(cluster["players"] for cluster in clusters)
+        health = await self.bot.cluster_node_health()
+        available = len([n for n in health if n["available"]])
+        gaps = [cluster["gaps"] for cluster in clusters if "gaps" in cluster]
+        gap_count = sum(stats["count"] for stats in gaps)
+        average_gap = f"{sum(stats['sum'] for stats in gaps) / gap_count:.0f} ms" if gap_count else "n/a"
+        max_gap = max((stats["max"] for stats in gaps), default=0.0)
+        local_gap = (player.average_gap if player else None) or 0
+        created = sum(cluster.get("players_created", 0) for cluster in clusters)
+        never_connected = sum(cluster.get("players_never_connected", 0) for cluster in clusters)
+        timers = [cluster["timers"] for cluster in clusters if "timers" in cluster]
+        scheduled = sum(stats["scheduled"] for stats in timers)
+        timer_lag = max((stats["max_lag"] for stats in timers), default=0.0)
 
         fmt = (
             f"**WaveLink:** `{wavelink.__version__}`\n\n"
             f"Connected to `{len(self.bot.wavelink.nodes)}` nodes.\n"
             f"Best available Node `{self.bot.wavelink.get_best_node().__repr__()}`\n"
-            f"`{len(self.bot.wavelink.players)}` players are distributed on nodes.\n"
+            f"`{players}` players are distributed on nodes across `{len(clusters)}` cluster(s).\n"
+            f"`{created}` players were created, `{never_connected}` of them never connected.\n"
+            f"`{scheduled}` timers are scheduled, the last ones fired at most `{timer_lag:.0f} ms` late.\n"
+            f"`{available}/{len(health)}` node connections are healthy.\n"
+            f"Average gap between tracks: `{average_gap}`, at most `{max_gap:.0f} ms` "
+            f"(`{local_gap:.0f} ms` in this server).\n"
             f"`{node.stats.players}` players are distributed on server.\n"
             f"`{node.stats.playing_players}` players are playing on server.\n\n"
             f"Server Memory: `{used}/{total}` | `({free} free)`\n"
             f"Server CPU: `{cpu}`\n\n"
             f"Server Uptime: `{humanize.precisedelta(datetime.timedelta(milliseconds=node.stats.uptime))}`"
         )
+
+        history = node.history
+        if len(history) > 1:
+            window = humanize.naturaldelta(
+                datetime.timedelta(seconds=history.window("time")[-1] - history.window("time")[0])
+            )
+            fmt += (
+                f"\n\n**Last {window}** (`{len(history)}` samples)\n"
+                f"CPU `{history.sparkline('system_load')}` "
+                f"avg `{history.mean('system_load'):.0%}` p95 `{history.percentile('system_load'):.0%}`\n"
+                f"Lavalink `{history.sparkline('lavalink_load')}` "
+                f"avg `{history.mean('lavalink_load'):.0%}` p95 `{history.percentile('lavalink_load'):.0%}`\n"
+                f"Memory `{history.sparkline('memory_used')}` "
+                f"`{humanize.naturalsize(abs(history.slope('memory_used')))}/min` "
+                f"{'up' if history.slope('memory_used') >= 0 else 'down'}\n"
+                f"Playing `{history.sparkline('playing_players')}` "
+                f"`{history.slope('playing_players'):+.2f}/min`"
+            )
+            if node.stats.frames_sent != -1:
+                fmt += (
+                    f"\nNulled frames `{history.sparkline('frames_nulled')}` "
+                    f"p95 `{history.percentile('frames_nulled'):.0f}`\n"
+                    f"Deficit frames `{history.sparkline('frames_deficit')}` "
+                    f"p95 `{history.percentile('frames_deficit'):.0f}`"
+                )
         embed = disnake.Embed(
             description=fmt,
             colour=disnake.Colour.random(),
@@ -107,49 +149,23 @@ class BotInformation:
         version = sys.version_info
         em = disnake.Embed(color=disnake.Colour.random())
 
-        # File Stats
-        def line_count() -> typing.Tuple[int, int, int, int, int, int]:
-            """
-            This function returns the number of lines in the bot's source code.
-
-            Returns
-            -------
-            tuple[int, int, int, int, int, int]
-                The number of lines in the codebase.
-            """
-            files = classes = funcs = comments = lines = letters = 0
-            p = pathlib.Path("./")
-            for f in p.rglob("*.py"):
-                files += 1
-                with f.open() as of:
-                    letters = sum(len(f.open().read()) for f in p.rglob("*.py"))
-                    for line in of.readlines():
-                        line = line.strip()
-                        if line.startswith("class"):
-                            classes += 1
-                        if line.startswith("def"):
-                            funcs += 1
-                        if line.startswith("async def"):
-                            funcs += 1
-                        if "#" in line:
-                            comments += 1
-                        lines += 1
-            return files, classes, funcs, comments, lines, letters
-
-        (
-            files,
-            classes,
-            funcs,
-            comments,
-            lines,
-            letters,
-        ) = await self.bot.loop.run_in_executor(None, line_count)
+        # File Stats, from the index that is kept up to date in the background.
+        stats = self.bot.source_stats.totals
+        files, funcs, lines, letters = (
+            self.bot.source_stats.files,
+            stats.functions,
+            stats.lines,
+            stats.letters,
+        )
+        clusters = await self.bot.cluster_stats()
         #
         em.add_field(
             name="Bot",
             value=f"""
-               {self.bot.icons['arrow']} **Guilds**: `{len(self.bot.guilds)}`
-               {self.bot.icons['arrow']} **Users**: `{len(self.bot.users)}`
+               {self.bot.icons['arrow']} **Guilds**: `{sum(cluster['guilds'] for cluster in clusters)}`
+               {self.bot.icons['arrow']} **Users**: `{sum(cluster['users'] for cluster in clusters)}`
+               {self.bot.icons['arrow']} **Clusters**: `{len(clusters)}`
+               {self.bot.icons['arrow']} **Views**: `{sum(cluster.get('views', 0) for cluster in clusters)}`
                {self.bot.icons['arrow']} **Commands**: `{len([cmd for cmd in list(self.bot.walk_commands())
                                                               if not cmd.hidden])}`""",
             inline=True,
@@ -349,6 +365,246 @@ class Config:
             sys.exit(1)
         return password
 
+    @property
+    def sync_incremental(self) -> bool:
+        """
+        This property returns whether slash commands should be synced per guild, only for the guilds that changed.
+        """
+        return bool(self.data.get("Sync", {}).get("incremental", False))
+
+    @property
+    def sync_state_file(self) -> str:
+        """
+        This property returns the path of the file where the hash of the last synced command tree is stored.
+        """
+        return self.data.get("Sync", {}).get(
+            "state_file", "./config/command_sync.json"
+        )
+
+    @property
+    def cluster_enabled(self) -> bool:
+        """
+        This property returns whether the bot should run in cluster mode.
+        """
+        return bool(self.data.get("Cluster", {}).get("enabled", False))
+
+    @property
+    def cluster_shard_count(self) -> int:
+        """
+        This property returns the total amount of shards across all clusters.
+        """
+        return int(self.data.get("Cluster", {}).get("shard_count", 1))
+
+    @property
+    def cluster_count(self) -> int:
+        """
+        This property returns the amount of clusters (worker processes) to run.
+        """
+        return int(self.data.get("Cluster", {}).get("clusters", 1))
+
+    @property
+    def cluster_ipc_path(self) -> str:
+        """
+        This property returns the path of the Unix socket the clusters talk through.
+        """
+        return self.data.get("Cluster", {}).get("ipc_path", "/tmp/musicbot-ipc.sock")
+
+    @property
+    def cache_profile(self) -> str:
+        """
+        This property returns the gateway intent and cache profile of the bot, either ``full`` or ``lean``.
+        """
+        return self.data.get("Cache", {}).get("profile", "full")
+
+    @property
+    def cache_max_messages(self) -> typing.Optional[int]:
+        """
+        This property returns the size of the message cache, or None to use the default of the cache profile.
+        """
+        return self.data.get("Cache", {}).get("max_messages")
+
+    @property
+    def journal_enabled(self) -> bool:
+        """
+        This property returns whether the state of the players is journaled to disk, to restore them after a restart.
+        """
+        return bool(self.data.get("Journal", {}).get("enabled", False))
+
+    @property
+    def journal_directory(self) -> str:
+        """
+        This property returns the directory the player journal is stored in.
+        """
+        return self.data.get("Journal", {}).get("directory", "./config/journal")
+
+    @property
+    def journal_flush_interval(self) -> float:
+        """
+        This property returns how often the player journal is written to disk, in seconds.
+        """
+        return float(self.data.get("Journal", {}).get("flush_interval", 1.0))
+
+    @property
+    def journal_snapshot_every(self) -> int:
+        """
+        This property returns after how many records the journal of a player is compacted into a snapshot.
+        """
+        return int(self.data.get("Journal", {}).get("snapshot_every", 256))
+
+    @property
+    def player_gc_interval(self) -> float:
+        """
+        This property returns how often the players that are not connected are garbage collected, in seconds.
+        """
+        return float(self.data.get("Players", {}).get("gc_interval", 60.0))
+
+    @property
+    def player_max_idle(self) -> float:
+        """
+        This property returns how long a player can stay disconnected before it is garbage collected, in seconds.
+        """
+        return float(self.data.get("Players", {}).get("max_idle", 300.0))
+
+    @property
+    def lyrics_directory(self) -> typing.Optional[str]:
+        """
+        This property returns the directory the lyrics are cached in on disk, None to only cache them in memory.
+        """
+        return self.data.get("Lyrics", {}).get("directory", "./config/lyrics")
+
+    @property
+    def lyrics_cache_size(self) -> int:
+        """
+        This property returns the maximum amount of songs whose lyrics are cached in memory.
+        """
+        return int(self.data.get("Lyrics", {}).get("cache_size", 256))
+
+    @property
+    def lyrics_ttl(self) -> float:
+        """
+        This property returns how long lyrics are cached, in seconds.
+        """
+        return float(self.data.get("Lyrics", {}).get("ttl", 604800.0))
+
+    @property
+    def lyrics_negative_ttl(self) -> float:
+        """
+        This property returns how long it is cached that a song has no lyrics, in seconds.
+        """
+        return float(self.data.get("Lyrics", {}).get("negative_ttl", 3600.0))
+
+    @property
+    def lyrics_disk_size(self) -> int:
+        """
+        This property returns the maximum amount of songs whose lyrics are cached on disk.
+        """
+        return int(self.data.get("Lyrics", {}).get("disk_size", 5000))
+
+    @property
+    def lyrics_timeout(self) -> float:
+        """
+        This property returns the timeout of a lyrics lookup, in seconds.
+        """
+        return float(self.data.get("Lyrics", {}).get("timeout", 10.0))
+
+    @property
+    def lyrics_prefetch(self) -> bool:
+        """
+        This property returns whether the lyrics of the next track of a queue are looked up before it plays.
+        """
+        return bool(self.data.get("Lyrics", {}).get("prefetch", True))
+
+    @property
+    def extractor_workers(self) -> int:
+        """
+        This property returns the amount of youtube_dl worker processes.
+        """
+        return int(self.data.get("Extractor", {}).get("workers", 2))
+
+    @property
+    def extractor_max_pending(self) -> int:
+        """
+        This property returns how many youtube_dl extractions can wait for a worker.
+        """
+        return int(self.data.get("Extractor", {}).get("max_pending", 32))
+
+    @property
+    def extractor_cache_size(self) -> int:
+        """
+        This property returns the maximum amount of cached youtube_dl results.
+        """
+        return int(self.data.get("Extractor", {}).get("cache_size", 256))
+
+    @property
+    def extractor_cache_ttl(self) -> float:
+        """
+        This property returns how long youtube_dl results are cached, in seconds.
+        """
+        return float(self.data.get("Extractor", {}).get("cache_ttl", 3600.0))
+
+    @property
+    def search_concurrency(self) -> int:
+        """
+        This property returns how many YouTube searches of the /youtube commands are sent at once.
+        """
+        return int(self.data.get("Search", {}).get("concurrency", 2))
+
+    @property
+    def search_cache_size(self) -> int:
+        """
+        This property returns the maximum amount of cached YouTube searches.
+        """
+        return int(self.data.get("Search", {}).get("cache_size", 256))
+
+    @property
+    def search_cache_ttl(self) -> float:
+        """
+        This property returns how long YouTube searches are cached, in seconds.
+        """
+        return float(self.data.get("Search", {}).get("cache_ttl", 600.0))
+
+    @property
+    def suggestions_per_guild(self) -> int:
+        """
+        This property returns the maximum amount of recent tracks of a guild suggested by /play.
+        """
+        return int(self.data.get("Suggestions", {}).get("per_guild", 50))
+
+    @property
+    def suggestions_global_size(self) -> int:
+        """
+        This property returns the maximum amount of recent tracks of the bot suggested by /play.
+        """
+        return int(self.data.get("Suggestions", {}).get("global_size", 1000))
+
+    @property
+    def suggestions_search(self) -> bool:
+        """
+        This property returns whether the suggestions of /play fall back to a Lavalink search.
+        """
+        return bool(self.data.get("Suggestions", {}).get("search", True))
+
+    @property
+    def suggestions_debounce(self) -> float:
+        """
+        This property returns how long a user must stop typing before a suggestion search is sent, in seconds.
+        """
+        return float(self.data.get("Suggestions", {}).get("debounce", 0.3))
+
+    @property
+    def suggestions_timeout(self) -> float:
+        """
+        This property returns how long the suggestions of /play wait for a search, in seconds.
+        """
+        return float(self.data.get("Suggestions", {}).get("timeout", 1.2))
+
+    @property
+    def suggestions_search_ttl(self) -> float:
+        """
+        This property returns how long the suggestion searches are cached, in seconds.
+        """
+        return float(self.data.get("Suggestions", {}).get("search_ttl", 600.0))
+
 
 class LyricsPaginator(ViewPages):
     """
@@ -398,7 +654,7 @@ ServiceOptions = commands.option_enum(
 )
 
 
-class BotInformationView(disnake.ui.View):
+class BotInformationView(TimedView):
     def __init__(
         self,
         interaction: disnake.ApplicationCommandInteraction,
@@ -570,7 +826,7 @@ def executor_function(sync_function: typing.Callable):
     return sync_wrapper
 
 
-class ErrorView(disnake.ui.View):
+class ErrorView(TimedView):
     """
     A view that displays an error message.
     """
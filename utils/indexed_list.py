@@ -0,0 +1,435 @@
+#  -*- coding: utf-8 -*-
+"""
+A list-like container with fast positional access, used as the storage of the music queue.
+"""
+import itertools
+import typing
+
+T = typing.TypeVar("T")
+
+
+class IndexedList(typing.Generic[T]):
+    """
+    A list that is split into chunks of at most ``2 * load`` items, with a Fenwick tree over the chunk sizes.
+
+    Finding the chunk of a position takes O(log c) for c chunks, and inserting or removing an item inside a chunk only
+    shifts that chunk. Chunks are split when they grow too big and merged with a neighbour when they get too small,
+    which rebuilds the Fenwick tree, but that only happens once every ``load`` operations on the same chunk.
+    Because of this, positional insert, delete and move are O(log n) amortized, and a slice of k items is O(log n + k).
+
+    It implements the parts of the `collections.deque` API that `asyncio.Queue` relies on (``append``, ``popleft``
+    and ``len``), so it can be used as the storage of a queue.
+
+    If a ``weight`` function is passed, the sum of the weights of every chunk is kept in a second Fenwick tree, so the
+    total weight is O(1) and the weight of the items before a position, like the duration of the tracks before a
+    track, is O(log n + load).
+
+    Parameters
+    ----------
+    iterable : typing.Iterable[T]
+        The initial items of the list.
+    load : int
+        The target size of a chunk.
+    weight : typing.Optional[typing.Callable[[T], int]]
+        A function that returns the weight of an item.
+    """
+
+    def __init__(
+        self,
+        iterable: typing.Iterable[T] = (),
+        *,
+        load: int = 256,
+        weight: typing.Optional[typing.Callable[[T], int]] = None,
+    ):
+        self._load = load
+        self._weight = weight or (lambda item: 0)
+        self._chunks: typing.List[typing.List[T]] = []
+        self._weights: typing.List[int] = []
+        self._tree: typing.List[int] = [0]
+        self._weight_tree: typing.List[int] = [0]
+        self._len = 0
+        self._total_weight = 0
+        self.extend(iterable)
+
+    # Fenwick trees over the chunk sizes and weights.
+
+    @staticmethod
+    def _build(values: typing.Iterable[int]) -> typing.List[int]:
+        tree = [0, *values]
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        return tree
+
+    def _rebuild(self) -> None:
+        self._tree = self._build(len(chunk) for chunk in self._chunks)
+        self._weight_tree = self._build(self._weights)
+        self._total_weight = sum(self._weights)
+
+    @staticmethod
+    def _update(tree: typing.List[int], chunk_index: int, delta: int) -> None:
+        index = chunk_index + 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def _add(self, chunk_index: int, delta: int, weight: int = 0) -> None:
+        self._update(self._tree, chunk_index, delta)
+        if weight:
+            self._update(self._weight_tree, chunk_index, weight)
+            self._weights[chunk_index] += weight
+            self._total_weight += weight
+
+    def _chunk_weight(self, chunk: typing.List[T]) -> int:
+        return sum(map(self._weight, chunk))
+
+    def _locate(self, index: int) -> typing.Tuple[int, int]:
+        """Returns the chunk that holds the item at ``index``, and the offset of the item in that chunk."""
+        position, remaining = 0, index
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            nxt = position + step
+            if nxt < len(self._tree) and self._tree[nxt] <= remaining:
+                position = nxt
+                remaining -= self._tree[nxt]
+            step >>= 1
+        return position, remaining
+
+    def _normalize(self, index: int, *, insert: bool = False) -> int:
+        if index < 0:
+            index += self._len
+        if insert:
+            return min(max(index, 0), self._len)
+        if not 0 <= index < self._len:
+            raise IndexError("IndexedList index out of range")
+        return index
+
+    # Chunk maintenance.
+
+    def _split(self, chunk_index: int) -> None:
+        chunk = self._chunks[chunk_index]
+        if len(chunk) > 2 * self._load:
+            pieces = [chunk[start: start + self._load] for start in range(0, len(chunk), self._load)]
+            self._chunks[chunk_index: chunk_index + 1] = pieces
+            self._weights[chunk_index: chunk_index + 1] = [self._chunk_weight(piece) for piece in pieces]
+            self._rebuild()
+
+    def _shrink(self, chunk_index: int) -> None:
+        chunk = self._chunks[chunk_index]
+        if not chunk:
+            del self._chunks[chunk_index]
+            del self._weights[chunk_index]
+            self._rebuild()
+        elif len(chunk) < self._load // 2 and len(self._chunks) > 1:
+            neighbour = chunk_index - 1 if chunk_index > 0 else chunk_index + 1
+            first, second = sorted((chunk_index, neighbour))
+            self._chunks[first: second + 1] = [self._chunks[first] + self._chunks[second]]
+            self._weights[first: second + 1] = [self._weights[first] + self._weights[second]]
+            self._rebuild()
+            self._split(first)
+
+    # Sequence API.
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __iter__(self) -> typing.Iterator[T]:
+        return itertools.chain.from_iterable(self._chunks)
+
+    def __reversed__(self) -> typing.Iterator[T]:
+        return (item for chunk in reversed(self._chunks) for item in reversed(chunk))
+
+    def __repr__(self) -> str:
+        return f"IndexedList({list(self)!r})"
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self._len)
+            if step == 1:
+                return list(self.iter_range(start, stop))
+            return [self[index] for index in range(start, stop, step)]
+
+        chunk_index, offset = self._locate(self._normalize(item))
+        return self._chunks[chunk_index][offset]
+
+    def __setitem__(self, index: int, value: T) -> None:
+        chunk_index, offset = self._locate(self._normalize(index))
+        chunk = self._chunks[chunk_index]
+        self._add(chunk_index, 0, self._weight(value) - self._weight(chunk[offset]))
+        chunk[offset] = value
+
+    def __delitem__(self, item) -> None:
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self._len)
+            if step == 1:
+                self.remove_range(start, stop)
+                return
+            for index in sorted(range(start, stop, step), reverse=True):
+                self.pop(index)
+            return
+
+        self.pop(item)
+
+    def iter_range(self, start: int, stop: int) -> typing.Iterator[T]:
+        """
+        A method that iterates over the items from ``start`` up to ``stop``, without copying the rest of the list.
+
+        Parameters
+        ----------
+        start : int
+            The position of the first item.
+        stop : int
+            The position after the last item.
+        """
+        start, stop = max(start, 0), min(stop, self._len)
+        if start >= stop:
+            return
+        remaining = stop - start
+        chunk_index, offset = self._locate(start)
+        while remaining > 0:
+            chunk = self._chunks[chunk_index]
+            part = chunk[offset: offset + remaining]
+            yield from part
+            remaining -= len(part)
+            chunk_index, offset = chunk_index + 1, 0
+
+    def insert(self, index: int, value: T) -> None:
+        """
+        A method that inserts an item before the given position.
+
+        Parameters
+        ----------
+        index : int
+            The position to insert the item at.
+        value : T
+            The item to insert.
+        """
+        index = self._normalize(index, insert=True)
+        if not self._chunks:
+            self._chunks.append([])
+            self._weights.append(0)
+            self._rebuild()
+
+        if index == self._len:
+            chunk_index, offset = len(self._chunks) - 1, len(self._chunks[-1])
+        else:
+            chunk_index, offset = self._locate(index)
+        self._chunks[chunk_index].insert(offset, value)
+        self._add(chunk_index, 1, self._weight(value))
+        self._len += 1
+        self._split(chunk_index)
+
+    def append(self, value: T) -> None:
+        """
+        A method that adds an item to the end of the list.
+        """
+        self.insert(self._len, value)
+
+    def appendleft(self, value: T) -> None:
+        """
+        A method that adds an item to the start of the list.
+        """
+        self.insert(0, value)
+
+    def extend(self, iterable: typing.Iterable[T]) -> None:
+        """
+        A method that adds many items to the end of the list.
+        """
+        items = list(iterable)
+        if not items:
+            return
+        self._len += len(items)
+        if self._chunks:
+            items = self._chunks.pop() + items
+            self._weights.pop()
+        pieces = [items[start: start + self._load] for start in range(0, len(items), self._load)]
+        self._chunks.extend(pieces)
+        self._weights.extend(self._chunk_weight(piece) for piece in pieces)
+        self._rebuild()
+
+    def insert_many(self, index: int, iterable: typing.Iterable[T]) -> None:
+        """
+        A method that inserts many items before the given position, splicing them into a single chunk.
+
+        Parameters
+        ----------
+        index : int
+            The position to insert the items at.
+        iterable : typing.Iterable[T]
+            The items to insert.
+        """
+        items = list(iterable)
+        if not items:
+            return
+        index = self._normalize(index, insert=True)
+        if index == self._len:
+            self.extend(items)
+            return
+
+        chunk_index, offset = self._locate(index)
+        self._chunks[chunk_index][offset:offset] = items
+        self._add(chunk_index, len(items), self._chunk_weight(items))
+        self._len += len(items)
+        self._split(chunk_index)
+
+    def pop(self, index: int = -1) -> T:
+        """
+        A method that removes and returns the item at the given position.
+
+        Parameters
+        ----------
+        index : int
+            The position of the item, the last item by default.
+
+        Raises
+        ------
+        IndexError
+            If the list is empty or the position is out of range.
+        """
+        if not self._len:
+            raise IndexError("pop from an empty IndexedList")
+        chunk_index, offset = self._locate(self._normalize(index))
+        value = self._chunks[chunk_index].pop(offset)
+        self._add(chunk_index, -1, -self._weight(value))
+        self._len -= 1
+        self._shrink(chunk_index)
+        return value
+
+    def popleft(self) -> T:
+        """
+        A method that removes and returns the first item.
+        """
+        return self.pop(0)
+
+    def remove_range(self, start: int, stop: int) -> typing.List[T]:
+        """
+        A method that removes the items from ``start`` up to ``stop``.
+        Whole chunks inside the range are dropped at once, so this is O(log n + k) for k removed items.
+
+        Parameters
+        ----------
+        start : int
+            The position of the first item to remove.
+        stop : int
+            The position after the last item to remove.
+
+        Returns
+        -------
+        typing.List[T]
+            The removed items.
+        """
+        start, stop = max(start, 0), min(stop, self._len)
+        if start >= stop:
+            return []
+
+        first, first_offset = self._locate(start)
+        last, last_offset = self._locate(stop - 1)
+        if first == last:
+            chunk = self._chunks[first]
+            removed = chunk[first_offset: last_offset + 1]
+            del chunk[first_offset: last_offset + 1]
+        else:
+            head, tail = self._chunks[first], self._chunks[last]
+            removed = head[first_offset:]
+            for chunk in self._chunks[first + 1: last]:
+                removed.extend(chunk)
+            removed.extend(tail[: last_offset + 1])
+            del head[first_offset:]
+            del tail[: last_offset + 1]
+            del self._chunks[first + 1: last]
+            del self._weights[first + 1: last]
+            # the tail chunk is now right after the head chunk.
+            self._weights[first + 1] = self._chunk_weight(tail)
+        self._weights[first] = self._chunk_weight(self._chunks[first])
+
+        kept = [index for index, chunk in enumerate(self._chunks) if chunk]
+        self._chunks = [self._chunks[index] for index in kept]
+        self._weights = [self._weights[index] for index in kept]
+        self._len -= len(removed)
+        self._rebuild()
+        if self._chunks:
+            self._shrink(min(first, len(self._chunks) - 1))
+        return removed
+
+    def move(self, source: int, destination: int) -> T:
+        """
+        A method that moves the item at ``source`` so it ends up at ``destination``.
+
+        Parameters
+        ----------
+        source : int
+            The current position of the item.
+        destination : int
+            The position the item should have after the move.
+
+        Returns
+        -------
+        T
+            The moved item.
+        """
+        source = self._normalize(source)
+        destination = self._normalize(destination)
+        value = self.pop(source)
+        self.insert(destination, value)
+        return value
+
+    def index(self, value: T) -> int:
+        """
+        A method that returns the position of the first occurrence of an item.
+
+        Raises
+        ------
+        ValueError
+            If the item is not in the list.
+        """
+        for position, item in enumerate(self):
+            if item == value:
+                return position
+        raise ValueError(f"{value!r} is not in IndexedList")
+
+    def clear(self) -> None:
+        """
+        A method that removes every item.
+        """
+        self._chunks.clear()
+        self._weights.clear()
+        self._tree = [0]
+        self._weight_tree = [0]
+        self._len = 0
+        self._total_weight = 0
+
+    @property
+    def total_weight(self) -> int:
+        """
+        The sum of the weights of every item.
+        """
+        return self._total_weight
+
+    def weight_before(self, index: int) -> int:
+        """
+        A method that returns the sum of the weights of the items before a position.
+
+        Parameters
+        ----------
+        index : int
+            The position, clamped to the length of the list.
+
+        Returns
+        -------
+        int
+            The sum of the weights of the items from the start up to, but not including ``index``.
+        """
+        index = self._normalize(index, insert=True)
+        if index == self._len:
+            return self._total_weight
+
+        chunk_index, offset = self._locate(index)
+        total, position = 0, chunk_index
+        while position > 0:
+            total += self._weight_tree[position]
+            position -= position & -position
+        return total + self._chunk_weight(self._chunks[chunk_index][:offset])
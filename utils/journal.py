@@ -0,0 +1,412 @@
+#  -*- coding: utf-8 -*-
+"""
+A durable journal of the state of the music players, used to restore them after the bot restarts.
+
+Every player has an append-only log of its queue mutations, ``<guild_id>.log``, and a compacted snapshot,
+``<guild_id>.snap``. Records are buffered in memory and written by a background task every ``flush_interval``
+seconds, with one fsync per log file, so the play path never waits on the disk. Once a player has logged
+``snapshot_every`` records, its live state is written as a new snapshot and its log is truncated.
+
+Tracks are stored as compact blobs, ``[track_id, requester_id]``, where the track ID is the Base64 track that
+Lavalink already encodes the track info into. They are decoded back into tracks with a single batched request.
+"""
+import asyncio
+import json
+import os
+import time
+import typing
+
+from loguru import logger
+
+TrackBlob = typing.List[typing.Any]
+
+
+def track_blob(track) -> TrackBlob:
+    """
+    A function that returns the compact blob of a track that is stored in the journal.
+
+    Parameters
+    ----------
+    track : Track
+        The track.
+
+    Returns
+    -------
+    TrackBlob
+        The Base64 track ID and the ID of the requester of the track.
+    """
+    requester = getattr(track, "requester", None)
+    return [track.id, getattr(requester, "id", None)]
+
+
+def _encode(record: dict) -> bytes:
+    return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def replay(snapshot: typing.Optional[dict], records: typing.Iterable[dict]) -> dict:
+    """
+    A function that applies the records of a log on top of a snapshot.
+
+    Parameters
+    ----------
+    snapshot : typing.Optional[dict]
+        The last snapshot of the player, if there is one.
+    records : typing.Iterable[dict]
+        The records that were logged after the snapshot.
+
+    Returns
+    -------
+    dict
+        The state of the player.
+    """
+    state = {
+        "queue": [],
+        "now": None,
+        "position": 0,
+        "volume": 100,
+        "loop": False,
+        "filter": None,
+        "channel": None,
+        "text": None,
+        "dj": None,
+    }
+    state.update(snapshot or {})
+    queue = state["queue"]
+
+    for record in records:
+        op = record["op"]
+        if op == "put":
+            queue.extend(record["t"])
+        elif op == "ins":
+            if "ts" in record:
+                queue[record["i"]: record["i"]] = record["ts"]
+            else:
+                queue.insert(record["i"], record["t"])
+        elif op == "del":
+            del queue[record["i"]]
+        elif op == "range":
+            del queue[record["s"]: record["e"]]
+        elif op == "move":
+            queue.insert(record["d"], queue.pop(record["s"]))
+        elif op == "clear":
+            queue.clear()
+        elif op == "get":
+            if queue:
+                queue.pop(0)
+        elif op == "play":
+            state["now"], state["position"] = record["t"], record.get("s", 0)
+        elif op == "pos":
+            state["position"] = record["p"]
+        elif op == "state":
+            state.update(record["d"])
+
+    return state
+
+
+class PlayerJournal:
+    """
+    A class that journals the state of the music players to disk.
+
+    Parameters
+    ----------
+    directory : str
+        The directory the journal files are stored in.
+    flush_interval : float
+        How often the buffered records are written and fsynced, in seconds.
+    snapshot_every : int
+        After how many records of a player its log is compacted into a snapshot.
+    position_interval : float
+        How often the position of a playing player is recorded, in seconds.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        flush_interval: float = 1.0,
+        snapshot_every: int = 256,
+        position_interval: float = 10.0,
+    ):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        self.position_interval = position_interval
+
+        self.players: typing.Dict[int, typing.Any] = {}
+        self._pending: typing.Dict[int, typing.List[bytes]] = {}
+        self._since_snapshot: typing.Dict[int, int] = {}
+        self._snapshot_requested: typing.Set[int] = set()
+        self._discarded: typing.Set[int] = set()
+        self._last_position: typing.Dict[int, float] = {}
+        self._task: typing.Optional[asyncio.Task] = None
+        # only one write runs at a time, a write keeps running in the executor when its flush is cancelled.
+        self._lock = asyncio.Lock()
+        self._writing: typing.Optional[asyncio.Future] = None
+
+        # statistics, used to measure the write amplification of the journal.
+        self.records = 0
+        self.logical_bytes = 0
+        self.written_bytes = 0
+        self.fsyncs = 0
+        self.snapshots = 0
+        self.restore_time = 0.0
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, guild_id: int, suffix: str) -> str:
+        return os.path.join(self.directory, f"{guild_id}.{suffix}")
+
+    @property
+    def write_amplification(self) -> float:
+        """
+        The amount of bytes written to disk, logs and snapshots, for every byte of records.
+        """
+        return self.written_bytes / self.logical_bytes if self.logical_bytes else 0.0
+
+    def stats(self) -> dict:
+        """
+        A method that returns the statistics of the journal.
+        """
+        return {
+            "players": len(self.players),
+            "records": self.records,
+            "logical_bytes": self.logical_bytes,
+            "written_bytes": self.written_bytes,
+            "write_amplification": round(self.write_amplification, 2),
+            "fsyncs": self.fsyncs,
+            "snapshots": self.snapshots,
+            "restore_time": round(self.restore_time, 3),
+        }
+
+    def attach(self, player) -> None:
+        """
+        A method that registers a player, so its snapshots and position can be taken from its live state.
+
+        Parameters
+        ----------
+        player : Player
+            The player to journal.
+        """
+        self.players[player.guild_id] = player
+        self._discarded.discard(player.guild_id)
+        # a fresh snapshot replaces whatever an earlier player of the guild left behind.
+        self._snapshot_requested.add(player.guild_id)
+
+    def record(self, guild_id: int, op: str, **data) -> None:
+        """
+        A method that buffers a record of a player. It does not touch the disk.
+
+        Parameters
+        ----------
+        guild_id : int
+            The guild ID of the player.
+        op : str
+            The operation, one of ``put``, ``ins``, ``del``, ``range``, ``move``, ``clear``, ``get``, ``play``,
+            ``pos`` and ``state``.
+        data : typing.Any
+            The data of the operation.
+        """
+        if guild_id not in self.players:
+            return
+        line = _encode({"op": op, **data})
+        self._pending.setdefault(guild_id, []).append(line)
+        self._since_snapshot[guild_id] = self._since_snapshot.get(guild_id, 0) + 1
+        self.records += 1
+        self.logical_bytes += len(line)
+
+    def request_snapshot(self, guild_id: int) -> None:
+        """
+        A method that makes the next flush write a snapshot of a player, for changes that are cheaper to snapshot
+        than to log, like a shuffle.
+        """
+        self._snapshot_requested.add(guild_id)
+
+    def discard(self, guild_id: int) -> None:
+        """
+        A method that stops journaling a player and deletes its journal, when the player is torn down.
+        """
+        self.players.pop(guild_id, None)
+        self._pending.pop(guild_id, None)
+        self._since_snapshot.pop(guild_id, None)
+        self._snapshot_requested.discard(guild_id)
+        self._last_position.pop(guild_id, None)
+        self._discarded.add(guild_id)
+
+    def snapshot_of(self, player) -> dict:
+        """
+        A method that builds the snapshot of the live state of a player.
+        """
+        filters = getattr(player, "filters", None)
+        context = getattr(player, "context", None)
+        channel = getattr(player, "channel", None)
+        dj = getattr(player, "dj", None)
+        return {
+            "queue": [track_blob(track) for track in player.queue],
+            "now": track_blob(player.current) if player.current else None,
+            "position": int(player.position),
+            "volume": player.volume,
+            "loop": player.loop,
+            "filter": filters.payload if filters else None,
+            "channel": player.channel_id,
+            "text": getattr(channel or getattr(context, "channel", None), "id", None),
+            "dj": getattr(dj, "id", None),
+        }
+
+    def _record_positions(self) -> None:
+        now = time.monotonic()
+        for guild_id, player in self.players.items():
+            if not player.is_playing or player.is_paused:
+                continue
+            if now - self._last_position.get(guild_id, 0.0) < self.position_interval:
+                continue
+            self._last_position[guild_id] = now
+            self.record(guild_id, "pos", p=int(player.position))
+
+    async def flush(self) -> None:
+        """
+        A method that writes the buffered records to disk, and the snapshots that are due.
+        """
+        async with self._lock:
+            if self._writing is not None and not self._writing.done():
+                await asyncio.wait({self._writing})
+            await self._flush()
+
+    async def _flush(self) -> None:
+        self._record_positions()
+
+        pending, self._pending = self._pending, {}
+        discarded, self._discarded = self._discarded, set()
+        snapshots: typing.Dict[int, bytes] = {}
+
+        for guild_id, player in self.players.items():
+            if (
+                guild_id in self._snapshot_requested
+                or self._since_snapshot.get(guild_id, 0) >= self.snapshot_every
+            ):
+                # the snapshot is taken from the live state, so it already contains every pending record.
+                snapshots[guild_id] = json.dumps(
+                    self.snapshot_of(player), separators=(",", ":")
+                ).encode("utf-8")
+                pending.pop(guild_id, None)
+                self._since_snapshot[guild_id] = 0
+        self._snapshot_requested.clear()
+
+        if not pending and not snapshots and not discarded:
+            return
+
+        self._writing = asyncio.get_running_loop().run_in_executor(
+            None, self._write, pending, snapshots, discarded
+        )
+        # shielded, a cancelled flush must not mark the write as done while it is still running.
+        await asyncio.shield(self._writing)
+
+    def _write(
+        self,
+        pending: typing.Dict[int, typing.List[bytes]],
+        snapshots: typing.Dict[int, bytes],
+        discarded: typing.Set[int],
+    ) -> None:
+        for guild_id in discarded:
+            for suffix in ("log", "snap"):
+                try:
+                    os.remove(self._path(guild_id, suffix))
+                except FileNotFoundError:
+                    pass
+
+        for guild_id, data in snapshots.items():
+            path = self._path(guild_id, "snap")
+            with open(f"{path}.tmp", mode="wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(f"{path}.tmp", path)
+            # the snapshot contains everything in the log, so the log can be truncated.
+            open(self._path(guild_id, "log"), mode="wb").close()
+            self.written_bytes += len(data)
+            self.fsyncs += 1
+            self.snapshots += 1
+
+        for guild_id, lines in pending.items():
+            data = b"".join(lines)
+            with open(self._path(guild_id, "log"), mode="ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self.written_bytes += len(data)
+            self.fsyncs += 1
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except OSError as e:
+                logger.error(f"Failed to flush the player journal: {e}", __name="Music Bot")
+
+    def start(self) -> None:
+        """
+        A method that starts the background flush task.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """
+        A method that stops the background flush task and flushes everything that is still buffered, after the
+        write of the cancelled task has finished.
+        """
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+        # the stats are passed as an argument, loguru formats the message and would read the braces of the dict.
+        logger.info("Player journal closed: {}", self.stats(), __name="Music Bot")
+
+    def guild_ids(self) -> typing.List[int]:
+        """
+        A method that returns the guild IDs of every journaled player.
+        """
+        guild_ids = set()
+        for name in os.listdir(self.directory):
+            guild_id, _, suffix = name.partition(".")
+            if suffix in ("log", "snap") and guild_id.isdigit():
+                guild_ids.add(int(guild_id))
+        return sorted(guild_ids)
+
+    def load(self, guild_id: int) -> typing.Optional[dict]:
+        """
+        A method that reads the snapshot and the log of a player and replays them.
+
+        Parameters
+        ----------
+        guild_id : int
+            The guild ID of the player.
+
+        Returns
+        -------
+        typing.Optional[dict]
+            The state of the player, or None if it has no journal.
+        """
+        snapshot, records = None, []
+        try:
+            with open(self._path(guild_id, "snap"), mode="rb") as f:
+                snapshot = json.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            logger.warning(f"Ignoring corrupt snapshot of {guild_id}: {e}", __name="Music Bot")
+
+        try:
+            with open(self._path(guild_id, "log"), mode="rb") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # a torn write at the end of the log, everything before it is still valid.
+                        break
+        except FileNotFoundError:
+            pass
+
+        if snapshot is None and not records:
+            return None
+        return replay(snapshot, records)
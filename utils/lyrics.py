@@ -0,0 +1,390 @@
+#  -*- coding: utf-8 -*-
+"""
+The lyrics of the tracks, fetched from a provider and cached in memory and on disk.
+
+Titles of YouTube uploads rarely are the title of the song, so they are normalized first: tags like
+"(Official Video)" or "[HD]", featured artists and the channel name in front of the title are stripped. The
+normalized title and artist are the key of the caches, so the uploads of the same song share their lyrics.
+
+Lyrics are kept in an LRU cache with a TTL, as the pages the paginator shows, and written to disk so they survive
+restarts. The directory is pruned every so many writes, of the expired files and of the oldest files over its limit. A miss is cached too, for a shorter time, so a song without lyrics is not looked up on every button
+press. Concurrent lookups of the same song wait on a single request.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+import typing
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
+from loguru import logger
+
+from utils.cache import InFlight, TTLCache
+from utils.paginators import WrapText
+
+# the tags that are stripped from the titles, when they are in parentheses or brackets.
+_TAGS = (
+    r"official|video|audio|lyrics?|lyric video|visuali[sz]er|music video|mv|hd|hq|4k|explicit|clean|"
+    r"remaster(ed)?|live|color coded|full version|topic"
+)
+_BRACKETED = re.compile(rf"[(\[【]([^)\]】]*\b({_TAGS})\b[^)\]】]*)[)\]】]", re.IGNORECASE)
+_FEATURING = re.compile(r"\s[(\[]?\b(ft|feat|featuring)\b\.?.*$", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+class LyricsError(Exception):
+    """
+    An exception raised by a `LyricsProvider` when the lyrics could not be looked up, as opposed to a song
+    that has no lyrics.
+    """
+
+
+def normalize_title(title: str, artist: str = "") -> typing.Tuple[str, str]:
+    """
+    A function that turns the title and the uploader of a track into the title and the artist of the song.
+
+    Parameters
+    ----------
+    title : str
+        The title of the track, e.g. "Artist - Song (Official Video) [HD]".
+    artist : str
+        The author of the track, e.g. "Artist - Topic" or "ArtistVEVO".
+
+    Returns
+    -------
+    typing.Tuple[str, str]
+        The title and the artist, e.g. ("Song", "Artist").
+    """
+    artist = re.sub(r"\s*-\s*topic$|vevo$", "", artist or "", flags=re.IGNORECASE).strip()
+
+    title = _BRACKETED.sub("", title or "")
+    if " - " in title:
+        # "Artist - Song" uploads, the part in front is a better artist than the channel name.
+        front, _, title = title.partition(" - ")
+        artist = front.strip() or artist
+    title = _FEATURING.sub("", title)
+    title = _SPACES.sub(" ", title).strip(" -|\"'")
+    artist = _FEATURING.sub("", artist).strip()
+    return title, artist
+
+
+def lyrics_key(title: str, artist: str = "") -> str:
+    """
+    A function that returns the cache key of the lyrics of a track.
+    """
+    title, artist = normalize_title(title, artist)
+    return f"{title}\x00{artist}".casefold()
+
+
+class LyricsProvider:
+    """
+    The interface of the services the lyrics are looked up from.
+    """
+
+    name = "provider"
+
+    async def fetch(self, title: str, artist: str) -> typing.Optional[str]:
+        """
+        A method that looks up the lyrics of a song.
+
+        Parameters
+        ----------
+        title : str
+            The normalized title of the song.
+        artist : str
+            The normalized artist of the song.
+
+        Returns
+        -------
+        typing.Optional[str]
+            The lyrics, or None if the song has no lyrics.
+
+        Raises
+        ------
+        LyricsError
+            If the lyrics could not be looked up, e.g. the service is down. This is not cached.
+        """
+        raise NotImplementedError
+
+
+class SomeRandomAPIProvider(LyricsProvider):
+    """
+    A provider that looks the lyrics up from some-random-api.
+
+    Parameters
+    ----------
+    session : ClientSession
+        The HTTP session of the bot.
+    timeout : float
+        The timeout of a lookup, in seconds.
+    """
+
+    name = "some-random-api"
+    url = "https://some-random-api.ml/lyrics"
+
+    def __init__(self, session: ClientSession, *, timeout: float = 10.0):
+        self.session = session
+        self.timeout = ClientTimeout(total=timeout)
+
+    async def fetch(self, title: str, artist: str) -> typing.Optional[str]:
+        try:
+            async with self.session.get(
+                self.url, params={"title": f"{title} {artist}".strip()}, timeout=self.timeout
+            ) as resp:
+                if resp.status in (400, 404):
+                    return None
+                if resp.status != 200:
+                    raise LyricsError(f"{self.name} returned {resp.status}")
+                data = await resp.json(content_type=None)
+        except (ClientError, asyncio.TimeoutError) as e:
+            raise LyricsError(f"{self.name} failed: {e!r}") from e
+        except ValueError as e:
+            raise LyricsError(f"{self.name} returned invalid JSON: {e}") from e
+        if not isinstance(data, dict):
+            raise LyricsError(f"{self.name} returned an unexpected response")
+        return data.get("lyrics") or None
+
+
+class LocalLyricsProvider(LyricsProvider):
+    """
+    A provider that looks the lyrics up from a dictionary, a stand-in for a real service when testing.
+
+    Parameters
+    ----------
+    lyrics : typing.Dict[typing.Tuple[str, str], str]
+        The lyrics of every song, by (title, artist) as they are passed to `fetch`.
+    """
+
+    name = "local"
+
+    def __init__(self, lyrics: typing.Dict[typing.Tuple[str, str], str]):
+        self.lyrics = {(title.casefold(), artist.casefold()): text for (title, artist), text in lyrics.items()}
+        self.requests = 0
+
+    async def fetch(self, title: str, artist: str) -> typing.Optional[str]:
+        self.requests += 1
+        return self.lyrics.get((title.casefold(), artist.casefold()))
+
+
+class LyricsService:
+    """
+    A class that looks up the lyrics of tracks, and caches them.
+
+    Parameters
+    ----------
+    provider : LyricsProvider
+        The service the lyrics are looked up from.
+    directory : typing.Optional[str]
+        The directory the lyrics are cached in on disk, None to only cache them in memory.
+    max_size : int
+        The maximum amount of songs cached in memory.
+    ttl : float
+        How long lyrics are cached, in seconds.
+    negative_ttl : float
+        How long it is cached that a song has no lyrics, in seconds.
+    page_length : int
+        The length the lyrics are wrapped at, for the pages of the paginator.
+    prefetch : bool
+        Whether the lyrics of the next track of a queue are looked up before it plays.
+    max_files : int
+        The maximum amount of songs cached on disk.
+    """
+
+    # how many lyrics are written to disk between two prunes of the directory.
+    prune_every = 100
+
+    def __init__(
+        self,
+        provider: LyricsProvider,
+        *,
+        directory: typing.Optional[str] = None,
+        max_size: int = 256,
+        ttl: float = 7 * 24 * 3600.0,
+        negative_ttl: float = 3600.0,
+        page_length: int = 1000,
+        prefetch: bool = True,
+        max_files: int = 5000,
+    ):
+        self.provider = provider
+        self.directory = directory
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.page_length = page_length
+        self.prefetch_enabled = prefetch
+        self.max_files = max_files
+        self._writes = 0
+
+        # the wrapped pages of the lyrics of every song, or None for the songs without lyrics.
+        self._cache: TTLCache[str, typing.Optional[typing.List[str]]] = TTLCache(max_size, ttl=ttl)
+        self._pending: InFlight[str, typing.Optional[typing.List[str]]] = InFlight()
+        # the running prefetches, referenced so they are not garbage collected before they finish.
+        self._prefetches: typing.Set[asyncio.Future] = set()
+
+        # statistics, reported by the bot.
+        self.hits = 0
+        self.disk_hits = 0
+        self.fetches = 0
+        self.errors = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def stats(self) -> dict:
+        """
+        A method that returns the statistics of the lyrics cache.
+        """
+        return {
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "fetches": self.fetches,
+            "errors": self.errors,
+        }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json")
+
+    def _read(self, key: str) -> typing.Optional[str]:
+        try:
+            with open(self._path(key), mode="r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("key") != key or data.get("expires", 0) <= time.time():
+            # expired, or a file of another song with the same hash, it is written again after the lookup.
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            return None
+        return data["lyrics"]
+
+    def _write(self, key: str, lyrics: str) -> None:
+        path = self._path(key)
+        try:
+            with open(f"{path}.tmp", mode="w", encoding="utf-8") as f:
+                json.dump({"key": key, "lyrics": lyrics, "expires": time.time() + self.ttl}, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            logger.warning(f"Failed to cache lyrics on disk: {e}", __name="Music Bot")
+            return
+
+        # the first write prunes what is left from before a restart.
+        if self._writes % self.prune_every == 0:
+            self.prune()
+        self._writes += 1
+
+    def prune(self) -> int:
+        """
+        A method that removes the expired lyrics from the disk cache, and the oldest ones over `max_files`. The
+        files are written once, so their modification time is when they were cached. It blocks on the disk, so
+        run it in an executor from the event loop.
+
+        Returns
+        -------
+        int
+            The amount of removed files.
+        """
+        if not self.directory:
+            return 0
+        files = []
+        expired = time.time() - self.ttl
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    try:
+                        files.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"Failed to prune the lyrics cache: {e}", __name="Music Bot")
+            return 0
+
+        files.sort()
+        excess = len(files) - self.max_files
+        removed = 0
+        for index, (mtime, path) in enumerate(files):
+            if mtime > expired and index >= excess:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                continue
+        if removed:
+            logger.debug(f"Pruned {removed} lyrics from the disk cache.", __name="Music Bot")
+        return removed
+
+    async def _load(self, key: str, title: str, artist: str) -> typing.Optional[typing.List[str]]:
+        loop = asyncio.get_running_loop()
+        lyrics = None
+        if self.directory:
+            lyrics = await loop.run_in_executor(None, self._read, key)
+            if lyrics is not None:
+                self.disk_hits += 1
+
+        if lyrics is None:
+            self.fetches += 1
+            lyrics = await self.provider.fetch(title, artist)
+            if lyrics is None:
+                self._cache.set(key, None, ttl=self.negative_ttl)
+                return None
+            if self.directory:
+                await loop.run_in_executor(None, self._write, key, lyrics)
+
+        pages = WrapText(lyrics, length=self.page_length)
+        self._cache.set(key, pages)
+        return pages
+
+    async def pages(self, track) -> typing.Optional[typing.List[str]]:
+        """
+        A method that returns the lyrics of a track, wrapped into the pages of the paginator.
+
+        Parameters
+        ----------
+        track : Track
+            The track.
+
+        Returns
+        -------
+        typing.Optional[typing.List[str]]
+            The pages, or None if the track has no lyrics or they could not be looked up.
+        """
+        title, artist = normalize_title(track.title, track.author)
+        key = lyrics_key(track.title, track.author)
+
+        if key in self._cache:
+            self.hits += 1
+            return self._cache.get(key)
+
+        try:
+            return await self._pending.wait(key, lambda: self._load(key, title, artist))
+        except LyricsError as e:
+            self.errors += 1
+            logger.warning(f"Failed to look up the lyrics of {track.title!r}: {e}", __name="Music Bot")
+            return None
+        except Exception:
+            # a bug of a provider must not break the lyrics commands, nor leave a prefetch with an unseen error.
+            self.errors += 1
+            logger.exception(f"Failed to look up the lyrics of {track.title!r}", __name="Music Bot")
+            return None
+
+    def prefetch(self, track) -> None:
+        """
+        A method that looks up the lyrics of a track in the background, e.g. the next track of a queue, so they
+        are cached when someone asks for them.
+
+        Parameters
+        ----------
+        track : Track
+            The track.
+        """
+        if not self.prefetch_enabled or track is None or getattr(track, "is_stream", False):
+            return
+        if lyrics_key(track.title, track.author) in self._cache:
+            return
+        task = asyncio.ensure_future(self.pages(track))
+        self._prefetches.add(task)
+        task.add_done_callback(self._prefetches.discard)
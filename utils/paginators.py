@@ -10,9 +10,10 @@ import disnake
 
 from utils import menus
 from utils.menus import ListPageSource
+from utils.timer_wheel import TimedView
 
 
-class ViewPages(disnake.ui.View):
+class ViewPages(TimedView):
     """
     A view paginator that can be used to display a list of items in embeds as pages.
     """
@@ -339,7 +340,7 @@ class RichPager(menus.ListPageSource):
         return menu.embed  # type: ignore
 
 
-class EmbedPaginator(disnake.ui.View):
+class EmbedPaginator(TimedView):
     """
     A paginator that displays a list of embeds.
     """
@@ -570,6 +571,42 @@ class EmbedPaginator(disnake.ui.View):
         self.message = await self.ctx.edit_original_message(embed=embed, view=self)
 
 
+class LazyEmbeds(typing.Sequence[disnake.Embed]):
+    """
+    A sequence of embeds that are built from their entries when they are first shown, so a paginator does not
+    build every page up front. Built embeds are kept, so going back to a page does not build it again.
+
+    Parameters
+    ----------
+    entries : typing.Sequence[typing.Any]
+        The entries of the pages.
+    build : typing.Callable[[typing.Any], disnake.Embed]
+        The function that builds the embed of an entry.
+    """
+
+    def __init__(
+        self,
+        entries: typing.Sequence[typing.Any],
+        build: typing.Callable[[typing.Any], disnake.Embed],
+    ):
+        self.entries = entries
+        self.build = build
+        self._embeds: typing.Dict[int, disnake.Embed] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        embed = self._embeds.get(index)
+        if embed is None:
+            embed = self._embeds[index] = self.build(self.entries[index])
+        return embed
+
+
 class SimpleEmbedPages(EmbedPaginator):
     """
     A simple pagination session.
@@ -0,0 +1,111 @@
+#  -*- coding: utf-8 -*-
+"""
+Shuffling helpers of the music queue.
+
+Both shuffles work on a plain list copy of the queue, so they are O(n) whatever the queue is stored in.
+Running this module benchmarks them:
+
+    python -m utils.shuffle
+"""
+import itertools
+import random
+import time
+import typing
+
+T = typing.TypeVar("T")
+
+
+def shuffled(items: typing.Iterable[T]) -> typing.List[T]:
+    """
+    A function that returns the items in a random order.
+
+    Parameters
+    ----------
+    items : typing.Iterable[T]
+        The items to shuffle.
+
+    Returns
+    -------
+    typing.List[T]
+        A new list with the shuffled items.
+    """
+    items = list(items)
+    random.shuffle(items)
+    return items
+
+
+def fair_shuffled(
+    items: typing.Iterable[T], key: typing.Callable[[T], typing.Hashable]
+) -> typing.List[T]:
+    """
+    A function that shuffles the items of every group, and then interleaves the groups one item at a time,
+    so a group with many items does not take over the start of the result.
+
+    Parameters
+    ----------
+    items : typing.Iterable[T]
+        The items to shuffle.
+    key : typing.Callable[[T], typing.Hashable]
+        A function that returns the group of an item, for example the requester of a track.
+
+    Returns
+    -------
+    typing.List[T]
+        A new list with the shuffled items.
+    """
+    groups: typing.Dict[typing.Hashable, typing.List[T]] = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+
+    # the n-th item of every group plays in the n-th round, and the groups take their turns in a random order within
+    # every round. The round and the turn are packed into one integer, so the result is a single sort of the items by
+    # their key, instead of a list per round.
+    turns = list(range(len(groups)))
+    random.shuffle(turns)
+    width = len(groups)
+
+    ordered: typing.List[T] = []
+    keys: typing.List[int] = []
+    for turn, group in zip(turns, groups.values()):
+        random.shuffle(group)
+        ordered.extend(group)
+        keys.extend(range(turn, turn + len(group) * width, width))
+
+    return [ordered[index] for index in sorted(range(len(ordered)), key=keys.__getitem__)]
+
+
+def requester_key(track) -> typing.Hashable:
+    """
+    A function that returns the ID of the requester of a track, used to group tracks for a fair shuffle.
+    """
+    requester = getattr(track, "requester", None)
+    return getattr(requester, "id", requester)
+
+
+def main() -> None:
+    from utils.indexed_list import IndexedList
+
+    class _Track:
+        __slots__ = ("requester",)
+
+        def __init__(self, requester: int):
+            self.requester = requester
+
+    for size in (10_000, 100_000, 1_000_000):
+        # one user with half of the queue, and many users with a few tracks each.
+        tracks = IndexedList(
+            _Track(0 if index % 2 else index % 500) for index in range(size)
+        )
+        for name, function in (
+            ("shuffle", lambda: shuffled(tracks)),
+            ("fair shuffle", lambda: fair_shuffled(tracks, requester_key)),
+        ):
+            start = time.perf_counter()
+            result = function()
+            tracks.clear()
+            tracks.extend(result)
+            print(f"{name:>12} {size:>9,} tracks: {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
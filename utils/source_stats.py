@@ -0,0 +1,177 @@
+#  -*- coding: utf-8 -*-
+"""
+An index of the statistics of the source code of the bot, shown by the info commands.
+
+The statistics of every file are kept with its modification time, so a refresh only stats the files and re-reads
+the ones that changed, e.g. a cog that was hot reloaded. The totals are kept up to date as files are re-read, so
+the commands read them without touching the disk.
+"""
+import asyncio
+import os
+import typing
+
+from loguru import logger
+
+
+class FileStats(typing.NamedTuple):
+    """
+    The statistics of a source file.
+    """
+
+    classes: int = 0
+    functions: int = 0
+    comments: int = 0
+    lines: int = 0
+    letters: int = 0
+
+    def __add__(self, other: "FileStats") -> "FileStats":
+        return FileStats(*(a + b for a, b in zip(self, other)))
+
+    def __sub__(self, other: "FileStats") -> "FileStats":
+        return FileStats(*(a - b for a, b in zip(self, other)))
+
+
+def file_stats(path: str) -> FileStats:
+    """
+    A function that counts the classes, functions, comments, lines and letters of a source file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    Returns
+    -------
+    FileStats
+        The statistics of the file.
+    """
+    classes = functions = comments = lines = 0
+    with open(path, mode="r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("class"):
+            classes += 1
+        if line.startswith("def") or line.startswith("async def"):
+            functions += 1
+        if "#" in line:
+            comments += 1
+        lines += 1
+    return FileStats(classes, functions, comments, lines, len(text))
+
+
+class SourceStatsIndex:
+    """
+    A class that keeps the statistics of the source files of the bot.
+
+    Parameters
+    ----------
+    root : str
+        The directory the source files are searched in.
+    suffix : str
+        The suffix of the source files.
+    """
+
+    def __init__(self, root: str = "./", suffix: str = ".py"):
+        self.root = root
+        self.suffix = suffix
+        self.totals = FileStats()
+        self._files: typing.Dict[str, typing.Tuple[int, FileStats]] = {}
+        self._task: typing.Optional[asyncio.Task] = None
+
+        # statistics of the last refresh, how many files were re-read out of how many were checked.
+        self.refreshes = 0
+        self.last_checked = 0
+        self.last_read = 0
+
+    @property
+    def files(self) -> int:
+        """
+        The amount of indexed source files.
+        """
+        return len(self._files)
+
+    def _walk(self) -> typing.Iterator[os.DirEntry]:
+        directories = [self.root]
+        while directories:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    if entry.name.startswith(".") or entry.name == "__pycache__":
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(entry.path)
+                    elif entry.name.endswith(self.suffix):
+                        yield entry
+
+    def refresh(self) -> bool:
+        """
+        A method that re-reads the source files that were added or changed since the last refresh, and forgets the
+        ones that were removed. It blocks on the disk, so run it in an executor from the event loop.
+
+        Returns
+        -------
+        bool
+            Whether any file changed.
+        """
+        seen = set()
+        checked = read = 0
+        totals = self.totals
+
+        for entry in self._walk():
+            checked += 1
+            seen.add(entry.path)
+            try:
+                mtime = entry.stat().st_mtime_ns
+            except OSError:
+                continue
+            cached = self._files.get(entry.path)
+            if cached and cached[0] == mtime:
+                continue
+            try:
+                stats = file_stats(entry.path)
+            except OSError as e:
+                logger.warning(f"Failed to read {entry.path}: {e}", __name="Music Bot")
+                continue
+            read += 1
+            if cached:
+                totals -= cached[1]
+            totals += stats
+            self._files[entry.path] = (mtime, stats)
+
+        removed = [path for path in self._files if path not in seen]
+        for path in removed:
+            totals -= self._files.pop(path)[1]
+
+        self.totals = totals
+        self.refreshes += 1
+        self.last_checked, self.last_read = checked, read
+        return bool(read or removed)
+
+    async def _run(self, interval: float) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, self.refresh)
+            except OSError as e:
+                logger.error(f"Failed to refresh the source statistics: {e}", __name="Music Bot")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float = 300.0) -> None:
+        """
+        A method that starts the background task that refreshes the index, the first refresh runs right away.
+
+        Parameters
+        ----------
+        interval : float
+            How often the index is refreshed, in seconds.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(interval))
+
+    def close(self) -> None:
+        """
+        A method that stops the background task.
+        """
+        if self._task:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,289 @@
+#  -*- coding: utf-8 -*-
+"""
+A hierarchical timer wheel, the single scheduler of the idle disconnects, vote expiries and view timeouts of the bot.
+
+Instead of one sleeping task or ``call_later`` handle per timer, timers are kept in buckets of a few wheels and a
+single task advances the wheels once per tick. Scheduling and cancelling a timer are O(1): a timer is put in the
+bucket of the wheel that covers its delay, and cancelling it removes it from that bucket. When a lower wheel wraps
+around, the next bucket of the wheel above is cascaded down, so every timer is moved at most once per wheel.
+"""
+import asyncio
+import collections
+import inspect
+import math
+import time
+import typing
+
+import disnake
+from loguru import logger
+
+
+class Timer:
+    """
+    A timer scheduled on a `TimerWheel`.
+
+    Parameters
+    ----------
+    wheel : TimerWheel
+        The wheel the timer is scheduled on.
+    deadline : float
+        The monotonic time the timer is due at.
+    callback : typing.Callable
+        The function that is called when the timer fires. If it returns an awaitable, it is run as a task.
+    args : typing.Any
+        The arguments of the callback.
+    """
+
+    __slots__ = ("wheel", "deadline", "callback", "args", "_bucket")
+
+    def __init__(self, wheel: "TimerWheel", deadline: float, callback: typing.Callable, args: tuple):
+        self.wheel = wheel
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self._bucket: typing.Optional[dict] = None
+
+    def __repr__(self) -> str:
+        return f"<Timer deadline={self.deadline:.1f} callback={self.callback!r} active={self.active}>"
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether the timer is still scheduled.
+        """
+        return self._bucket is not None
+
+    def cancel(self) -> None:
+        """
+        A method that cancels the timer, if it has not fired yet.
+        """
+        if self._bucket is not None:
+            del self._bucket[self]
+            self._bucket = None
+            self.wheel.scheduled -= 1
+
+
+class TimerWheel:
+    """
+    A hierarchical timer wheel.
+
+    Parameters
+    ----------
+    tick : float
+        The resolution of the wheel, in seconds. Timers fire at most one tick late.
+    slots : int
+        The amount of buckets of every wheel.
+    levels : int
+        The amount of wheels. The wheels cover ``tick * slots ** levels`` seconds, timers that are due later are
+        cascaded again until they are due.
+    clock : typing.Callable[[], float]
+        The monotonic clock the deadlines are measured with, `time.monotonic` by default.
+    """
+
+    def __init__(
+        self,
+        tick: float = 0.5,
+        slots: int = 64,
+        levels: int = 3,
+        *,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock
+
+        self._wheels: typing.List[typing.List[dict]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._origin = clock()
+        self._current = 0
+        self._task: typing.Optional[asyncio.Task] = None
+
+        # statistics, reported by the bot.
+        self.scheduled = 0
+        self.fired = 0
+        self.lags: typing.Deque[float] = collections.deque(maxlen=1000)
+
+    def _insert(self, timer: Timer, earliest: int) -> None:
+        due = max(math.ceil((timer.deadline - self._origin) / self.tick), earliest)
+        delta = due - self._current
+
+        for level in range(self.levels):
+            span = self.slots ** (level + 1)
+            if delta < span or level == self.levels - 1:
+                if delta >= span:
+                    # further out than the wheels reach, it is cascaded again when this bucket comes up.
+                    due = self._current + span - 1
+                bucket = self._wheels[level][(due // self.slots ** level) % self.slots]
+                bucket[timer] = None
+                timer._bucket = bucket
+                return
+
+    def schedule(self, delay: float, callback: typing.Callable, *args: typing.Any) -> Timer:
+        """
+        A method that schedules a callback.
+
+        Parameters
+        ----------
+        delay : float
+            In how many seconds the callback is called.
+        callback : typing.Callable
+            The function to call. If it returns an awaitable, it is run as a task.
+        args : typing.Any
+            The arguments of the callback.
+
+        Returns
+        -------
+        Timer
+            The timer, which can be cancelled.
+        """
+        timer = Timer(self, self.clock() + delay, callback, args)
+        # the bucket of the current tick was already fired, so the earliest bucket is the next one.
+        self._insert(timer, self._current + 1)
+        self.scheduled += 1
+        return timer
+
+    def _fire(self, timer: Timer, now: float) -> None:
+        self.fired += 1
+        self.lags.append(max(now - timer.deadline, 0.0) * 1000)
+        try:
+            result = timer.callback(*timer.args)
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(result).add_done_callback(lambda task: self._done(timer, task))
+        except Exception as e:
+            logger.error(f"Timer {timer!r} failed: {e}", __name="Music Bot")
+
+    @staticmethod
+    def _done(timer: Timer, task: asyncio.Future) -> None:
+        # retrieves the exception of an awaitable callback, so it is logged instead of being reported as never
+        # retrieved when the task is garbage collected.
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Timer {timer!r} failed: {task.exception()}", __name="Music Bot")
+
+    def advance(self, now: typing.Optional[float] = None) -> None:
+        """
+        A method that advances the wheels up to the given time, and fires every timer that is due.
+
+        Parameters
+        ----------
+        now : typing.Optional[float]
+            The monotonic time to advance to, the current time by default.
+        """
+        now = self.clock() if now is None else now
+        target = math.floor((now - self._origin) / self.tick)
+
+        while self._current < target:
+            self._current += 1
+
+            # the highest wheel that wrapped around is cascaded first, so its timers can land in the buckets of the
+            # lower wheels that are cascaded or fired in this same tick.
+            wrapped = 0
+            while wrapped + 1 < self.levels and self._current % self.slots ** (wrapped + 1) == 0:
+                wrapped += 1
+            for level in range(wrapped, 0, -1):
+                bucket = self._wheels[level][(self._current // self.slots ** level) % self.slots]
+                timers = list(bucket)
+                bucket.clear()
+                for timer in timers:
+                    self._insert(timer, self._current)
+
+            bucket = self._wheels[0][self._current % self.slots]
+            timers = list(bucket)
+            bucket.clear()
+            for timer in timers:
+                timer._bucket = None
+                if timer.deadline > now:
+                    # a timer cascaded from the overflow bucket that is not due yet.
+                    self._insert(timer, self._current + 1)
+                    continue
+                self.scheduled -= 1
+                self._fire(timer, now)
+
+    async def _run(self) -> None:
+        while True:
+            next_tick = self._origin + (self._current + 1) * self.tick
+            await asyncio.sleep(max(next_tick - self.clock(), 0))
+            self.advance()
+
+    def start(self) -> None:
+        """
+        A method that starts the task that advances the wheels.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def close(self) -> None:
+        """
+        A method that stops the task that advances the wheels. Scheduled timers do not fire anymore.
+        """
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> dict:
+        """
+        A method that returns the amount of scheduled and fired timers, and how late the last timers fired.
+        """
+        lags = list(self.lags)
+        return {
+            "scheduled": self.scheduled,
+            "fired": self.fired,
+            "average_lag": round(sum(lags) / len(lags), 1) if lags else 0.0,
+            "max_lag": round(max(lags), 1) if lags else 0.0,
+        }
+
+
+# `TimedView` overrides private hooks of `disnake.ui.View`. disnake is installed from its master branch, so when a
+# version renames them, the views fall back to the timeouts of disnake instead of never timing out.
+_VIEW_HOOKS = all(hasattr(disnake.ui.View, name) for name in ("_start_listening_from_store", "_scheduled_task"))
+if not _VIEW_HOOKS:
+    logger.warning(
+        "disnake.ui.View has no _start_listening_from_store/_scheduled_task, view timeouts are left to disnake.",
+        __name="Music Bot",
+    )
+
+
+class TimedView(disnake.ui.View):
+    """
+    A view whose timeout is a timer on the timer wheel of the bot, instead of a task per view.
+    The timer is scheduled when the view starts listening, refreshed on every interaction and cancelled when the
+    view stops. If the bot has no timer wheel, the timeout is left to disnake.
+
+    This relies on the private ``_start_listening_from_store`` and ``_scheduled_task`` hooks of
+    ``disnake.ui.View``, check them when upgrading disnake.
+
+    Parameters
+    ----------
+    timeout : typing.Optional[float]
+        The timeout of the view, in seconds. None means there is no timeout.
+    """
+
+    def __init__(self, *, timeout: typing.Optional[float] = 180.0):
+        super().__init__(timeout=None if _VIEW_HOOKS else timeout)
+        self.wheel_timeout = timeout
+        self._timers: typing.Optional[TimerWheel] = None
+        self._timer: typing.Optional[Timer] = None
+
+    def _schedule_timeout(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+        if self._timers and self.wheel_timeout:
+            self._timer = self._timers.schedule(self.wheel_timeout, self._dispatch_timeout)
+
+    def _start_listening_from_store(self, store) -> None:
+        self._timers = getattr(store._state._get_client(), "timers", None)
+        if self._timers is None:
+            self.timeout = self.wheel_timeout
+        super()._start_listening_from_store(store)
+        self._schedule_timeout()
+
+    async def _scheduled_task(self, item, interaction: disnake.MessageInteraction):
+        self._schedule_timeout()
+        await super()._scheduled_task(item, interaction)
+
+    def stop(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        super().stop()
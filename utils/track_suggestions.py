@@ -0,0 +1,266 @@
+#  -*- coding: utf-8 -*-
+"""
+The suggestions of the ``query`` option of ``/play``.
+
+The tracks that were played or picked recently are kept per guild and for the whole bot, and the autocomplete
+matches what the user typed against their titles without leaving the process. When too few of them match, the
+query can be searched on Lavalink, but only after the user stopped typing for a moment and only for as long as the
+latency budget allows, the search keeps running in the background and its results are cached for the next
+keystroke.
+
+The value of a suggestion is the URI of its track. The resolved track is remembered by its URI, so ``/play`` plays a
+picked suggestion without searching Lavalink again.
+"""
+import asyncio
+import time
+import typing
+
+from loguru import logger
+
+import wavelink
+from utils.cache import InFlight, LRUCache, TTLCache
+
+# the limits of the autocomplete choices of Discord.
+MAX_CHOICES = 25
+MAX_LENGTH = 100
+
+SearchFunc = typing.Callable[[str], typing.Awaitable[typing.Any]]
+
+
+class Suggestion(typing.NamedTuple):
+    """
+    A resolved track that can be suggested.
+    """
+
+    id: str
+    info: dict
+    # the lowercased title and author, what the query is matched against.
+    text: str
+
+    @property
+    def uri(self) -> str:
+        return self.info["uri"]
+
+    @property
+    def label(self) -> str:
+        """
+        The name of the choice, the title and the author of the track.
+        """
+        label = f"{self.info.get('title', 'Unknown')} - {self.info.get('author', 'Unknown')}"
+        return label if len(label) <= MAX_LENGTH else label[: MAX_LENGTH - 1] + "…"
+
+
+class TrackSuggestions:
+    """
+    A class that suggests tracks for what a user is typing.
+
+    Parameters
+    ----------
+    per_guild : int
+        The maximum amount of recent tracks of a guild.
+    global_size : int
+        The maximum amount of recent tracks of the bot.
+    search_fallback : bool
+        Whether queries with too few recent matches are searched on Lavalink.
+    debounce : float
+        How long the user must stop typing before a query is searched, in seconds.
+    timeout : float
+        How long the autocomplete waits for a search, in seconds.
+    search_ttl : float
+        How long the results of a search are cached, in seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        per_guild: int = 50,
+        global_size: int = 1000,
+        search_fallback: bool = True,
+        debounce: float = 0.3,
+        timeout: float = 1.2,
+        search_ttl: float = 600.0,
+    ):
+        self.per_guild = per_guild
+        self.search_fallback = search_fallback
+        self.debounce = debounce
+        self.timeout = timeout
+
+        # the resolved tracks by their URI, every suggestion is one of these.
+        self._tracks: LRUCache[str, Suggestion] = LRUCache(global_size * 2)
+        self._global: LRUCache[str, Suggestion] = LRUCache(global_size)
+        self._guilds: typing.Dict[int, LRUCache[str, Suggestion]] = {}
+        self._searches: TTLCache[str, typing.List[Suggestion]] = TTLCache(256, ttl=search_ttl)
+        self._pending: InFlight[str, typing.List[Suggestion]] = InFlight()
+        # the last query of every user, a query is not searched if the user typed on after it.
+        self._latest: LRUCache[int, str] = LRUCache(1024)
+
+        # statistics, reported by the bot. Times are in milliseconds.
+        self.lookups = 0
+        self.resolved = 0
+        self.searches = 0
+        self.search_timeouts = 0
+        self.last_lookup = 0.0
+
+    def stats(self) -> dict:
+        """
+        A method that returns the statistics of the suggestions.
+        """
+        return {
+            "lookups": self.lookups,
+            "resolved": self.resolved,
+            "searches": self.searches,
+            "search_timeouts": self.search_timeouts,
+            "last_lookup": round(self.last_lookup, 3),
+            "tracks": len(self._tracks),
+        }
+
+    def _remember(self, track: wavelink.Track) -> typing.Optional[Suggestion]:
+        uri = track.info.get("uri")
+        if not uri or len(uri) > MAX_LENGTH or track.is_stream:
+            # the URI is the value of the choice, which is limited to 100 characters.
+            return None
+        text = f"{track.info.get('title', '')} {track.info.get('author', '')}".lower()
+        suggestion = self._tracks[uri] = Suggestion(track.id, track.info, text)
+        return suggestion
+
+    def record(self, guild_id: int, track: wavelink.Track) -> None:
+        """
+        A method that records a track that was played or picked in a guild.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        track : wavelink.Track
+            The track.
+        """
+        suggestion = self._remember(track)
+        if suggestion is None:
+            return
+        guild = self._guilds.get(guild_id)
+        if guild is None:
+            guild = self._guilds[guild_id] = LRUCache(self.per_guild)
+        guild[suggestion.uri] = suggestion
+        self._global[suggestion.uri] = suggestion
+
+    def forget_guild(self, guild_id: int) -> None:
+        """
+        A method that forgets the recent tracks of a guild, e.g. when the bot leaves it.
+        """
+        self._guilds.pop(guild_id, None)
+
+    def resolve(self, query: str) -> typing.Optional[Suggestion]:
+        """
+        A method that returns the resolved track of a suggestion that was picked.
+
+        Parameters
+        ----------
+        query : str
+            The query of ``/play``, the URI of the track if a suggestion was picked.
+
+        Returns
+        -------
+        typing.Optional[Suggestion]
+            The track, or None if the query is not a remembered URI.
+        """
+        suggestion = self._tracks.get(query)
+        if suggestion is not None:
+            self.resolved += 1
+        return suggestion
+
+    def _local(self, guild_id: typing.Optional[int], words: typing.List[str]) -> typing.Dict[str, Suggestion]:
+        found: typing.Dict[str, Suggestion] = {}
+        # the longest word rules out most tracks with a single substring check, the others are only checked after it.
+        words = sorted(words, key=len, reverse=True)
+        first, rest = (words[0], words[1:]) if words else ("", [])
+        # the tracks of the guild first, then the tracks of the bot, the most recent first.
+        sources = [self._guilds.get(guild_id), self._global]
+        for source in sources:
+            if source is None:
+                continue
+            for uri, suggestion in reversed(source.items()):
+                text = suggestion.text
+                if first in text and uri not in found and (not rest or all(word in text for word in rest)):
+                    found[uri] = suggestion
+                    if len(found) >= MAX_CHOICES:
+                        return found
+        return found
+
+    async def _request(self, key: str, query: str, search: SearchFunc) -> typing.List[Suggestion]:
+        self.searches += 1
+        tracks = await search(query)
+        if isinstance(tracks, wavelink.TrackPlaylist):
+            tracks = tracks.tracks
+        suggestions = [found for found in map(self._remember, (tracks or [])[:MAX_CHOICES]) if found]
+        self._searches.set(key, suggestions)
+        return suggestions
+
+    async def _search(self, key: str, query: str, search: SearchFunc) -> typing.List[Suggestion]:
+        cached = self._searches.get(key)
+        if cached is not None:
+            return cached
+        future = self._pending.start(key, lambda: self._request(key, query, search))
+        try:
+            # shielded, so a search that runs over the budget still fills the cache for the next keystroke.
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.search_timeouts += 1
+        except Exception as e:
+            # the suggestions are shown without the results of the search.
+            logger.debug("Autocomplete search for {!r} failed: {}", key, e, __name="Music Bot")
+        return []
+
+    async def suggest(
+        self,
+        user_input: str,
+        *,
+        guild_id: typing.Optional[int],
+        user_id: int,
+        search: typing.Optional[SearchFunc] = None,
+        prefix: str = "ytsearch",
+    ) -> typing.Dict[str, str]:
+        """
+        A method that returns the suggestions for what a user typed.
+
+        Parameters
+        ----------
+        user_input : str
+            What the user typed.
+        guild_id : typing.Optional[int]
+            The ID of the guild, its recent tracks are suggested first.
+        user_id : int
+            The ID of the user, used to debounce the searches.
+        search : typing.Optional[SearchFunc]
+            The Lavalink search, e.g. ``Client.get_tracks``. Nothing is searched if it is None.
+        prefix : str
+            The search prefix of the service, e.g. ``scsearch``.
+
+        Returns
+        -------
+        typing.Dict[str, str]
+            The choices, the label of a track by its URI.
+        """
+        started = time.perf_counter()
+        self.lookups += 1
+        found = self._local(guild_id, user_input.lower().split())
+        self.last_lookup = (time.perf_counter() - started) * 1000
+
+        query = " ".join(user_input.split())
+        if (
+            self.search_fallback
+            and search is not None
+            and len(found) < MAX_CHOICES // 5
+            and len(query) >= 3
+            and not query.startswith(("http://", "https://"))
+        ):
+            key = f"{prefix}:{query.casefold()}"
+            self._latest[user_id] = key
+            if key not in self._searches:
+                await asyncio.sleep(self.debounce)
+            if self._latest.get(user_id) == key:
+                for suggestion in await self._search(key, f"{prefix}:{query}", search):
+                    if len(found) >= MAX_CHOICES:
+                        break
+                    found.setdefault(suggestion.uri, suggestion)
+
+        return {suggestion.label: uri for uri, suggestion in found.items()}
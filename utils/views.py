@@ -1,5 +1,6 @@
 #  -*- coding: utf-8 -*-
 import datetime
+import time
 from typing import List
 
 import disnake
@@ -9,6 +10,7 @@ from disnake import MessageInteraction
 import wavelink
 from core.MusicBot import Bot
 from utils.MusicPlayerInteraction import Player, Track
+from utils.timer_wheel import TimedView
 
 
 class Filter(disnake.ui.Select["FilterView"]):
@@ -34,6 +36,13 @@ class Filter(disnake.ui.Select["FilterView"]):
             disnake.SelectOption(
                 label="ExtremeBass", description="ExtremeBass Filter.", emoji="🟩"
             ),
+            *(
+                disnake.SelectOption(label=name, description=f"{name} Equalizer.", emoji="🎚️")
+                for name in wavelink.EQ_CURVES
+            ),
+            disnake.SelectOption(
+                label="Reset", description="Remove every filter.", emoji="⬜"
+            ),
         ]
 
         super().__init__(
@@ -55,21 +64,18 @@ class Filter(disnake.ui.Select["FilterView"]):
             The interaction object.
         """
 
-        await interaction.response.send_message(f"Filter set to {self.values[0]}.")
-        extreme_bass = wavelink.BaseFilter.build_from_channel_mix(
-            left_to_right=1.0, right_to_left=3.0, right_to_right=8.8, left_to_left=9.0
-        )
-        eqs = {
-            "Tremolo": wavelink.BaseFilter.tremolo(),
-            "Karaoke": wavelink.BaseFilter.karaoke(),
-            "8D": wavelink.BaseFilter.Eight_D_Audio(),
-            "Vibrato": wavelink.BaseFilter.vibrato(),
-            "ExtremeBass": extreme_bass,
-        }  # you can make your own custom Filters and pass it here.
-        await self.player.set_filter(eqs[self.values[0]])
+        # the presets are built once when wavelink is imported, you can register your own with
+        # `wavelink.register_preset`.
+        if self.values[0] == "Reset":
+            await self.player.clear_filters()
+        else:
+            await self.player.set_filter(wavelink.get_preset(self.values[0]))
+
+        names = ", ".join(self.player.filters.names) or "None"
+        await interaction.response.send_message(f"Filters set to {names}.")
 
 
-class FilterView(disnake.ui.View):
+class FilterView(TimedView):
     """
     A view that allows the user to set the filter.
     """
@@ -109,104 +115,129 @@ class FilterView(disnake.ui.View):
         await self.interaction.edit_original_message(view=self)
 
 
+SEARCH_TIMEOUT = 60
+
+
+def song_selection(tracks: List[Track], search_id: int) -> disnake.ui.Select:
+    """
+    A function that builds the select menu of a search. It is sent as a component only, the selection is handled
+    by the persistent `SongSelectionView`.
+
+    Parameters
+    ----------
+    tracks : List[Track]
+        The tracks to select from.
+
+    search_id : int
+        The ID of the search, stored in the option values so selections of old searches can be told apart.
+
+    Returns
+    -------
+    disnake.ui.Select
+        The select menu.
+    """
+    options = []
+    for index, track in enumerate(tracks):
+        option = disnake.SelectOption(
+            label=f"{index + 1}. {track.title}"[:100],
+            description=f"{track.author} - {humanize.precisedelta(datetime.timedelta(milliseconds=track.duration))}"[
+                :100
+            ],
+            value=f"{search_id}:{index}",
+        )
+        options.append(option)
+
+    return disnake.ui.Select(
+        custom_id=SongSelection.custom_id,
+        placeholder="Select a song",
+        min_values=1,
+        max_values=1,
+        options=options,
+    )
+
+
 class SongSelection(disnake.ui.Select["SongSelectionView"]):
-    def __init__(self, tracks: List[Track], bot: Bot, player: Player):
+    custom_id = "music:select"
+
+    def __init__(self, bot: Bot):
         """
-        A selection of songs.
+        A persistent selection of songs. The tracks of a search are stored on the player of the guild.
 
         Parameters
         ----------
-        tracks : List[Track]
-            The tracks to select from.
-
         bot : Bot
             The bot instance.
-
-        player : Player
-            The player instance.
         """
         self.bot = bot
-        self.player = player
-        self.tracks = tracks
-
-        options = []
-        for index, track in enumerate(self.tracks):
-            option = disnake.SelectOption(
-                label=f"{index + 1}. {track.title}",
-                description=f"{track.author} - {humanize.precisedelta(datetime.timedelta(milliseconds=track.duration))}",
-                value=str(index),
-            )
-            options.append(option)
 
         super().__init__(
+            custom_id=self.custom_id,
             placeholder="Select a song",
             min_values=1,
             max_values=1,
-            options=options,
+            options=[disnake.SelectOption(label="Song")],
         )
 
     async def callback(self, interaction: MessageInteraction) -> None:
         """
         This method is called when the user selects an option.
         """
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
+        search_id, _, index = self.values[0].partition(":")
+
+        if (
+            not player
+            or not player.search
+            or player.search[0] != int(search_id)
+            or time.monotonic() - player.search[1] > SEARCH_TIMEOUT
+        ):
+            return await interaction.response.send_message(
+                "This search has expired, please search again.", ephemeral=True
+            )
 
-        track = Track(
-            self.tracks[int(self.values[0])].id,
-            self.tracks[int(self.values[0])].info,
-            requester=interaction.author,
-        )
+        selected = player.search[2][int(index)]
+        player.search = None
+        track = Track(selected.id, selected.info, requester=interaction.author)
         #  Creating a Track object from the selected track.
         await interaction.response.send_message(
             content=f"\n{self.bot.icons['headphones']} Enqueued `{track.title}` to the Queue\n"
         )
-        await self.player.queue.put(track)
+        await player.queue.put(track)
+        self.bot.track_suggestions.record(interaction.guild_id, track)
 
-        if not self.player.is_playing:
-            await self.player.play_next_song()
+        if not player.is_playing:
+            await player.play_next_song()
 
 
 class SongSelectionView(disnake.ui.View):
     """
-    This class subclasses the disnake.ui.View class which shows a selection of songs.
+    This class subclasses the disnake.ui.View class which handles the selection of songs.
+    A single instance is registered with the bot at startup, and routes the selections to the player of the guild.
     """
 
-    def __init__(
-        self,
-        tracks: List[Track],
-        interaction: disnake.ApplicationCommandInteraction,
-        player: Player,
-        bot: Bot,
-    ):
-        super().__init__(timeout=60)
-        self.tracks = tracks
+    def __init__(self, bot: Bot):
+        super().__init__(timeout=None)
         self.bot = bot
-        self.interaction = interaction
-        self.player = player
-        self.add_item(SongSelection(tracks=tracks, bot=self.bot, player=self.player))
+        self.add_item(SongSelection(bot=self.bot))
 
-    async def interaction_check(
-        self, interaction: disnake.ApplicationCommandInteraction
-    ) -> bool:
+    async def interaction_check(self, interaction: MessageInteraction) -> bool:
         """
-        Check if the interaction is the same as the one that created this view.
+        Check if the user is the DJ of the player of the guild.
 
         Parameters
         ----------
-        interaction : disnake.ApplicationCommandInteraction
+        interaction : MessageInteraction
             The interaction to check.
 
         Returns
         -------
         bool
-            Whether the interaction is the same as the one that created this view.
+            Whether the user is the DJ of the player.
         """
-        if interaction.author.id != self.player.dj.id:
-            return await interaction.response.send_message(
+        player: Player = self.bot.wavelink.peek_player(interaction.guild.id)
+        if not player or not player.dj or interaction.author.id != player.dj.id:
+            await interaction.response.send_message(
                 "This is not your menu!", ephemeral=True
             )
+            return False
         return True
-
-    async def on_timeout(self) -> None:
-        for item in self.children:
-            item.disabled = True
-        await self.interaction.edit_original_message(view=self)
@@ -0,0 +1,166 @@
+#  -*- coding: utf-8 -*-
+"""
+An index of the members connected to every voice channel, maintained from the voice state events.
+"""
+import typing
+
+import disnake
+
+
+class VoiceMembershipIndex:
+    """
+    A class that keeps the non-bot members of every voice channel, so DJ assignment, vote thresholds and channel
+    checks are dictionary lookups, instead of REST calls or scans of ``channel.members``.
+
+    Members are kept in the order they joined the channel, so the member that has been listening the longest is the
+    first one that is picked as the new DJ.
+
+    The index is seeded from the voice states of a guild, which are cached whatever the cache profile is. A user whose
+    member is not cached yet is indexed by their ID and counts as a listener, and the member is filled in by the next
+    seed or voice state update.
+    """
+
+    def __init__(self):
+        self._channels: typing.Dict[int, typing.Dict[int, typing.Optional[disnake.Member]]] = {}
+        self._locations: typing.Dict[typing.Tuple[int, int], int] = {}
+        # the keys of the locations of every guild, so a guild is dropped without scanning every location.
+        self._guilds: typing.Dict[int, typing.Set[typing.Tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def _add(self, guild_id: int, channel_id: int, member_id: int, member: typing.Optional[disnake.Member]) -> None:
+        self._remove(guild_id, member_id)
+        self._channels.setdefault(channel_id, {})[member_id] = member
+        self._locations[(guild_id, member_id)] = channel_id
+        self._guilds.setdefault(guild_id, set()).add((guild_id, member_id))
+
+    def _remove(self, guild_id: int, member_id: int) -> None:
+        channel_id = self._locations.pop((guild_id, member_id), None)
+        if channel_id is None:
+            return
+        keys = self._guilds.get(guild_id)
+        if keys is not None:
+            keys.discard((guild_id, member_id))
+            if not keys:
+                del self._guilds[guild_id]
+        members = self._channels.get(channel_id)
+        if members is not None:
+            members.pop(member_id, None)
+            if not members:
+                del self._channels[channel_id]
+
+    def seed(self, guild: disnake.Guild) -> None:
+        """
+        A method that indexes the users that are already connected to the voice channels of a guild, from the
+        cached voice states. ``channel.members`` is not used, it only has the members that are cached.
+
+        Parameters
+        ----------
+        guild : disnake.Guild
+            The guild to index.
+        """
+        self.drop(guild.id)
+        me = guild.me.id if guild.me else None
+        for channel in guild.voice_channels + guild.stage_channels:
+            for user_id in channel.voice_states:
+                member = guild.get_member(user_id)
+                if user_id == me or (member is not None and member.bot):
+                    continue
+                self._add(guild.id, channel.id, user_id, member)
+
+    def drop(self, guild_id: int) -> None:
+        """
+        A method that removes every member of a guild from the index, when the guild is removed or re-indexed.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        """
+        for key in list(self._guilds.get(guild_id, ())):
+            self._remove(*key)
+
+    def update(
+        self, member: disnake.Member, before: disnake.VoiceState, after: disnake.VoiceState
+    ) -> None:
+        """
+        A method that applies a voice state update to the index.
+
+        Parameters
+        ----------
+        member : disnake.Member
+            The member whose voice state changed.
+        before : disnake.VoiceState
+            The voice state before the update.
+        after : disnake.VoiceState
+            The voice state after the update.
+        """
+        if member.bot:
+            # a bot that was seeded before its member was cached.
+            self._remove(member.guild.id, member.id)
+            return
+        if after.channel is None:
+            self._remove(member.guild.id, member.id)
+        elif (
+            before.channel is None
+            or before.channel.id != after.channel.id
+            or self._locations.get((member.guild.id, member.id)) != after.channel.id
+        ):
+            # a join or a move, or a member that was never indexed, e.g. after a missed event.
+            self._add(member.guild.id, after.channel.id, member.id, member)
+        else:
+            # a mute or deafen, the cached member is refreshed but the order is kept.
+            self._channels[after.channel.id][member.id] = member
+
+    def members(self, channel_id: int) -> typing.List[disnake.Member]:
+        """
+        A method that returns the non-bot members connected to a voice channel, in the order they joined. Users
+        whose member is not cached are left out.
+
+        Parameters
+        ----------
+        channel_id : int
+            The ID of the voice channel.
+
+        Returns
+        -------
+        typing.List[disnake.Member]
+            The members of the channel.
+        """
+        return [member for member in self._channels.get(channel_id, {}).values() if member is not None]
+
+    def count(self, channel_id: int) -> int:
+        """
+        A method that returns the amount of non-bot users connected to a voice channel, cached or not.
+        """
+        return len(self._channels.get(channel_id, ()))
+
+    def contains(self, channel_id: int, member_id: int) -> bool:
+        """
+        A method that returns whether a member is connected to a voice channel.
+        """
+        return member_id in self._channels.get(channel_id, ())
+
+    def first(
+        self, channel_id: int, *, exclude: typing.Optional[int] = None
+    ) -> typing.Optional[disnake.Member]:
+        """
+        A method that returns the member that has been connected to a voice channel the longest.
+
+        Parameters
+        ----------
+        channel_id : int
+            The ID of the voice channel.
+        exclude : typing.Optional[int]
+            The ID of a member to skip, like the current DJ.
+
+        Returns
+        -------
+        typing.Optional[disnake.Member]
+            The member, or None if nobody else is connected.
+        """
+        for member_id, member in self._channels.get(channel_id, {}).items():
+            if member_id != exclude and member is not None:
+                return member
+        return None
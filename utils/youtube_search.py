@@ -0,0 +1,126 @@
+#  -*- coding: utf-8 -*-
+"""
+The YouTube video and channel search of the ``/youtube`` commands.
+
+``youtubesearchpython`` scrapes the YouTube search page, which is slow and rate limited. The results are cached by
+the normalized query, identical searches that are in flight at the same time share one request, and the amount of
+requests to YouTube at once is limited.
+"""
+import asyncio
+import typing
+
+from loguru import logger
+from youtubesearchpython.__future__ import ChannelsSearch, VideosSearch
+
+from utils.cache import InFlight, TTLCache
+
+SearchKey = typing.Tuple[str, str, int]
+
+
+def normalize_query(query: str) -> str:
+    """
+    A function that normalizes a search query, so queries that only differ in case and whitespace share their
+    results.
+    """
+    return " ".join(query.split()).casefold()
+
+
+class YouTubeSearch:
+    """
+    A class that searches YouTube videos and channels, and caches the results.
+
+    Parameters
+    ----------
+    concurrency : int
+        The maximum amount of searches that are sent to YouTube at once.
+    cache_size : int
+        The maximum amount of cached searches.
+    cache_ttl : float
+        How long the results of a search are cached, in seconds.
+    """
+
+    def __init__(self, *, concurrency: int = 2, cache_size: int = 256, cache_ttl: float = 600.0):
+        self.concurrency = concurrency
+        self._semaphore: typing.Optional[asyncio.Semaphore] = None
+        self._cache: TTLCache[SearchKey, typing.List[dict]] = TTLCache(cache_size, ttl=cache_ttl)
+        self._pending: InFlight[SearchKey, typing.List[dict]] = InFlight()
+
+        # statistics, reported by the bot.
+        self.searches = 0
+        self.cache_hits = 0
+        self.requests = 0
+
+    def stats(self) -> dict:
+        """
+        A method that returns the statistics of the search cache.
+        """
+        return {
+            "searches": self.searches,
+            "cache_hits": self.cache_hits,
+            "coalesced": self._pending.coalesced,
+            "requests": self.requests,
+            "cached": len(self._cache),
+        }
+
+    async def _request(self, key: SearchKey, query: str) -> typing.List[dict]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        kind, _, limit = key
+        if kind == "videos":
+            search = VideosSearch(query, limit=limit)
+        else:
+            search = ChannelsSearch(query, limit=limit, region="US")
+        async with self._semaphore:
+            self.requests += 1
+            results = (await search.next())["result"]
+
+        self._cache[key] = results
+        logger.debug(f"Searched YouTube {kind} for {query!r}: {len(results)} results.", __name="Music Bot")
+        return results
+
+    async def _search(self, kind: str, query: str, limit: int) -> typing.List[dict]:
+        self.searches += 1
+        key = (kind, normalize_query(query), limit)
+
+        if key in self._cache:
+            self.cache_hits += 1
+            return self._cache.get(key)
+
+        return await self._pending.wait(key, lambda: self._request(key, query))
+
+    async def videos(self, query: str, *, limit: int = 15) -> typing.List[dict]:
+        """
+        A method that searches YouTube videos.
+
+        Parameters
+        ----------
+        query : str
+            The query to search for.
+        limit : int
+            The maximum amount of videos.
+
+        Returns
+        -------
+        typing.List[dict]
+            The videos, as returned by ``VideosSearch``.
+        """
+        return await self._search("videos", query, limit)
+
+    async def channels(self, query: str, *, limit: int = 15) -> typing.List[dict]:
+        """
+        A method that searches YouTube channels.
+
+        Parameters
+        ----------
+        query : str
+            The query to search for.
+        limit : int
+            The maximum amount of channels.
+
+        Returns
+        -------
+        typing.List[dict]
+            The channels, as returned by ``ChannelsSearch``.
+        """
+        return await self._search("channels", query, limit)
@@ -9,6 +9,7 @@ from .errors import *
 from .events import *
 from .player import *
 from .filters import *
+from .equalizer import *
 from .node import Node
 from .meta import WavelinkMixin
 from .websocket import WebSocket
@@ -23,10 +23,11 @@ SOFTWARE.
 import aiohttp
 import asyncio
 import logging
+import time
 from disnake.ext import commands
 from functools import partial
 from json import dumps
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 from .errors import *
 from .player import Player
@@ -96,6 +97,9 @@ class Client:
 
         self._dumps = dumps
 
+        self.players_created = 0
+        self.players_never_connected = 0
+
         bot.add_listener(self.update_handler, "on_socket_response")
 
     @property
@@ -235,6 +239,35 @@ class Client:
 
         return await node.build_track(identifier)
 
+    async def build_tracks(self, identifiers: list) -> list:
+        """|coro|
+
+        Build many track objects from their identifiers with a single request.
+
+        Parameters
+        ------------
+        identifiers: list
+            The tracks unique Base64 encoded identifiers.
+
+        Returns
+        ---------
+        List[:class:`wavelink.player.Track`]
+            The tracks built from the identifiers, in the same order.
+
+        Raises
+        --------
+        ZeroConnectedNodes
+            There are no :class:`wavelink.node.Node`s currently connected.
+        BuildTrackError
+            Decoding and building the tracks failed.
+        """
+        node = self.get_best_node()
+
+        if node is None:
+            raise ZeroConnectedNodes
+
+        return await node.build_tracks(identifiers)
+
     def _get_players(self) -> dict:
         players = []
 
@@ -243,6 +276,57 @@ class Client:
 
         return {player.guild_id: player for player in players}
 
+    def peek_player(self, guild_id: int) -> Optional[Player]:
+        """Retrieve the player of the given guild ID, without creating one.
+
+        Parameters
+        ------------
+        guild_id: int
+            The guild ID to retrieve a player for.
+
+        Returns
+        ---------
+        Optional[Player]
+            The :class:`wavelink.player.Player` associated with the given guild ID, or None if there is none.
+        """
+        for node in self.nodes.values():
+            player = node.players.get(guild_id)
+            if player is not None:
+                return player
+        return None
+
+    def collect_players(self, max_idle: float) -> List[Player]:
+        """Remove the players that never connected to a voice channel, and find the players that have been
+        disconnected, for longer than ``max_idle`` seconds.
+
+        Players that never connected hold no state on Lavalink, so they are removed here. Players that were
+        connected may, so they are returned to be destroyed by the caller.
+
+        Parameters
+        ------------
+        max_idle: float
+            How long a player can stay disconnected, in seconds.
+
+        Returns
+        ---------
+        List[Player]
+            The disconnected players that should be destroyed.
+        """
+        now = time.monotonic()
+        stale = []
+
+        for node in self.nodes.values():
+            for guild_id, player in list(node.players.items()):
+                if player.is_connected or now - player.idle_since < max_idle:
+                    continue
+                if player.connected_once:
+                    stale.append(player)
+                else:
+                    del node.players[guild_id]
+                    self.players_never_connected += 1
+
+        return stale
+
     def get_node(self, identifier: str) -> Optional[Node]:
         """Retrieve a Node with the given identifier.
 
@@ -270,7 +354,7 @@ class Client:
         if not nodes:
             return None
 
-        return sorted(nodes, key=lambda n: len(n.players))[0]
+        return sorted(nodes, key=lambda n: n.penalty)[0]
 
     def get_node_by_region(self, region: str) -> Optional[Node]:
         """Retrieve the best available Node with the given region.
@@ -294,7 +378,7 @@ class Client:
         if not nodes:
             return None
 
-        return sorted(nodes, key=lambda n: len(n.players))[0]
+        return sorted(nodes, key=lambda n: n.penalty)[0]
 
     def get_node_by_shard(self, shard_id: int) -> Optional[Node]:
         """Retrieve the best available Node with the given shard ID.
@@ -316,7 +400,7 @@ class Client:
         if not nodes:
             return None
 
-        return sorted(nodes, key=lambda n: len(n.players))[0]
+        return sorted(nodes, key=lambda n: n.penalty)[0]
 
     def get_player(self, guild_id: int, *, cls=None, node_id=None, **kwargs) -> Player:
         """Retrieve a player for the given guild ID. If None, a player will be created and returned.
@@ -381,6 +465,8 @@ class Client:
 
             player = cls(self.bot, guild_id, node, **kwargs)
             node.players[guild_id] = player
+            node.load.place()
+            self.players_created += 1
 
             return player
 
@@ -397,23 +483,27 @@ class Client:
                 region_options.append(node)
 
         if not shard_options and not region_options:
-            # Sort by len of node players
-            node = sorted(nodes, key=lambda n: len(n.players))[0]
+            # Sort by the predicted load of the nodes
+            node = sorted(nodes, key=lambda n: n.penalty)[0]
             player = cls(self.bot, guild_id, node, **kwargs)
             node.players[guild_id] = player
+            node.load.place()
+            self.players_created += 1
 
             return player
 
         best = [n for n in shard_options if n in region_options]
         if best:
-            node = sorted(best, key=lambda n: len(n.players))[0]
+            node = sorted(best, key=lambda n: n.penalty)[0]
         elif shard_options:
-            node = sorted(shard_options, key=lambda n: len(n.players))[0]
+            node = sorted(shard_options, key=lambda n: n.penalty)[0]
         else:
-            node = sorted(region_options, key=lambda n: len(n.players))[0]
+            node = sorted(region_options, key=lambda n: n.penalty)[0]
 
         player = cls(self.bot, guild_id, node, **kwargs)
         node.players[guild_id] = player
+        node.load.place()
+        self.players_created += 1
 
         return player
 
@@ -0,0 +1,219 @@
+"""
+An equalizer builder, which turns parametric descriptions of a curve into the gains of the 15 bands of the
+Lavalink equalizer.
+
+A curve is a tuple of components, like a peak at a frequency or a shelf below a frequency. Every component is
+evaluated over all the bands at once with NumPy, the components are summed and the gains are clamped to the range
+Lavalink accepts. The gains of a curve are memoized by its components, so presets and repeated custom curves are
+only computed once.
+"""
+import functools
+import math
+from typing import Dict, Tuple
+
+import numpy as np
+
+from wavelink.errors import FilterInvalidArgument
+from wavelink.filters import BaseFilter, register_preset
+
+__all__ = ("BANDS", "EQ_CURVES", "Equalizer", "equalizer_gains")
+
+# the center frequencies of the bands of the Lavalink equalizer, in Hz.
+BANDS = np.array(
+    [25, 40, 63, 100, 160, 250, 400, 630, 1000, 1600, 2500, 4000, 6300, 10000, 16000],
+    dtype=np.float64,
+)
+_LOG_BANDS = np.log2(BANDS)
+
+# the range of the gain of a band, -0.25 mutes it, 0.0 leaves it unchanged and 0.25 doubles it.
+MIN_GAIN = -0.25
+MAX_GAIN = 1.0
+
+Component = Tuple[str, float, float, float]
+
+
+def _bell(x: np.ndarray, frequency: float, gain: float, q: float) -> np.ndarray:
+    # a bell in log frequency, whose width at half of its gain is the octave bandwidth of the Q.
+    bandwidth = 2 / math.log(2) * math.asinh(1 / (2 * q))
+    sigma = bandwidth / (2 * math.sqrt(2 * math.log(2)))
+    return gain * np.exp(-((x - math.log2(frequency)) ** 2) / (2 * sigma ** 2))
+
+
+def _shelf(x: np.ndarray, frequency: float, gain: float, slope: float) -> np.ndarray:
+    # a logistic step in log frequency, that rises from 0 below the frequency to the gain above it.
+    return gain / (1 + np.exp(-4 * slope * (x - math.log2(frequency))))
+
+
+_SHAPES = {
+    "peak": _bell,
+    "high_shelf": _shelf,
+    "low_shelf": lambda x, frequency, gain, slope: _shelf(-x, 1 / frequency, gain, slope),
+}
+
+
+@functools.lru_cache(maxsize=256)
+def equalizer_gains(components: Tuple[Component, ...]) -> Tuple[float, ...]:
+    """
+    Compute the gains of the bands of a curve.
+
+    Parameters
+    ----------
+    components : Tuple[Tuple[str, float, float, float], ...]
+        The components of the curve, as (shape, frequency, gain, q or slope), where the shape is one of
+        ``peak``, ``low_shelf`` and ``high_shelf``.
+
+    Returns
+    -------
+        The gains of the 15 bands, clamped to the range Lavalink accepts.
+    """
+    gains = np.zeros_like(BANDS)
+    for shape, frequency, gain, width in components:
+        gains += _SHAPES[shape](_LOG_BANDS, frequency, gain, width)
+    # adding 0.0 turns the -0.0 of the bands a cut does not reach into 0.0.
+    return tuple((np.round(np.clip(gains, MIN_GAIN, MAX_GAIN), 4) + 0.0).tolist())
+
+
+class Equalizer:
+    """
+    A builder of equalizer filters. The methods return the builder, so a curve can be described in one expression:
+
+    .. code-block:: python
+
+        filter_ = Equalizer("Warm").bass_boost(0.2).notch(3000).high_shelf(8000, -0.05).build()
+
+    Parameters
+    ----------
+    name : str
+        The name of the filter.
+    """
+
+    def __init__(self, name: str = "Equalizer"):
+        self.name = name
+        self.components: Tuple[Component, ...] = ()
+
+    def __repr__(self):
+        return f"<Equalizer {self.name} {self.components}>"
+
+    def _add(self, shape: str, frequency: float, gain: float, width: float) -> "Equalizer":
+        if not 20 <= frequency <= 20000:
+            raise FilterInvalidArgument("Equalizer frequencies must be between 20 and 20000 Hz.")
+        if width <= 0:
+            raise FilterInvalidArgument("Equalizer widths and slopes must be more than 0.")
+        self.components += ((shape, float(frequency), float(gain), float(width)),)
+        return self
+
+    def peak(self, frequency: float, gain: float, q: float = 1.0) -> "Equalizer":
+        """
+        Boost or cut the bands around a frequency.
+
+        Parameters
+        ----------
+        frequency : float
+            The center frequency, in Hz.
+        gain : float
+            The gain at the center frequency, between -0.25 and 1.0.
+        q : float
+            How narrow the peak is, 1.0 is about 1.4 octaves wide.
+        """
+        return self._add("peak", frequency, gain, q)
+
+    def notch(self, frequency: float, depth: float = 0.25, q: float = 4.0) -> "Equalizer":
+        """
+        Cut a narrow range of bands around a frequency, e.g. a harsh resonance.
+
+        Parameters
+        ----------
+        frequency : float
+            The center frequency, in Hz.
+        depth : float
+            How much the center frequency is cut, 0.25 mutes it.
+        q : float
+            How narrow the notch is.
+        """
+        return self._add("peak", frequency, -abs(depth), q)
+
+    def low_shelf(self, frequency: float, gain: float, slope: float = 1.0) -> "Equalizer":
+        """
+        Boost or cut every band below a frequency.
+
+        Parameters
+        ----------
+        frequency : float
+            The frequency the gain is halfway at, in Hz.
+        gain : float
+            The gain of the bands below the frequency.
+        slope : float
+            How steep the shelf is, higher is steeper.
+        """
+        return self._add("low_shelf", frequency, gain, slope)
+
+    def high_shelf(self, frequency: float, gain: float, slope: float = 1.0) -> "Equalizer":
+        """
+        Boost or cut every band above a frequency.
+
+        Parameters
+        ----------
+        frequency : float
+            The frequency the gain is halfway at, in Hz.
+        gain : float
+            The gain of the bands above the frequency.
+        slope : float
+            How steep the shelf is, higher is steeper.
+        """
+        return self._add("high_shelf", frequency, gain, slope)
+
+    def bass_boost(self, gain: float = 0.2, frequency: float = 120.0) -> "Equalizer":
+        """
+        Boost the bass, a low shelf below a frequency.
+
+        Parameters
+        ----------
+        gain : float
+            The gain of the bass.
+        frequency : float
+            The frequency the boost is halfway at, in Hz.
+        """
+        return self.low_shelf(frequency, gain, slope=1.5)
+
+    def curve(self, name: str) -> "Equalizer":
+        """
+        Add the components of a named curve, e.g. ``Rock``.
+
+        Parameters
+        ----------
+        name : str
+            The name of the curve, one of `EQ_CURVES`.
+        """
+        try:
+            self.components += EQ_CURVES[name]
+        except KeyError:
+            raise FilterInvalidArgument(f"There is no equalizer curve named {name}.") from None
+        return self
+
+    @property
+    def gains(self) -> Tuple[float, ...]:
+        """
+        The gains of the 15 bands.
+        """
+        return equalizer_gains(self.components)
+
+    def build(self) -> BaseFilter:
+        """
+        Build the equalizer filter, which can be set with :meth:`Player.set_filter`.
+        """
+        return BaseFilter.build_from_equalizer(self.gains, name=self.name)
+
+
+# named curves, the gains of every one of them are computed once, when they are registered as presets.
+EQ_CURVES: Dict[str, Tuple[Component, ...]] = {
+    "BassBoost": Equalizer().bass_boost(0.25).components,
+    "Rock": Equalizer().low_shelf(150, 0.15).peak(1000, -0.05, 0.7).high_shelf(5000, 0.12).components,
+    "Pop": Equalizer().peak(100, 0.05).peak(2500, 0.1, 0.8).high_shelf(10000, 0.05).components,
+    "Electronic": Equalizer().low_shelf(100, 0.2, 2.0).peak(1000, -0.05).high_shelf(8000, 0.12).components,
+    "Classical": Equalizer().low_shelf(100, 0.05).high_shelf(6000, 0.08, 0.5).components,
+    "Vocal": Equalizer().low_shelf(150, -0.1).peak(2000, 0.15, 0.6).components,
+    "Soft": Equalizer().high_shelf(4000, -0.12, 0.8).components,
+}
+
+for _name in EQ_CURVES:
+    register_preset(_name, Equalizer(_name).curve(_name).build())
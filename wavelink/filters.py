@@ -2,6 +2,8 @@
 The filter configurations are taken from Lavalink  but rewritten entirely for
 wavelink.
 """
+from typing import Dict, List, Optional
+
 from wavelink.errors import FilterInvalidArgument
 
 
@@ -173,6 +175,33 @@ class BaseFilter:
         payload = {"timescale": {"speed": speed, "pitch": pitch, "rate": rate}}
         return cls(filter_name="Timescale", payload=payload)
 
+    @classmethod
+    def build_from_equalizer(cls, gains, *, name: str = "Equalizer"):
+        """
+        This method is used to build an equalizer filter from the gains of the 15 bands of the Lavalink equalizer,
+        from 25 Hz to 16 kHz. Use :class:`Equalizer` to build the gains from a curve.
+        Parameters
+        ----------
+        gains : Sequence[float]
+            The gains of the bands, from -0.25 (muted) to 1.0, 0.0 leaves a band unchanged.
+        name : str
+            The name of the filter.
+        Returns
+        -------
+            The equalizer filter.
+        """
+        if len(gains) > 15:
+            raise FilterInvalidArgument("The equalizer has 15 bands.")
+        if any(gain < -0.25 or gain > 1.0 for gain in gains):
+            raise FilterInvalidArgument("Equalizer gains must be between -0.25 and 1.0.")
+
+        payload = {
+            "equalizer": [
+                {"band": band, "gain": float(gain)} for band, gain in enumerate(gains)
+            ]
+        }
+        return cls(filter_name=name, payload=payload)
+
     @classmethod
     def karaoke(
         cls,
@@ -273,5 +302,133 @@ class BaseFilter:
         -------
             The 8D audio filter.
         """
-        payload = {"8dAudio": {"rotationHertz": rotation_hertz}}
+        payload = {"rotation": {"rotationHz": rotation_hertz}}
         return cls(filter_name="8D Audio", payload=payload)
+
+
+class FilterChain:
+    """
+    The combined filters of a player.
+
+    Lavalink replaces every filter of a player with the payload of each filters op, so the filters of a player are
+    kept here by their key and merged into one payload. Adding a filter replaces the filter with the same key,
+    e.g. a new timescale replaces the old one, and keeps the others.
+    """
+
+    def __init__(self):
+        self._filters: Dict[str, BaseFilter] = {}
+        self._payload: Optional[dict] = None
+
+    def __bool__(self):
+        return bool(self._filters)
+
+    def __repr__(self):
+        return f"<FilterChain {self.names}>"
+
+    @property
+    def names(self) -> List[str]:
+        """
+        The names of the filters, in the order they were added.
+        """
+        return list(dict.fromkeys(filter_.name for filter_ in self._filters.values()))
+
+    @property
+    def payload(self) -> dict:
+        """
+        The merged payload of the filters. It is only rebuilt after the filters change.
+        """
+        if self._payload is None:
+            self._payload = {
+                key: filter_.payload[key] for key, filter_ in self._filters.items()
+            }
+        return self._payload
+
+    def add(self, filter_: BaseFilter) -> None:
+        """
+        Add a filter, replacing the filters with the same keys.
+
+        Parameters
+        ----------
+        filter_ : BaseFilter
+            The filter to add.
+        """
+        for key in filter_.payload:
+            self._filters[key] = filter_
+        self._payload = None
+
+    def remove(self, key: str) -> Optional[BaseFilter]:
+        """
+        Remove the filter with a key, e.g. ``timescale``.
+
+        Parameters
+        ----------
+        key : str
+            The key of the filter.
+
+        Returns
+        -------
+            The removed filter, or None if there was no filter with the key.
+        """
+        filter_ = self._filters.pop(key, None)
+        if filter_ is not None:
+            self._payload = None
+        return filter_
+
+    def clear(self) -> None:
+        """
+        Remove every filter.
+        """
+        self._filters.clear()
+        self._payload = None
+
+
+_presets: Dict[str, BaseFilter] = {}
+
+
+def register_preset(name: str, filter_: BaseFilter) -> None:
+    """
+    Register a filter under a name, so it is built once instead of every time it is selected.
+
+    Parameters
+    ----------
+    name : str
+        The name of the preset.
+    filter_ : BaseFilter
+        The filter.
+    """
+    _presets[name] = filter_
+
+
+def get_preset(name: str) -> Optional[BaseFilter]:
+    """
+    Get a registered preset by its name.
+
+    Parameters
+    ----------
+    name : str
+        The name of the preset.
+
+    Returns
+    -------
+        The filter, or None if there is no preset with the name.
+    """
+    return _presets.get(name)
+
+
+def presets() -> Dict[str, BaseFilter]:
+    """
+    Get every registered preset, by its name.
+    """
+    return dict(_presets)
+
+
+register_preset("Tremolo", BaseFilter.tremolo())
+register_preset("Karaoke", BaseFilter.karaoke())
+register_preset("8D", BaseFilter.Eight_D_Audio())
+register_preset("Vibrato", BaseFilter.vibrato())
+register_preset(
+    "ExtremeBass",
+    BaseFilter.build_from_channel_mix(
+        left_to_right=1.0, right_to_left=3.0, right_to_right=8.8, left_to_left=9.0
+    ),
+)
@@ -27,12 +27,13 @@ import logging
 import re
 
 from disnake.ext import commands
-from typing import Any, Callable, Dict, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from urllib.parse import quote
 
 from .backoff import ExponentialBackoff
 from .errors import *
 from .player import Player, Track, TrackPlaylist
+from .stats import LoadEstimator, StatsHistory
 from .websocket import WebSocket
 
 logger = logging.getLogger(__name__)
@@ -109,6 +110,8 @@ class Node:
         self.available = True
 
         self.stats = None
+        self.history = StatsHistory()
+        self.load = LoadEstimator()
 
     def __repr__(self):
         return f"{self.identifier} | {self.region} | (Shard: {self.shard_id})"
@@ -128,11 +131,11 @@ class Node:
 
     @property
     def penalty(self) -> float:
-        """Returns the load-balancing penalty for this node."""
-        if not self.available or not self.stats:
+        """Returns the load-balancing penalty for this node, predicted from its smoothed stats."""
+        if not self.available:
             return 9e30
 
-        return self.stats.penalty.total
+        return self.load.score(players=len(self.players))
 
     async def connect(
         self,
@@ -261,6 +264,40 @@ class Node:
             track = Track(id_=identifier, info=data)
             return track
 
+    async def build_tracks(self, identifiers: List[str]) -> List[Track]:
+        """|coro|
+
+        Build many track objects from their identifiers with a single request.
+
+        Parameters
+        ------------
+        identifiers: List[str]
+            The tracks unique Base64 encoded identifiers.
+
+        Returns
+        ---------
+        List[:class:`wavelink.player.Track`]
+            The tracks built from the identifiers, in the same order.
+
+        Raises
+        --------
+        BuildTrackError
+            Decoding and building the tracks failed.
+        """
+        async with self.session.post(
+            f"{self.rest_uri}/decodetracks",
+            headers={"Authorization": self.password},
+            json=list(identifiers),
+        ) as resp:
+            data = await resp.json()
+
+            if not resp.status == 200:
+                raise BuildTrackError(
+                    f"Failed to build tracks. Status: {resp.status}, Error: {data}."
+                )
+
+            return [Track(id_=track["track"], info=track["info"]) for track in data]
+
     def get_player(self, guild_id: int) -> Optional[Player]:
         """Retrieve a player object associated with the Node.
 
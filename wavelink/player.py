@@ -27,7 +27,7 @@ from disnake.ext import commands
 from disnake.gateway import DiscordWebSocket
 from typing import Optional, Union
 
-from wavelink.filters import BaseFilter
+from wavelink.filters import BaseFilter, FilterChain
 from .errors import *
 from .events import *
 
@@ -188,9 +188,29 @@ class Player:
         self.volume = 100
         self.paused = False
         self.current = None
-        self.channel_id = None
+        self._channel_id = None
         self._new_track = False
 
+        self.connected_once = False
+        # when the player was last disconnected, reset by `channel_id` whenever it becomes disconnected.
+        self.idle_since = time.monotonic()
+
+        self.filters = FilterChain()
+        # the last filters payload sent to the node, so unchanged filters are not sent again.
+        self._sent_filters: dict = {}
+
+    @property
+    def channel_id(self) -> Optional[int]:
+        """The ID of the voice channel the player is connected to, or None."""
+        return self._channel_id
+
+    @channel_id.setter
+    def channel_id(self, value: Optional[int]) -> None:
+        # any disconnect, including a kick or a voice state update, starts the grace period of `collect_players`.
+        if value is None and self._channel_id is not None:
+            self.idle_since = time.monotonic()
+        self._channel_id = value
+
     @property
     def is_connected(self) -> bool:
         """Returns whether the player is connected to a voicechannel or not."""
@@ -289,6 +309,7 @@ class Player:
             raise InvalidIDProvided(f"No guild found for id <{self.guild_id}>")
 
         self.channel_id = channel_id
+        self.connected_once = True
         await self._get_shard_socket(guild.shard_id).voice_state(
             self.guild_id, str(channel_id), self_deaf=self_deaf
         )
@@ -458,7 +479,7 @@ class Player:
             if self.node.region:
                 node = client.get_node_by_region(self.node.region)
 
-            if not node and self.node.shard_id:
+            if not node and self.node.shard_id is not None:
                 node = client.get_node_by_shard(self.node.shard_id)
 
             if not node:
@@ -476,6 +497,7 @@ class Player:
 
         self.node = node
         self.node.players[int(self.guild_id)] = self
+        self.node.load.place()
 
         if self._voice_state:
             await self._dispatch_voice_update()
@@ -499,31 +521,66 @@ class Player:
                 op="volume", guildId=str(self.guild_id), volume=self.volume
             )
 
-    async def set_flr(self, filter_: BaseFilter) -> None:
+        if self._sent_filters:
+            # the new node starts without filters, the payload that was sent last is sent again as is.
+            await self.node._send(
+                op="filters", guildId=str(self.guild_id), **self._sent_filters
+            )
+
+    async def _send_filters(self) -> bool:
+        """
+        Send the combined filters of the player to the node, if they changed since they were last sent.
+
+        Returns
+        -------
+            Whether the filters were sent.
+        """
+        payload = self.filters.payload
+        if payload == self._sent_filters:
+            return False
+
+        await self.node._send(op="filters", guildId=str(self.guild_id), **payload)
+        self._sent_filters = payload
+        logger.debug(
+            f"PLAYER | Set filters:: {self.filters.names} {payload} ({self.channel_id})"
+        )
+        return True
+
+    async def set_flr(self, filter_: BaseFilter) -> bool:
         """
-        Set the players filter.
+        Add a filter to the players filters. A filter replaces the filter of the same kind, and keeps the others.
 
         Parameters
         ------------
         filter_: Filter
-            The filter to set the player to.
+            The filter to add to the player.
 
+        Returns
+        -------
+            Whether the filters of the player changed.
         """
-        await self.node._send(
-            op="filters", guildId=str(self.guild_id), **filter_.payload
-        )
-        logger.debug(
-            f"PLAYER | Set filter:: {BaseFilter.name} {filter_.payload} ({self.channel_id})"
-        )
+        self.filters.add(filter_)
+        return await self._send_filters()
 
-    async def set_filter(self, filter_: BaseFilter) -> None:
+    async def set_filter(self, filter_: BaseFilter) -> bool:
         """
-        Set the players filter. Alias for :meth:`set_flr`.
+        Add a filter to the players filters. Alias for :meth:`set_flr`.
 
         Parameters
         ------------
         filter_: Filter
-            The filter to set the player to.
+            The filter to add to the player.
+
+        """
+        return await self.set_flr(filter_)
+
+    async def clear_filters(self) -> bool:
+        """
+        Remove every filter of the player.
 
+        Returns
+        -------
+            Whether the filters of the player changed.
         """
-        await self.set_flr(filter_)
+        self.filters.clear()
+        return await self._send_filters()
@@ -19,6 +19,10 @@ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
 LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE."""
+import time
+from typing import Optional
+
+import numpy as np
 
 
 class Penalty:
@@ -47,6 +51,100 @@ class Penalty:
         )
 
 
+class LoadEstimator:
+    """
+    The smoothed load of a node, used to place players on it.
+
+    Lavalink only sends the stats of a node about once a minute, and one frame can be a short spike. The load
+    penalties of the frames, CPU, nulled and deficit frames, are smoothed with an EWMA, and their trend is
+    extrapolated for up to ``horizon`` seconds after the last frame. Players placed on the node since the last frame
+    are counted too, so a burst of new players is spread over the nodes instead of piling onto the one that looked
+    best in the last frame.
+
+    Parameters
+    ----------
+    alpha : float
+        The weight of a new frame in the EWMA, between 0 and 1.
+    horizon : float
+        For how many seconds after the last frame the trend is extrapolated.
+    """
+
+    def __init__(self, alpha: float = 0.3, horizon: float = 60.0):
+        self.alpha = alpha
+        self.horizon = horizon
+
+        self.penalty: Optional[float] = None
+        self.trend = 0.0
+        self.players = 0
+        self.placed = 0
+        self.updated_at: Optional[float] = None
+
+    def __repr__(self):
+        return (
+            f"<LoadEstimator penalty={self.penalty} trend={self.trend:.3f}/s "
+            f"players={self.players} placed={self.placed}>"
+        )
+
+    def update(self, stats: "Stats", now: Optional[float] = None) -> None:
+        """
+        Fold a stats frame into the smoothed penalty and its trend.
+
+        Parameters
+        ----------
+        stats : Stats
+            The stats of the node.
+        now : Optional[float]
+            The monotonic time of the frame, the current time by default.
+        """
+        now = time.monotonic() if now is None else now
+        raw = stats.penalty.total - stats.penalty.player_penalty
+
+        if self.penalty is None:
+            self.penalty = raw
+        else:
+            elapsed = max(now - self.updated_at, 1.0)
+            smoothed = self.alpha * raw + (1 - self.alpha) * self.penalty
+            self.trend = self.alpha * (smoothed - self.penalty) / elapsed + (1 - self.alpha) * self.trend
+            self.penalty = smoothed
+
+        self.players = stats.playing_players
+        self.placed = 0
+        self.updated_at = now
+
+    def place(self) -> None:
+        """
+        Count a player placed on the node since the last frame.
+        """
+        self.placed += 1
+
+    def score(self, now: Optional[float] = None, players: int = 0) -> float:
+        """
+        The predicted penalty of the node, lower is better.
+
+        Parameters
+        ----------
+        now : Optional[float]
+            The monotonic time to predict the penalty at, the current time by default.
+        players : int
+            The players known to be on the node, only used until its first frame.
+
+        Returns
+        -------
+            The extrapolated load penalty, plus the playing players and the players placed since the last frame.
+            A placed player counts as a playing player plus its share of the load.
+            Before the first frame the load penalty is taken as 0, so the score is the player count.
+        """
+        if self.penalty is None:
+            # the placed players are among the players of the node.
+            return float(max(players, self.placed))
+
+        now = time.monotonic() if now is None else now
+        elapsed = min(max(now - self.updated_at, 0.0), self.horizon)
+        predicted = max(self.penalty + self.trend * elapsed, 0.0)
+        per_player = self.penalty / max(self.players, 1)
+        return predicted + self.players + self.placed * (1 + per_player)
+
+
 class Stats:
     def __init__(self, node, data):
         self._node = node
@@ -72,3 +170,150 @@ class Stats:
         self.frames_nulled = frame_stats.get("nulled", -1)
         self.frames_deficit = frame_stats.get("deficit", -1)
         self.penalty = Penalty(self)
+
+
+class StatsHistory:
+    """
+    A fixed size ring buffer of the stats samples of a node, backed by a single NumPy array, so its memory does not
+    grow with the uptime of the node.
+
+    Lavalink sends the stats of a node every minute, so the default capacity keeps the last 6 hours.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum amount of samples. The oldest sample is overwritten when the buffer is full.
+    """
+
+    FIELDS = (
+        "time",
+        "system_load",
+        "lavalink_load",
+        "memory_used",
+        "memory_allocated",
+        "playing_players",
+        "frames_sent",
+        "frames_nulled",
+        "frames_deficit",
+    )
+    BLOCKS = "▁▂▃▄▅▆▇█"
+
+    def __init__(self, capacity: int = 360):
+        self.capacity = capacity
+        self._samples = np.zeros((capacity, len(self.FIELDS)), dtype=np.float64)
+        self._columns = {field: index for index, field in enumerate(self.FIELDS)}
+        self._next = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, stats: Stats, now: Optional[float] = None) -> None:
+        """
+        Record a stats sample, overwriting the oldest one if the buffer is full.
+
+        Parameters
+        ----------
+        stats : Stats
+            The stats of the node.
+        now : Optional[float]
+            The monotonic time of the sample, the current time by default.
+        """
+        self._samples[self._next] = (
+            time.monotonic() if now is None else now,
+            stats.system_load,
+            stats.lavalink_load,
+            stats.memory_used,
+            stats.memory_allocated,
+            stats.playing_players,
+            stats.frames_sent,
+            stats.frames_nulled,
+            stats.frames_deficit,
+        )
+        self._next = (self._next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _window(self, seconds: Optional[float] = None) -> np.ndarray:
+        # the samples in chronological order, the last ``seconds`` of them if given.
+        if self.count < self.capacity:
+            samples = self._samples[: self.count]
+        else:
+            samples = np.roll(self._samples, -self._next, axis=0)
+        if seconds is not None and self.count:
+            samples = samples[samples[:, 0] >= samples[-1, 0] - seconds]
+        return samples
+
+    def window(self, field: str, seconds: Optional[float] = None) -> np.ndarray:
+        """
+        Get the values of a field, oldest first.
+
+        Parameters
+        ----------
+        field : str
+            The field, one of `FIELDS`.
+        seconds : Optional[float]
+            Only the samples of the last ``seconds`` seconds, every sample by default.
+
+        Returns
+        -------
+            The values. Frame stats are -1 while the node is not sending any frames.
+        """
+        return self._window(seconds)[:, self._columns[field]]
+
+    def mean(self, field: str, seconds: Optional[float] = None) -> float:
+        """
+        Get the mean of a field over a window, 0.0 if there are no samples.
+        """
+        values = self.window(field, seconds)
+        return float(values.mean()) if values.size else 0.0
+
+    def percentile(self, field: str, q: float = 95, seconds: Optional[float] = None) -> float:
+        """
+        Get a percentile of a field over a window, the 95th by default, 0.0 if there are no samples.
+        """
+        values = self.window(field, seconds)
+        return float(np.percentile(values, q)) if values.size else 0.0
+
+    def slope(self, field: str, seconds: Optional[float] = None) -> float:
+        """
+        Get the trend of a field over a window, in units per minute, from a least squares fit.
+        It is 0.0 if there are fewer than two samples.
+        """
+        samples = self._window(seconds)
+        if len(samples) < 2:
+            return 0.0
+        minutes = (samples[:, 0] - samples[0, 0]) / 60
+        if not minutes[-1]:
+            return 0.0
+        return float(np.polyfit(minutes, samples[:, self._columns[field]], 1)[0])
+
+    def sparkline(self, field: str, width: int = 20, seconds: Optional[float] = None) -> str:
+        """
+        Render a field over a window as a line of block characters, every character is the mean of a bucket of
+        samples.
+
+        Parameters
+        ----------
+        field : str
+            The field, one of `FIELDS`.
+        width : int
+            The maximum amount of characters.
+        seconds : Optional[float]
+            Only the samples of the last ``seconds`` seconds, every sample by default.
+
+        Returns
+        -------
+            The sparkline, empty if there are no samples.
+        """
+        values = self.window(field, seconds)
+        if not values.size:
+            return ""
+        if values.size > width:
+            values = np.array([bucket.mean() for bucket in np.array_split(values, width)])
+
+        low, high = values.min(), values.max()
+        if high == low:
+            levels = np.zeros(values.size, dtype=int)
+        else:
+            levels = ((values - low) / (high - low) * (len(self.BLOCKS) - 1)).round().astype(int)
+        return "".join(self.BLOCKS[level] for level in levels)
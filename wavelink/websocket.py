@@ -140,6 +140,8 @@ class WebSocket:
 
         if op == "stats":
             self._node.stats = Stats(self._node, data)
+            self._node.history.append(self._node.stats)
+            self._node.load.update(self._node.stats)
         if op == "event":
             try:
                 data["player"] = self._node.players[int(data["guildId"])]